@@ -0,0 +1,54 @@
+"""
+Sürekli çalışan alarm servisi (bkz. utils/alerts.py). İzleme listesindeki semboller her turda
+artımlı güncellenir; kesişim alarmları JSON satırı olarak dosyaya/stdout'a veya yerel bir
+webhook adresine gönderilir.
+
+    python alertd.py --watchlist bist30
+    python alertd.py THYAO GARAN --sink file:alarmlar.jsonl --sink http://localhost:9000/alarm
+    python alertd.py --file semboller.txt --rules kurallar.json --interval 300
+    python alertd.py --watchlist bist30 --once      # tek tur (cron için)
+"""
+import argparse
+import contextlib
+import sys
+
+from batch import WATCHLISTS, read_symbols
+from utils import alerts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ProTrade alarm servisi")
+    parser.add_argument("symbols", nargs="*", help="hisse sembolleri (örn. THYAO GARAN)")
+    parser.add_argument("--watchlist", choices=sorted(WATCHLISTS), help="hazır izleme listesi")
+    parser.add_argument("--file", help="sembol listesi dosyası (satır/virgül/boşlukla ayrılmış)")
+    parser.add_argument("--rules", help="JSON kural dosyası (varsayılan: Teknik Sinyaller kuralları)")
+    parser.add_argument("--sink", action="append", default=[],
+                        help='"-" (stdout), file:yol veya http://adres; birden çok verilebilir')
+    parser.add_argument("--interval", type=float, default=alerts.INTERVAL, help="turlar arası bekleme (sn)")
+    parser.add_argument("--workers", type=int, default=alerts.DEFAULT_WORKERS)
+    parser.add_argument("--once", action="store_true", help="tek tur çalıştır ve çık")
+    args = parser.parse_args(argv)
+
+    symbols = read_symbols(args)
+    if not symbols:
+        parser.error("en az bir sembol, --watchlist veya --file verin")
+    rules = alerts.load_rules(args.rules) if args.rules else alerts.RULES
+    sinks = [alerts.open_sink(spec) for spec in args.sink or ["-"]]
+
+    # Tek turda son bardaki kesişimler de bildirilir (cron her bar kapanışında bir kez çalıştırmalı)
+    daemon = alerts.AlertDaemon(symbols, rules, sinks, args.interval, args.workers, prime=not args.once)
+    print(f"{len(symbols)} sembol, {len(rules)} kural izleniyor.", file=sys.stderr)
+    # Kütüphanelerin print çıktıları stdout'taki alarm akışına karışmasın
+    with contextlib.redirect_stdout(sys.stderr):
+        if args.once:
+            daemon.cycle()
+            return 0
+        try:
+            daemon.run()
+        except KeyboardInterrupt:
+            daemon.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Tarayıcı gerektirmeyen toplu analiz (cron / gece raporu için).
+Streamlit ve plotly içe aktarılmaz; semboller süreç havuzunda paralel işlenir ve
+her sembol bittiği anda JSON satırı (jsonl) veya CSV satırı olarak yazılır.
+
+    python batch.py THYAO GARAN ASELS
+    python batch.py --watchlist bist30 --format csv --output rapor.csv
+    python batch.py --file semboller.txt --workers 8 --period 1y
+    python batch.py --watchlist bist30 --refresh-fundamentals   # temel veri tablosu + değerleme sırası
+    python batch.py THYAO GARAN --sweep rsi --sweep supertrend --top 5   # parametre taraması
+"""
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from utils import backtest, data, pipeline, screener
+from utils.scanner import BIST30
+
+WATCHLISTS = {"bist30": BIST30}
+
+
+def _init_worker():
+    # Kütüphanelerin print çıktıları rapor akışına (stdout) karışmasın
+    sys.stdout = sys.stderr
+
+
+def read_symbols(args):
+    symbols = list(args.symbols)
+    if args.watchlist:
+        symbols += WATCHLISTS[args.watchlist]
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            symbols += [s.strip() for line in f for s in line.replace(",", " ").split() if s.strip()]
+    return list(dict.fromkeys(s.upper() for s in symbols))
+
+
+class JsonlWriter:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, row):
+        self.stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+
+class CsvWriter:
+    def __init__(self, stream):
+        self.stream = stream
+        self.writer = csv.DictWriter(stream, fieldnames=pipeline.FIELDS)
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow(dict(row, signals=" | ".join(row["signals"] or [])))
+        self.stream.flush()
+
+
+def write_valuation(table, stream, fmt):
+    """Değerleme sıralamasını (screener.screen) JSON satırları veya CSV olarak yazar."""
+    if fmt == "csv":
+        table.to_csv(stream)
+        return
+    writer = JsonlWriter(stream)
+    for symbol, values in table.iterrows():
+        writer.write({"symbol": symbol, **{k: None if pd.isna(v) else float(v) for k, v in values.items()}})
+
+
+def sweep(symbols, rules, top=10, workers=None):
+    """
+    Her sembol ve kural için parametre ızgarasını (backtest.DEFAULT_GRIDS: RSI uzunluğu/eşikleri,
+    SuperTrend uzunluk/çarpan, ATR stop çarpanı) tarar. Dönüş: (sembol, kural başına toplam getiriye
+    göre ilk `top` yapılandırma, sıra numarasıyla tablo; verisi alınamayan sembol sayısı).
+    """
+    tables, failed = [], 0
+    for symbol in symbols:
+        df, ticker, _ = data.load_price_history(data.process_symbol(symbol))
+        if df is None or len(df) < 2:
+            print(f"Veri bulunamadı: {symbol}", file=sys.stderr)
+            failed += 1
+            continue
+        for rule in rules:
+            table = backtest.sweep(df, rule, processes=workers).head(top)
+            table.insert(0, "rank", range(1, len(table) + 1))
+            table.insert(0, "rule", rule)
+            table.insert(0, "symbol", ticker)
+            tables.append(table)
+    if not tables:
+        return pd.DataFrame(), failed
+    table = pd.concat(tables, ignore_index=True)
+    params = list(dict.fromkeys(k for rule in rules for k in backtest.DEFAULT_GRIDS[rule]))
+    head = ["symbol", "rule", "rank"] + params
+    return table[head + [c for c in table.columns if c not in head]], failed
+
+
+def write_sweep(table, stream, fmt):
+    """Tarama sonuçlarını JSON satırları veya CSV olarak yazar (kuralda olmayan parametre sütunları boş)."""
+    if fmt == "csv":
+        table.to_csv(stream, index=False)
+        return
+    writer = JsonlWriter(stream)
+    for row in table.to_dict("records"):
+        writer.write({k: None if pd.isna(v) else v.item() if hasattr(v, "item") else v for k, v in row.items()})
+
+
+def run(symbols, writer, period="max", workers=None, with_fundamentals=True):
+    """Sembolleri paralel analiz eder, biten her sonucu hemen yazar. Hatalı sembol sayısını döndürür."""
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(pipeline.analyze, symbol, period, with_fundamentals) for symbol in symbols]
+        for future in as_completed(futures):
+            row = future.result()
+            failed += row["error"] is not None
+            writer.write(row)
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ProTrade toplu analiz")
+    parser.add_argument("symbols", nargs="*", help="hisse sembolleri (örn. THYAO GARAN)")
+    parser.add_argument("--watchlist", choices=sorted(WATCHLISTS), help="hazır izleme listesi")
+    parser.add_argument("--file", help="sembol listesi dosyası (satır/virgül/boşlukla ayrılmış)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--output", help="çıktı dosyası (varsayılan: stdout)")
+    parser.add_argument("--period", default="max", choices=["3mo", "6mo", "1y", "2y", "5y", "max"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--no-fundamentals", action="store_true", help="Graham değeri için temel verileri çekme")
+    parser.add_argument("--refresh-fundamentals", action="store_true",
+                        help="yalnızca kolon-bazlı temel veri tablosunu yenile ve değerleme sırasını yaz")
+    parser.add_argument("--sweep", action="append", choices=sorted(backtest.DEFAULT_GRIDS),
+                        help="kuralın parametre ızgarasını tara ve en iyi sonuçları yaz; birden çok verilebilir")
+    parser.add_argument("--top", type=int, default=10, help="--sweep: sembol ve kural başına yazılan sonuç sayısı")
+    args = parser.parse_args(argv)
+
+    symbols = read_symbols(args)
+    if not symbols:
+        parser.error("en az bir sembol, --watchlist veya --file verin")
+
+    stream = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        if args.sweep:
+            with contextlib.redirect_stdout(sys.stderr):
+                table, failed = sweep(symbols, list(dict.fromkeys(args.sweep)), args.top, args.workers)
+            write_sweep(table, stream, args.format)
+        elif args.refresh_fundamentals:
+            # Kütüphanelerin print çıktıları rapor akışına karışmasın (bkz. _init_worker)
+            with contextlib.redirect_stdout(sys.stderr):
+                failed = len(symbols) - screener.refresh(symbols, args.workers)
+            write_valuation(screener.screen(screener.get_table().load(), symbols), stream, args.format)
+        else:
+            writer = (CsvWriter if args.format == "csv" else JsonlWriter)(stream)
+            failed = run(symbols, writer, args.period, args.workers, not args.no_fundamentals)
+    finally:
+        if args.output:
+            stream.close()
+    print(f"{len(symbols) - failed}/{len(symbols)} sembol analiz edildi.", file=sys.stderr)
+    return 1 if failed == len(symbols) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""
+Ağ gerektirmeyen performans ölçümü: sentetik veriyle veri/indikatör/grafik hattını ölçer,
+sonuçları kayıtlı temel ölçümle (baseline.json) karşılaştırır.
+
+    python -m benchmarks.run                  # ölç ve karşılaştır (gerileme varsa çıkış kodu 1)
+    python -m benchmarks.run --save-baseline  # mevcut sonuçları temel ölçüm olarak kaydet
+    python -m benchmarks.run --sizes 1000 5000 --filter chart
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks.synthetic import synthetic_fundamentals, synthetic_ohlcv, synthetic_ticks, synthetic_universe
+from utils import alerts, backtest, correlation, data, indicators, scanner, screener, stream, ui
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SIZES = (1_000, 5_000, 20_000, 50_000)
+UNIVERSE = (30, 5_000)  # sembol sayısı, bar sayısı
+# Canlı akış: sembol sayısı, seans süresi (sn); her turda her sembole bir tik gelir
+LIVE = (30, 6 * 3600)
+# Değerleme taraması: temel veri tablosundaki sembol sayısı
+SCREEN = 5_000
+# Alarm servisi: sembol sayısı, bar sayısı; her turda tüm sembollerin son barı değişir
+ALERTS = (300, 2_500)
+# Tam çözünürlüklü grafik (hızlı çizim kapalı) yalnızca bu boyuta kadar ölçülür
+FULL_CHART_MAX = 5_000
+# Süre/bellek bu oranın üzerinde artarsa gerileme sayılır
+TOLERANCE = 0.25
+# Bundan kısa ölçümlerde mutlak fark gürültü kabul edilir (ms)
+MIN_DELTA_MS = 1.0
+
+CHART_OPTIONS = {
+    "mode": "Tek Hisse",
+    "client_toggle": False,
+    "show_linreg": True,
+    "show_rolling_reg": True,
+    "show_fib": True,
+    "show_bb": True,
+    "show_ema": True,
+    "show_swings": True,
+    "show_atr": True,
+    "show_pivots": True,
+    "pro_indicator": "SuperTrend",
+    "adaptive": True,
+    "oscillator_mode": "RSI (Klasik)",
+}
+
+
+def cases(sizes):
+    """(ad, fonksiyon) çiftleri; fonksiyon bir plotly grafiği döndürürse JSON boyutu da kaydedilir."""
+    for n in sizes:
+        df = synthetic_ohlcv(n)
+        full = data.process_indicators(df)
+        yield f"process_indicators/{n}", lambda df=df: data.process_indicators(df)
+        yield f"slice_data_by_period/{n}", lambda full=full: data.slice_data_by_period(full, "1y")
+        yield f"regression_channel/{n}", lambda full=full: indicators.calculate_regression_channel(full)
+        yield f"fibonacci/{n}", lambda full=full: indicators.calculate_fibonacci(full)
+        yield f"range_stats/{n}", lambda full=full: indicators.RangeStats(full)
+        stats = indicators.RangeStats(full)
+        yield f"rolling_channel/{n}", lambda stats=stats: stats.rolling_channel()
+        # Tüm yöntem ve dönemler için pivot serileri (5.000 günlük bar ≈ 20 yıl)
+        yield f"pivot_series/{n}", lambda full=full: [indicators.pivot_series(full, anchor, method)
+                                                      for anchor in indicators.PIVOT_ANCHORS
+                                                      for method in indicators.PIVOT_METHODS]
+        pivots = indicators.pivot_series(full, "W")
+        yield f"pivot_respect/{n}", lambda full=full, pivots=pivots: backtest.pivot_respect(full, pivots)
+        yield f"build_chart/{n}", lambda full=full: ui.build_chart(full, CHART_OPTIONS)
+        yield f"build_chart_pivots/{n}", lambda full=full, pivots=pivots: ui.build_chart(full, CHART_OPTIONS, pivots=pivots)
+        if n <= FULL_CHART_MAX:
+            options = dict(CHART_OPTIONS, adaptive=False)
+            yield f"build_chart_full/{n}", lambda full=full, options=options: ui.build_chart(full, options)
+
+    count, n = UNIVERSE
+    frames = synthetic_universe([f"S{i:02d}" for i in range(count)], n)
+    yield f"process_indicators_each/{count}x{n}", lambda: [data.process_indicators(f) for f in frames.values()]
+
+    def panel():
+        close = scanner.build_panel(frames).to_numpy()
+        return scanner.panel_indicators(close)
+    yield f"scanner_panel/{count}x{n}", panel
+
+    close = scanner.build_panel(frames)
+    yield f"correlation/{count}x{n}", lambda: correlation.RollingCorrelation().update(close).snapshot()
+    # Son bar her çağrıda revize edilir: önek toplamları ve sonuçlar yalnızca son satır için yeniden hesaplanır
+    revised = close.copy()
+    revised.iloc[-1] *= 1.01
+    panels = [close, revised]
+    stats = correlation.RollingCorrelation().update(close)
+
+    def correlation_update():
+        panels.reverse()
+        return stats.update(panels[0]).snapshot()
+    yield f"correlation_update/{count}x{n}", correlation_update
+
+    fundamentals = synthetic_fundamentals([f"S{i:04d}" for i in range(SCREEN)])
+    yield f"valuation_screen/{SCREEN}", lambda: screener.screen(fundamentals)
+
+    count, n = ALERTS
+    frames = synthetic_universe([f"A{i:03d}" for i in range(count)], n)
+    revised = {}
+    for symbol, df in frames.items():
+        df = df.copy()
+        df.iloc[-1, df.columns.get_loc("Close")] *= 1.01
+        revised[symbol] = df
+    turn = [frames, revised]
+    daemon = alerts.AlertDaemon(list(frames), load=lambda symbol: (turn[0][symbol], symbol))
+    daemon.cycle()
+
+    def alert_cycle():
+        # Son bar her turda revize edilir: tüm semboller değişmiş sayılır
+        turn.reverse()
+        return daemon.cycle()
+    yield f"alert_cycle/{count}", alert_cycle
+
+    count, seconds = LIVE
+    symbols = [f"S{i:02d}" for i in range(count)]
+    hub = stream.LiveHub(None, "1m")
+    hub.process(synthetic_ticks(symbols, seconds))
+    # Seans sonunda tüm sembollerin son barını güncelleyen bir tur (bar + indikatör güncellemesi)
+    last = {symbol: series.bars.times[series.bars.n - 1] + 30.0 for symbol, series in hub.series.items()}
+    cycle = [(symbol, ts, 50.0, 100.0) for symbol, ts in last.items()]
+    yield f"stream_cycle/{count}", lambda: hub.process(cycle)
+
+
+def measure(fn, repeat):
+    """En iyi/medyan süre (ms), tepe bellek (MB) ve sonuç bir grafikse JSON boyutu (KB)."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    row = {"time_ms": min(times), "median_ms": statistics.median(times), "peak_mb": peak / 2**20}
+    if hasattr(result, "to_plotly_json"):
+        row["figure_kb"] = len(result.to_json()) / 1024
+    return row
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Temel ölçüme göre geriledi sayılan (ad, metrik, eski, yeni) listesi."""
+    regressions = []
+    for name, row in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in ("time_ms", "peak_mb", "figure_kb"):
+            if metric not in row or metric not in base:
+                continue
+            old, new = base[metric], row[metric]
+            if metric == "time_ms" and new - old < MIN_DELTA_MS:
+                continue
+            if new > old * (1 + tolerance):
+                regressions.append((name, metric, old, new))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ProTrade çevrimdışı performans ölçümü")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="yalnızca adında bu metin geçen ölçümler")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--output", help="sonuçları bu JSON dosyasına da yaz")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, fn in cases(args.sizes):
+        if args.filter not in name:
+            continue
+        row = results[name] = measure(fn, args.repeat)
+        extra = f"  {row['figure_kb']:9.0f} KB" if "figure_kb" in row else ""
+        print(f"{name:40s} {row['time_ms']:9.1f} ms  {row['peak_mb']:8.1f} MB{extra}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Temel ölçüm kaydedildi: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Temel ölçüm yok; kaydetmek için --save-baseline kullanın.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    for name, metric, old, new in regressions:
+        print(f"GERİLEME {name} {metric}: {old:.1f} -> {new:.1f} (+%{(new / old - 1) * 100:.0f})")
+    if not regressions:
+        print("Gerileme yok.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+# Sentetik seri varsayılanları (BIST benzeri günlük barlar)
+START = "2000-01-03"
+TZ = "Europe/Istanbul"
+
+
+def synthetic_ohlcv(n, seed=0, start=START, price=50.0, drift=0.0003, vol=0.02):
+    """
+    Tohuma göre her seferinde aynı çıkan günlük OHLCV tablosu (geometrik Brown hareketi).
+    yfinance history() çıktısıyla aynı sütunlara ve saat dilimli tarih indeksine sahiptir.
+    """
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(drift, vol, n)))
+    open_ = close * np.exp(rng.normal(0, vol / 4, n))
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, vol / 2, n)))
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, vol / 2, n)))
+    volume = rng.integers(100_000, 10_000_000, n).astype(float)
+    index = pd.bdate_range(start, periods=n, tz=TZ)
+    return pd.DataFrame({
+        "Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume,
+        "Dividends": 0.0, "Stock Splits": 0.0,
+    }, index=index)
+
+
+def synthetic_universe(symbols, n, seed=0):
+    """
+    {sembol: DataFrame} sözlüğü; her sembol farklı tohum ve farklı başlangıç tarihiyle
+    (halka arz tarihleri farklıymış gibi) üretilir.
+    """
+    frames = {}
+    for i, symbol in enumerate(symbols):
+        df = synthetic_ohlcv(n, seed=seed + i, price=10.0 + 5 * i)
+        frames[symbol] = df.iloc[(i * 37) % max(n // 4, 1):]
+    return frames
+
+
+def synthetic_ticks(symbols, seconds, per_second=1.0, start="2024-06-10 09:55", seed=0, price=50.0, vol=0.0005):
+    """
+    Seans içi tik akışı: (sembol, zaman, fiyat, hacim) demetleri zamana göre sıralı.
+    Her sembol saniyede ortalama per_second işlem alır; canlı akış (utils.stream) testleri içindir.
+    """
+    rng = np.random.default_rng(seed)
+    t0 = pd.Timestamp(start, tz=TZ).timestamp()
+    ticks = []
+    for i, symbol in enumerate(symbols):
+        count = rng.poisson(per_second * seconds)
+        times = np.sort(t0 + rng.uniform(0, seconds, count))
+        prices = (price + 5 * i) * np.exp(np.cumsum(rng.normal(0, vol, count)))
+        volumes = rng.integers(1, 5_000, count).astype(float)
+        ticks += zip([symbol] * count, times, prices.round(2), volumes)
+    ticks.sort(key=lambda tick: tick[1])
+    return ticks
+
+
+def synthetic_fundamentals(symbols, seed=0):
+    """Temel veri tablosu (utils.screener.COLUMNS); bazı semboller zararda veya eksik verili."""
+    rng = np.random.default_rng(seed)
+    n = len(symbols)
+    eps = rng.normal(2.0, 3.0, n)
+    book_value = rng.lognormal(2.5, 0.8, n)
+    equity = rng.lognormal(20, 1.5, n)
+    total_debt = equity * rng.lognormal(-0.5, 0.8, n)
+    total_debt[rng.random(n) < 0.1] = np.nan
+    return pd.DataFrame({
+        "ticker": [f"{s}.IS" for s in symbols], "eps": eps, "book_value": book_value,
+        "equity": equity, "total_debt": total_debt, "price": rng.lognormal(3.5, 1.0, n),
+        "updated": 0.0,
+    }, index=symbols)
@@ -2,6 +2,11 @@ import streamlit as st
 import utils.data as data
 import utils.indicators as indicators
 import utils.ui as ui
+import utils.signals as sig
+import utils.backtest as backtest
+import utils.perf as perf
+import utils.stream as stream
+import utils.screener as screener
 import pandas as pd
 
 # --- SAYFA AYARLARI ---
@@ -12,17 +17,61 @@ st.set_page_config(
     page_icon="📈"
 )
 
+# Bu çalıştırmanın aşama süreleri (perf paneli ve metrik dosyaları için)
+trace = perf.start_trace()
+
+# Veri katmanının uyarı/hata mesajları sayfada gösterilir
+data.set_reporter(st.warning, st.error)
+
 # --- CSS YÜKLE ---
 ui.load_custom_css()
 
 # --- YAN PANEL ---
 options = ui.render_sidebar()
 
+# Popüler semboller (PROTRADE_PREWARM) süreç açılışında bir kez arka planda önbelleğe yüklenir;
+# indikatörler varsayılan ayarların istediği setle hesaplanır ki ilk kullanıcı önbellekten okusun
+data.start_prewarm(ui.required_indicators(options) | sig.INDICATORS)
+
 # --- ANA KONTROLLER (HEADER) ---
 st.title("ProTrade Analiz Terminali")
 st.markdown("---")
 
-col_head1, col_head2, col_head3 = st.columns([2, 1, 1])
+# --- TARAYICI MODU ---
+if options["mode"] == "Tarayıcı":
+    symbols, scan = ui.render_scanner_input()
+    tab_signals, tab_valuation = st.tabs(["🤖 Sinyaller", "💰 Değerleme"])
+    with tab_signals:
+        if scan and symbols:
+            with st.spinner(f"{len(symbols)} hisse taranıyor..."), perf.span("scan", symbols=len(symbols)):
+                table = data.scan_watchlist(tuple(symbols))
+            ui.render_scanner_table(table)
+    with tab_valuation:
+        # Yerel temel veri tablosundan anında sıralanır; eksikler arka planda çekilir
+        with perf.span("valuation_screen", symbols=len(symbols)):
+            valuation, pending = data.valuation_screen(symbols)
+        ui.render_valuation_table(valuation, pending, screener.refreshing())
+    perf.finish_trace()
+    if options["debug_perf"]:
+        ui.render_perf_panel(trace, perf.summary())
+    st.stop()
+
+# --- CANLI AKIŞ MODU ---
+if options["mode"] == "Canlı":
+    spec, interval, live_symbol = ui.render_live_input()
+    try:
+        # Akış arka planda tüm indikatörleri günceller; panel yalnızca kendi parçasını yeniler
+        hub = stream.get_hub(spec, interval)
+    except Exception as e:
+        st.error(f"Akış başlatılamadı: {e}")
+    else:
+        ui.render_live(hub, live_symbol, options)
+    perf.finish_trace()
+    if options["debug_perf"]:
+        ui.render_perf_panel(trace, perf.summary())
+    st.stop()
+
+col_head1, col_head2, col_head3, col_head4 = st.columns([2, 1, 1, 1])
 
 with col_head1:
     raw_symbol = st.text_input("Hisse Sembolü", "THYAO", help="BIST hisseleri için sonuna .IS eklemenize gerek yoktur.")
@@ -30,31 +79,48 @@ with col_head1:
     
 with col_head2:
     period = st.selectbox("Periyot", ["3mo", "6mo", "1y", "2y", "5y", "max"], index=1)
-    
+
 with col_head3:
+    timeframe = data.TIMEFRAMES[st.selectbox("Zaman Dilimi", list(data.TIMEFRAMES))]
+    
+with col_head4:
     st.write("")
     st.write("")
-    if st.button("Analiz Et"): 
-        st.cache_data.clear()
+    # Yalnızca bu sembolü yeniden doğrular, diğer sembollerin önbelleği korunur
+    refresh = st.button("Analiz Et")
 
 if symbol != raw_symbol.upper():
     st.caption(f"İşlenen Sembol: **{symbol}**")
 
 # --- VERİ ÇEKME & İŞLEME ---
+# Temel veriler (bilanço, info) arka planda yüklenir, grafik onları beklemez. Sembolün karşılığı
+# önbellekte biliniyorsa fiyat geçmişiyle aynı anda başlar.
+known_ticker = data.resolved_ticker(symbol)
+fundamentals = data.fetch_fundamentals_async(known_ticker) if known_ticker else None
+
 with st.spinner(f"{symbol} verileri çekiliyor..."):
-    # fetch_stock_data artık 5 değer dönüyor (en sonuncusu bulunan gerçek hisse kodu)
-    df_full, financials, balance, info, found_ticker = data.fetch_stock_data(symbol, period="max")
+    # fetch_stock_data fiyat geçmişi ve bulunan gerçek hisse kodunu döndürür
+    df_full, found_ticker = data.fetch_stock_data(symbol, period="max", refresh=refresh)
 
 if df_full is not None:
+    if found_ticker != known_ticker:
+        fundamentals = data.fetch_fundamentals_async(found_ticker)
+
     # Kullanıcıya hangi sembolün bulunduğunu göster (örn: THYAO yazdı ama THYAO.IS bulundu)
     if found_ticker != raw_symbol.upper():
         st.success(f"Bulunan Sembol: **{found_ticker}**")
         
-    # İndikatörleri Hesapla
-    df_full = data.process_indicators(df_full)
+    # Haftalık/aylık barlar günlük veriden bir kez türetilir, yeni günlerle artımlı uzatılır.
+    # Açık dönemin etiketi yeni günlerle değişmez: önbellek anahtarları günlük son barı kullanır
+    asof = df_full.index[-1]
+    df_full = data.timeframe_bars(found_ticker, df_full, timeframe)
+
+    # İndikatörleri Hesapla (yalnızca grafikte ve sinyal panelinde kullanılanlar, yeni barlar için)
+    needed = ui.required_indicators(options) | sig.INDICATORS
+    df_full = data.process_indicators_incremental(found_ticker, df_full, needed, timeframe, asof)
     
     # Seçilen Periyoda Göre Dilimle
-    df_view = data.slice_data_by_period(df_full, period)
+    df_view = data.period_view(found_ticker, df_full, period, needed, timeframe, asof)
     
     # Son Veriler
     last_close = df_view['Close'].iloc[-1]
@@ -67,9 +133,6 @@ if df_full is not None:
     
     # Pivot Hesabı
     pivot, r1, s1, r2, s2 = indicators.calculate_pivot_points(last_high, last_low, last_close)
-    
-    # Adil Değer
-    fair_value = indicators.calculate_fair_value(info)
 
     # --- METRİKLER ---
     m1, m2, m3, m4 = st.columns(4)
@@ -81,18 +144,49 @@ if df_full is not None:
     trend_status = "YÜKSELİŞ 🚀" if last_close > df_view['EMA200'].iloc[-1] else "DÜŞÜŞ 🔻"
     m3.metric("Trend (EMA200)", trend_status)
     
-    if fair_value:
-        upside = ((fair_value - last_close) / last_close) * 100
-        m4.metric("Adil Değer (Graham)", f"{fair_value:.2f}", f"{upside:.1f}% Potansiyel")
-    else:
-        m4.metric("Adil Değer", "Hesaplanamadı")
+    # Adil Değer kutusu temel veriler gelince doldurulur
+    fair_value_slot = m4.empty()
+    fair_value_slot.metric("Adil Değer (Graham)", "...")
 
     # --- PİVOTLAR ---
     ui.render_pivot_points(pivot, r1, s1, r2, s2)
     
     # --- GRAFİK ve REHBER ---
     ui.render_guide()
-    ui.render_chart(df_view, options)
+    # Grafik (sembol, son bar, periyot, zaman dilimi, seçenekler) için bir kez oluşturulur
+    # Regresyon/Fibonacci için tüm geçmişin önek toplamları: periyot değişince yeniden taranmaz
+    stats = data.derived(found_ticker, df_full, ("range_stats", timeframe),
+                         lambda: indicators.RangeStats(df_full), "range_stats", asof)
+    # Pivot seviyeleri tüm geçmiş için tek geçişte hesaplanır; grafik görünümdeki son barları kullanır
+    pivots = None
+    if options["show_pivots"] or options["client_toggle"]:
+        pivot_method = ui.PIVOT_METHODS[options["pivot_method"]]
+        pivot_anchor = ui.PIVOT_ANCHORS[options["pivot_anchor"]]
+        pivots = data.derived(found_ticker, df_full, ("pivots", timeframe, pivot_method, pivot_anchor),
+                              lambda: indicators.pivot_series(df_full, pivot_anchor, pivot_method), "pivots", asof)
+    chart = data.derived(found_ticker, df_view, ("chart", period, timeframe, ui.chart_config(options)),
+                         lambda: ui.build_chart(df_view, options, stats,
+                                                None if pivots is None else pivots.iloc[-len(df_view):]), "build_chart", asof)
+    # Korelasyon paneli açıksa grafiğin yanında gösterilir
+    chart_col, corr_col = st.columns([3, 1]) if options["show_correlation"] else (st.container(), None)
+    with chart_col, perf.span("render_chart"):
+        # Streamlit grafiği burada JSON'a çevirip tarayıcıya gönderir
+        ui.render_chart(df_view, options, chart)
+    if corr_col is not None:
+        with corr_col:
+            peers = ui.render_correlation_input(symbol)
+            # Günlük kapanış paneli ham veri önbelleğinden kurulur, önek toplamları yalnızca yeni barlarla uzar
+            ui.render_correlation_panel(data.correlation_stats(peers), symbol)
+    
+    # Adil Değer (temel veriler burada beklenir)
+    with perf.span("fundamentals_wait"):
+        financials, balance, info = fundamentals.result()
+    fair_value = indicators.calculate_fair_value(info)
+    if fair_value:
+        upside = ((fair_value - last_close) / last_close) * 100
+        fair_value_slot.metric("Adil Değer (Graham)", f"{fair_value:.2f}", f"{upside:.1f}% Potansiyel")
+    else:
+        fair_value_slot.metric("Adil Değer", "Hesaplanamadı")
     
     # --- TEMEL ANALİZ ÖZETİ ---
     st.markdown("---")
@@ -106,11 +200,8 @@ if df_full is not None:
             try:
                 # Bilanço verileri bazen Karmaşık döner, güvenli erişim deniyoruz
                 # yfinance yapısı zaman zaman değişebilir, bu yüzden esnek olmalıyız
-                equity_row = balance.loc['Stockholders Equity'] if 'Stockholders Equity' in balance.index else None
-                debt_row = balance.loc['Total Debt'] if 'Total Debt' in balance.index else None
-                
-                equity = equity_row.iloc[0] if equity_row is not None else 1
-                debt = debt_row.iloc[0] if debt_row is not None else 0
+                equity = screener.balance_item(balance, 'Stockholders Equity', 1)
+                debt = screener.balance_item(balance, 'Total Debt', 0)
                 
                 if equity and equity != 0:
                     debt_equity = debt / equity
@@ -129,25 +220,30 @@ if df_full is not None:
 
     with col_fund2:
         st.markdown("#### 🤖 Teknik Sinyaller")
-        signals = []
-        if last_rsi < 30: signals.append("🟢 RSI: Aşırı satım bölgesinde (Tepki Gelebilir)")
-        elif last_rsi > 70: signals.append("🔴 RSI: Aşırı alım bölgesinde (Düzeltme Riski)")
-        
-        if last_close > df_view['EMA200'].iloc[-1]: signals.append("🟢 Trend: Uzun vadeli ortalamanın üzerinde (Pozitif)")
-        else: signals.append("🔴 Trend: Uzun vadeli ortalamanın altında (Negatif)")
-        
-        if df_view['MACD'].iloc[-1] > df_view['MACD_Signal'].iloc[-1]: signals.append("🟢 MACD: Alıcılı seyir (Pozitif Kesişim)")
-        else: signals.append("🔴 MACD: Satıcılı seyir (Negatif Kesişim)")
-        
-        if fair_value and last_close < fair_value:
-             signals.append(f"💎 Değerleme: Hisse adil değerinin altında (%{upside:.1f} potansiyel)")
-
+        signals = sig.technical_signals(last_close, last_rsi, df_view['EMA200'].iloc[-1],
+                                        df_view['MACD'].iloc[-1], df_view['MACD_Signal'].iloc[-1], fair_value)
         if not signals:
             st.write("Belirgin bir teknik sinyal bulunmuyor, piyasa nötr.")
         else:
             for s in signals:
                 st.write(f"- {s}")
 
+        # Aynı kuralların tüm geçmişteki performansı (son bar değişmedikçe yeniden hesaplanmaz)
+        bars_per_year = backtest.TIMEFRAME_BARS_PER_YEAR[timeframe]
+        results = data.derived(found_ticker, df_full, ("backtest", timeframe),
+                               lambda: backtest.evaluate_signals(df_full, bars_per_year=bars_per_year), "backtest", asof)
+        ui.render_backtest(results)
+        if pivots is not None:
+            respect = data.derived(found_ticker, df_full, ("pivot_respect", timeframe, pivot_method, pivot_anchor),
+                                   lambda: backtest.pivot_respect(df_full, pivots), "pivot_respect", asof)
+            ui.render_pivot_respect(respect, options["pivot_method"], options["pivot_anchor"])
+
 else:
     st.error(f"⚠️ '{symbol}' için veri bulunamadı veya sunucu erişim sorunu var.")
     st.info("Olası Çözümler:\n- Hisse kodunu doğru yazdığınızdan emin olun (Örn: THYAO, GARAN).\n- Yabancı hisseler için kodu tam yazın (Örn: AAPL, TSLA).\n- Çok kısa süreli (sunucu kaynaklı) bir bağlantı sorunu olabilir, sayfayı yenileyip tekrar deneyin.")
+
+# --- ÖNBELLEK İSTATİSTİKLERİ ve PERFORMANS ---
+ui.render_cache_stats(data.cache_stats())
+perf.finish_trace()
+if options["debug_perf"]:
+    ui.render_perf_panel(trace, perf.summary())
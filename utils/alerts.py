@@ -0,0 +1,264 @@
+"""
+Arka plan alarm servisi: büyük bir izleme listesi için indikatör durumlarını bellekte tutar,
+her turda yalnızca verisi değişen sembollerin yeni barlarını işler ve kuralları tüm değişen
+semboller için tek seferde (vektörel) değerlendirir.
+
+Alarmlar kenar tetiklidir: koşul önceki barda yanlışken son barda doğru olduğunda
+("MACD yukarı kesti") bir kez üretilir; koşul sürdükçe ("MACD yukarıda") tekrarlanmaz.
+
+Kural dosyası (JSON) örneği; sağ taraf sayı ya da sütun adı olabilir:
+    [{"name": "RSI 25 altına indi", "left": "RSI", "op": "<", "right": 25},
+     {"name": "EMA50 yukarı kesti", "left": "Close", "op": ">", "right": "EMA50"}]
+"""
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from utils import data, kernel, perf, indicators, screener
+from utils.engine import IndicatorEngine
+from utils.scanner import DEFAULT_WORKERS
+from utils.signals import RSI_OVERSOLD, RSI_OVERBOUGHT
+
+# Turlar arası bekleme (sn)
+INTERVAL = 60
+# Motora verilen en fazla bar: başlangıç sabit tutulur (yeni barlar eklenir), EMA200/RSI ısınması için yeterli
+HISTORY = 2000
+# Kurallarda kullanılabilen fiyat ve temel veri sütunları (indikatör sütunları dışında)
+PRICE_COLUMNS = kernel.OHLCV
+FAIR_VALUE = "FairValue"
+
+OPERATORS = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal}
+
+
+class Rule:
+    """left op right koşulu; left/right sütun adı veya sayı."""
+    def __init__(self, name, left, op, right):
+        if op not in OPERATORS:
+            raise ValueError(f"Bilinmeyen karşılaştırma: {op}")
+        self.name = name
+        self.left = left
+        self.op = op
+        self.right = right
+
+    def columns(self):
+        return [side for side in (self.left, self.right) if isinstance(side, str)]
+
+    def condition(self, values):
+        """values: sütun -> dizi sözlüğü; NaN içeren karşılaştırmalar yanlış sayılır."""
+        side = lambda x: values[x] if isinstance(x, str) else x
+        return OPERATORS[self.op](side(self.left), side(self.right))
+
+
+# "Teknik Sinyaller" panelindeki kuralların kesişim (kenar) halleri
+RULES = [
+    Rule("RSI aşırı satım bölgesine girdi", "RSI", "<", RSI_OVERSOLD),
+    Rule("RSI aşırı alım bölgesine girdi", "RSI", ">", RSI_OVERBOUGHT),
+    Rule("Fiyat EMA200'ü yukarı kesti", "Close", ">", "EMA200"),
+    Rule("Fiyat EMA200'ü aşağı kesti", "Close", "<", "EMA200"),
+    Rule("MACD yukarı kesti", "MACD", ">", "MACD_Signal"),
+    Rule("MACD aşağı kesti", "MACD", "<", "MACD_Signal"),
+    Rule("Fiyat adil değerin altına indi", "Close", "<", FAIR_VALUE),
+]
+
+
+def load_rules(path):
+    """JSON kural dosyasını okur (bkz. modül açıklaması)."""
+    with open(path, encoding="utf-8") as f:
+        return [Rule(r["name"], r["left"], r["op"], r["right"]) for r in json.load(f)]
+
+
+def rule_indicators(rules):
+    """Kuralların sütunlarını üreten kernel.REGISTRY adları; bilinmeyen sütunda ValueError."""
+    names = set()
+    for column in {c for rule in rules for c in rule.columns()}:
+        if column in PRICE_COLUMNS or column == FAIR_VALUE:
+            continue
+        found = [name for name, ind in kernel.REGISTRY.items() if column in ind.columns]
+        if not found:
+            raise ValueError(f"Bilinmeyen sütun: {column}")
+        names.add(found[0])
+    return names
+
+
+class LogSink:
+    """Alarmları JSON satırı olarak dosyaya (path "-" ise oluşturulduğu andaki stdout'a) yazar."""
+    def __init__(self, path):
+        self.path = path
+        self.stream = sys.stdout if path == "-" else None
+
+    def emit(self, alert):
+        line = json.dumps(alert, ensure_ascii=False) + "\n"
+        if self.stream is not None:
+            self.stream.write(line)
+            self.stream.flush()
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+class WebhookSink:
+    """Alarmları JSON gövdeli POST isteğiyle yerel bir adrese gönderir (paylaşılan HTTP oturumu)."""
+    def __init__(self, url, timeout=5):
+        from utils.store import shared_session
+        self.url = url
+        self.timeout = timeout
+        self.session = shared_session()
+
+    def emit(self, alert):
+        try:
+            self.session.post(self.url, json=alert, timeout=self.timeout).raise_for_status()
+        except Exception as e:
+            print(f"Alarm gönderilemedi ({self.url}): {e}", file=sys.stderr)
+
+
+def open_sink(spec):
+    """"-" (stdout), "file:yol" veya "http(s)://..." tanımından alarm hedefi oluşturur."""
+    if spec == "-":
+        return LogSink("-")
+    if spec.startswith("file:"):
+        return LogSink(spec[len("file:"):])
+    if spec.startswith(("http://", "https://")):
+        return WebhookSink(spec)
+    raise ValueError(f"Bilinmeyen alarm hedefi: {spec}")
+
+
+class _Symbol:
+    """Tek sembolün motoru, motora verilen ilk bar ve son işlenen bar."""
+    def __init__(self, start):
+        self.engine = IndicatorEngine(keep_frame=False)
+        self.start = start
+        self.last = None  # (zaman, OHLCV satırı)
+        self.emitted = {}  # kural adı -> alarm üretilen bar zamanı
+
+
+class AlertDaemon:
+    """
+    İzleme listesini INTERVAL saniyede bir tarar. Fiyat geçmişi yerel depodan okunur ve kaynaktan
+    yalnızca son bardan sonraki barlar istenir (data.load_price_history); son barı değişmeyen
+    semboller için indikatör ya da kural hesabı yapılmaz.
+    load: sembol -> (df, bulunan sembol) (varsayılan: data.load_price_history; testler için değiştirilebilir).
+    prime: True ise sembolün ilk görüldüğü turdaki (servis açılmadan önceki) kesişimler bildirilmez;
+    tek turluk (cron) kullanımda False verilir.
+    """
+    def __init__(self, symbols, rules=RULES, sinks=(), interval=INTERVAL, workers=DEFAULT_WORKERS, load=None,
+                 prime=True):
+        self.symbols = list(symbols)
+        self.rules = list(rules)
+        self.sinks = list(sinks)
+        self.interval = interval
+        self.workers = workers
+        self.load = load or self._load
+        self.prime = prime
+        self.names = rule_indicators(self.rules)
+        self.indicator_columns = sorted({c for r in self.rules for c in r.columns()} - set(PRICE_COLUMNS) - {FAIR_VALUE})
+        self.state = {}
+        self.stopped = threading.Event()
+        self.error = None
+
+    @staticmethod
+    def _load(symbol):
+        df, ticker, _ = data.load_price_history(symbol)
+        return df, ticker
+
+    def _fetch(self, symbol):
+        try:
+            return self.load(symbol)
+        except Exception as e:
+            print(f"Veri alınamadı ({symbol}): {e}", file=sys.stderr)
+            return None, None
+
+    def changed(self):
+        """
+        Son barı (zamanı veya değerleri) bir önceki turdan farklı olan semboller:
+        [(sembol, sembol kodu, df, son iki barın OHLCV dizisi)].
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            results = list(pool.map(self._fetch, self.symbols))
+        out = []
+        for symbol, (df, ticker) in zip(self.symbols, results):
+            if df is None or df.empty:
+                continue
+            rows = kernel.ohlcv_array(df.iloc[-2:])
+            state = self.state.get(symbol)
+            if (state is not None and state.last[0] == df.index[-1]
+                    and np.array_equal(state.last[1], rows[-1], equal_nan=True)):
+                continue
+            out.append((symbol, ticker, df, rows))
+        return out
+
+    def evaluate(self, changed):
+        """Değişen sembollerin motorlarını ilerletir, kuralları tümü için birlikte değerlendirir; alarm listesi döndürür."""
+        if not changed:
+            return []
+        count = len(changed)
+        # Her sütun için (2 x sembol): önceki ve son bar değerleri
+        values = {c: np.full((2, count), np.nan) for c in self.indicator_columns + PRICE_COLUMNS + [FAIR_VALUE]}
+        fresh = np.zeros(count, dtype=bool)
+        for j, (symbol, ticker, df, rows) in enumerate(changed):
+            state = self.state.get(symbol)
+            if state is None or df.index[0] > state.start:
+                state = self.state[symbol] = _Symbol(df.index[max(0, len(df) - HISTORY)])
+                fresh[j] = True
+            view = df.iloc[df.index.searchsorted(state.start):]
+            state.engine.update(view, self.names, output=False)
+            state.last = (df.index[-1], rows[-1])
+            tail = state.engine.tail(self.indicator_columns)
+            for k, column in enumerate(self.indicator_columns):
+                values[column][:, j] = tail[:, k]
+            for k, column in enumerate(PRICE_COLUMNS):
+                values[column][2 - len(rows):, j] = rows[:, k]
+
+        table = screener.get_table().load()
+        if not table.empty and FAIR_VALUE in {c for r in self.rules for c in r.columns()}:
+            rows = table.reindex([item[0] for item in changed])
+            values[FAIR_VALUE][:] = indicators.graham_values(rows["eps"], rows["book_value"])
+
+        previous = {c: v[0] for c, v in values.items()}
+        current = {c: v[1] for c, v in values.items()}
+        alerts = []
+        for rule in self.rules:
+            crossed = rule.condition(current) & ~rule.condition(previous)
+            for j in np.flatnonzero(crossed):
+                symbol, ticker, df, _ = changed[j]
+                state = self.state[symbol]
+                bar_time = df.index[-1]
+                if state.emitted.get(rule.name) == bar_time:
+                    continue  # aynı bar revize edildi, alarm zaten üretildi
+                state.emitted[rule.name] = bar_time
+                if fresh[j] and self.prime:
+                    continue  # ilk görülen sembolün son barındaki kesişim servis açılmadan önce olmuş olabilir
+                alerts.append({
+                    "symbol": symbol, "ticker": ticker, "rule": rule.name,
+                    "bar": bar_time.isoformat(), "close": float(current["Close"][j]), "ts": time.time(),
+                })
+        return alerts
+
+    def cycle(self):
+        """Tek tur: değişen sembolleri bulur, kuralları değerlendirir ve alarmları hedeflere gönderir."""
+        with perf.span("alert_cycle", symbols=len(self.symbols)) as rec:
+            changed = self.changed()
+            alerts = self.evaluate(changed)
+            rec.update(changed=len(changed), alerts=len(alerts))
+        for alert in alerts:
+            for sink in self.sinks:
+                sink.emit(alert)
+        return alerts
+
+    def run(self):
+        """stop() çağrılana kadar INTERVAL saniyede bir tur çalıştırır."""
+        while not self.stopped.is_set():
+            started = time.monotonic()
+            try:
+                self.cycle()
+                self.error = None
+            except Exception as e:
+                self.error = f"{type(e).__name__}: {e}"
+                print(f"Alarm turu başarısız: {self.error}", file=sys.stderr)
+            self.stopped.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def stop(self):
+        self.stopped.set()
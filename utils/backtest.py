@@ -0,0 +1,299 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from utils import kernel
+
+# İşlem başına (tek yön) komisyon + kayma oranı
+FEE = 0.001
+BARS_PER_YEAR = 252
+# Zaman dilimi (haftalık/aylık birleştirme kuralı) başına yıllık bar sayısı
+TIMEFRAME_BARS_PER_YEAR = {None: BARS_PER_YEAR, "W": 52, "M": 12}
+
+# Varsayılan parametrelerle process_indicators'ın ürettiği sütunlar (yeniden hesaplanmaz)
+FRAME_COLUMNS = {
+    ('rsi', 14): 'RSI',
+    ('atr', 14): 'ATR',
+    ('ema', 200): 'EMA200',
+    ('macd', 12, 26, 9): ('MACD', 'MACD_Signal'),
+    ('supertrend', 7, 3.0): 'SUPERTd_7_3.0',
+    ('psar', 0.02, 0.2): 'PSARl_0.02_0.2',
+}
+
+# Tarama ızgaraları: kural -> {parametre: değerler}; atr_mult=None iz süren stop kapalı demektir
+DEFAULT_GRIDS = {
+    'rsi': {
+        'length': list(range(5, 31)),
+        'lower': [20, 25, 30, 35],
+        'upper': [65, 70, 75, 80],
+        'atr_mult': [None, 1.5, 2.0, 2.5, 3.0],
+    },
+    'supertrend': {
+        'length': list(range(5, 21)),
+        'multiplier': [1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0],
+        'atr_mult': [None, 1.5, 2.0, 2.5, 3.0, 4.0],
+    },
+}
+
+
+class MarketData:
+    """
+    Tek hisse için fiyat dizileri ve parametreye göre hesaplanan indikatörlerin önbelleği.
+    Aynı indikatör (örn. ATR 14) farklı kurallar/parametreler arasında bir kez hesaplanır.
+    """
+    def __init__(self, df):
+        self.df = df
+        self.index = df.index
+        self.bars = kernel.bars_dict(kernel.ohlcv_array(df))
+        self._memo = {}
+
+    def get(self, *key):
+        if key not in self._memo:
+            self._memo[key] = self._compute(key)
+        return self._memo[key]
+
+    def _compute(self, key):
+        column = FRAME_COLUMNS.get(key)
+        if column is not None and all(c in self.df.columns for c in np.atleast_1d(column)):
+            if isinstance(column, tuple):
+                return tuple(self.df[c].to_numpy(dtype=float) for c in column)
+            return self.df[column].to_numpy(dtype=float)
+
+        name, params = key[0], key[1:]
+        b = self.bars
+        if name == 'rsi':
+            return kernel.rsi(b['close'], *params)
+        if name == 'atr':
+            return kernel.atr(b['high'], b['low'], b['close'], *params)
+        if name == 'ema':
+            return kernel.ema(b['close'], *params)
+        if name == 'macd':
+            fast, slow, signal = params
+            macd = kernel.ewm(b['close'], fast) - kernel.ewm(b['close'], slow)
+            return macd, kernel.ewm(macd, signal)
+        if name == 'supertrend':
+            return kernel.supertrend(b['high'], b['low'], b['close'], *params)[1].astype(float)
+        if name == 'psar':
+            return kernel.psar(b['high'], b['low'], b['close'], *params)[0]
+        raise KeyError(name)
+
+
+def hold(entries, exits):
+    """
+    Giriş/çıkış olaylarından pozisyon dizisi (1: elde, 0: nakit) üretir; döngü yerine
+    son olayı ileri taşır. Aynı barda ikisi birden varsa çıkış geçerlidir.
+    """
+    state = np.full(len(entries), np.nan)
+    state[entries] = 1.0
+    state[exits] = 0.0
+    last = np.maximum.accumulate(np.where(np.isnan(state), 0, np.arange(len(state))))
+    pos = state[last]
+    return np.where(np.isnan(pos), 0.0, pos)
+
+
+def _edges(state):
+    """Durum dizisinden (True: elde tut) giriş/çıkış olayları."""
+    prev = np.r_[False, state[:-1]]
+    return state & ~prev, ~state & prev
+
+
+def _cross_up(x, level):
+    return np.r_[False, (x[1:] > level) & (x[:-1] <= level)]
+
+
+def _cross_down(x, level):
+    return np.r_[False, (x[1:] < level) & (x[:-1] >= level)]
+
+
+def rsi_rule(data, length=14, lower=30, upper=70):
+    """RSI aşırı satımdan yukarı kesince al, aşırı alımdan aşağı kesince sat."""
+    r = data.get('rsi', length)
+    return _cross_up(r, lower), _cross_down(r, upper)
+
+
+def macd_rule(data, fast=12, slow=26, signal=9):
+    """MACD sinyal çizgisinin üzerindeyken elde tut."""
+    macd, sig = data.get('macd', fast, slow, signal)
+    return _edges(macd > sig)
+
+
+def ema_trend_rule(data, length=200):
+    """Fiyat uzun vadeli ortalamanın üzerindeyken elde tut."""
+    return _edges(data.bars['close'] > data.get('ema', length))
+
+
+def supertrend_rule(data, length=7, multiplier=3.0):
+    """SuperTrend yönü yukarıyken elde tut."""
+    return _edges(data.get('supertrend', length, float(multiplier)) == 1)
+
+
+def psar_rule(data, af0=0.02, max_af=0.2):
+    """Parabolic SAR fiyatın altındayken (yükseliş) elde tut."""
+    return _edges(~np.isnan(data.get('psar', af0, max_af)))
+
+
+RULES = {
+    'rsi': rsi_rule,
+    'macd': macd_rule,
+    'ema_trend': ema_trend_rule,
+    'supertrend': supertrend_rule,
+    'psar': psar_rule,
+}
+
+# "Teknik Sinyaller" panelindeki kuralların Türkçe adları
+RULE_LABELS = {
+    'rsi': "RSI (30/70)",
+    'macd': "MACD Kesişimi",
+    'ema_trend': "EMA200 Trendi",
+    'supertrend': "SuperTrend",
+    'psar': "Parabolic SAR",
+}
+
+
+def pivot_respect(df, pivots, levels=("S1", "S2", "R1", "R2")):
+    """
+    Fiyatın pivot seviyelerine saygı oranı (indicators.pivot_series çıktısıyla, tüm geçmişte vektörel).
+    Destek (S*): Low seviyeye değip Close üzerinde kalırsa tuttu; direnç (R*): High değip Close altında kalırsa.
+    Dönüş: seviye başına touches (temas eden bar), held (tutulan) ve rate (oran) tablosu.
+    """
+    high = df['High'].to_numpy(dtype=float)
+    low = df['Low'].to_numpy(dtype=float)
+    close = df['Close'].to_numpy(dtype=float)
+    rows = {}
+    for name in levels:
+        level = pivots[name].to_numpy(dtype=float)
+        if name.startswith('S'):
+            touched, held = low <= level, close >= level
+        else:
+            touched, held = high >= level, close <= level
+        touches = int(touched.sum())
+        kept = int((touched & held).sum())
+        rows[name] = {'touches': touches, 'held': kept, 'rate': kept / touches if touches else np.nan}
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def trailing_stop(data, entries, pos, mult, length=14):
+    """
+    ATR iz süren stop: her giriş sinyalinden sonraki en yüksek kapanışın mult*ATR altına
+    inilirse pozisyon kapatılır ve yeni giriş sinyaline kadar nakitte kalınır
+    (elde iken gelen yeni giriş sinyali stopu yeniden kurar).
+    Sinyal içi kümülatif maksimumlar gruplanarak (döngüsüz) hesaplanır.
+    """
+    close = data.bars['close']
+    held = pos > 0
+    trade = np.cumsum(entries)
+    groups = pd.Series(np.where(held, close, -np.inf)).groupby(trade)
+    peak = groups.cummax().to_numpy()
+    with np.errstate(invalid='ignore'):
+        hit = held & (close < peak - mult * data.get('atr', length))
+    stopped = pd.Series(hit).groupby(trade).cummax().to_numpy()
+    return np.where(stopped, 0.0, pos)
+
+
+def performance(close, pos, fee=FEE, index=None, bars_per_year=BARS_PER_YEAR):
+    """
+    Pozisyon dizisinden getiri istatistikleri. Sinyal bar kapanışında verilir,
+    pozisyon bir sonraki bardan itibaren taşınır; her pozisyon değişiminde fee ödenir.
+    """
+    close = np.asarray(close, dtype=float)
+    held = np.r_[0.0, pos[:-1]]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        change = np.r_[0.0, close[1:] / close[:-1] - 1]
+    change = np.where(np.isfinite(change), change, 0.0)
+    turnover = np.abs(np.diff(held, prepend=0.0))
+    rets = held * change - fee * turnover
+
+    equity = np.cumprod(1 + rets)
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+
+    # İşlem bazında getiri: elde tutulan barlar + çıkış barı (komisyon) aynı işleme yazılır
+    prev = np.r_[0.0, held[:-1]]
+    trade = np.cumsum((held > 0) & (prev == 0))
+    in_trade = (held > 0) | (prev > 0)
+    trade_log = np.bincount(trade[in_trade], weights=np.log1p(rets[in_trade]), minlength=trade.max() + 1)[1:]
+    trade_rets = np.expm1(trade_log)
+
+    years = len(close) / bars_per_year
+    total = equity[-1] - 1 if len(equity) else 0.0
+    std = rets.std()
+    stats = {
+        'total_return': total,
+        'cagr': (1 + total) ** (1 / years) - 1 if years > 0 and total > -1 else np.nan,
+        'max_drawdown': drawdown.min() if len(drawdown) else 0.0,
+        'sharpe': rets.mean() / std * np.sqrt(bars_per_year) if std > 0 else np.nan,
+        'trades': len(trade_rets),
+        'hit_rate': (trade_rets > 0).mean() if len(trade_rets) else np.nan,
+        'exposure': held.mean() if len(held) else 0.0,
+        'buy_hold': close[-1] / close[0] - 1 if len(close) > 1 else 0.0,
+    }
+    if index is not None:
+        stats['equity'] = pd.Series(equity, index=index)
+    return stats
+
+
+def run(data, rule, atr_mult=None, atr_length=14, fee=FEE, equity=False, bars_per_year=BARS_PER_YEAR, **params):
+    """
+    Tek kuralı tüm geçmiş üzerinde çalıştırır.
+    data: MarketData veya indikatörlü DataFrame. atr_mult verilirse ATR iz süren stop eklenir.
+    """
+    if not isinstance(data, MarketData):
+        data = MarketData(data)
+    entries, exits = RULES[rule](data, **params)
+    pos = hold(entries, exits)
+    if atr_mult is not None:
+        pos = trailing_stop(data, entries, pos, atr_mult, atr_length)
+    return performance(data.bars['close'], pos, fee, data.index if equity else None, bars_per_year)
+
+
+def evaluate_signals(df, fee=FEE, bars_per_year=BARS_PER_YEAR):
+    """
+    Paneldeki yerleşik kuralların varsayılan parametrelerle geçmiş performans tablosu.
+    bars_per_year: haftalık/aylık barlarda yıllık getiri ve Sharpe için (bkz. TIMEFRAME_BARS_PER_YEAR).
+    """
+    data = MarketData(df)
+    rows = {RULE_LABELS[rule]: run(data, rule, fee=fee, bars_per_year=bars_per_year) for rule in RULES}
+    return pd.DataFrame(rows).T
+
+
+def grid(params):
+    """{parametre: değerler} ızgarasını yapılandırma sözlükleri listesine açar."""
+    keys = list(params)
+    return [dict(zip(keys, values)) for values in itertools.product(*(params[k] for k in keys))]
+
+
+# Süreç havuzundaki her işçinin kendi MarketData kopyası (indikatör önbelleği işçi içinde paylaşılır)
+_worker_data = None
+
+
+def _init_worker(df):
+    global _worker_data
+    _worker_data = MarketData(df)
+
+
+def _run_configs(rule, configs, fee):
+    return [run(_worker_data, rule, fee=fee, **config) for config in configs]
+
+
+def _chunks(configs, size):
+    return [configs[i:i + size] for i in range(0, len(configs), size)]
+
+
+def sweep(df, rule, params=None, fee=FEE, processes=None):
+    """
+    Parametre taraması: ızgaradaki tüm yapılandırmalar süreç havuzunda paralel çalıştırılır.
+    Yapılandırmalar, aynı indikatörü paylaşanlar aynı işçiye düşecek şekilde sıralı parçalara bölünür.
+    Dönüş: parametreler + istatistikler, toplam getiriye göre sıralı DataFrame.
+    """
+    configs = grid(params or DEFAULT_GRIDS[rule])
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(configs) < 2:
+        _init_worker(df)
+        results = _run_configs(rule, configs, fee)
+    else:
+        size = max(1, -(-len(configs) // (processes * 4)))
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(df,)) as pool:
+            parts = pool.map(_run_configs, itertools.repeat(rule), _chunks(configs, size), itertools.repeat(fee))
+            results = [stats for part in parts for stats in part]
+    table = pd.concat([pd.DataFrame(configs), pd.DataFrame(results)], axis=1)
+    return table.sort_values('total_return', ascending=False, ignore_index=True)
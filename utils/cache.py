@@ -0,0 +1,169 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Katmanlar: ham fiyat verisi, haftalık/aylık barlar, indikatörlü tablo, türetilmiş sonuçlar (periyot dilimi vb.)
+LAYERS = ("raw", "bars", "indicators", "derived")
+
+# Katman başına en fazla bu kadar kayıt tutulur (en eski kullanılan atılır)
+MAX_ENTRIES = 64
+# Tüm katmanların toplam bellek bütçesi; aşılınca en uzun süredir kullanılmayan kayıtlar atılır
+MEMORY_BUDGET = int(os.environ.get("PROTRADE_CACHE_MB", 512)) * 2**20
+
+# Önbelleğe giren tablolarda kullanılmayan sütunlar ve float32'ye çevirmede izin verilen
+# en büyük mutlak hata (fiyatlar 2 basamakla gösterilir)
+DROP_COLUMNS = ("Dividends", "Stock Splits")
+COMPACT_TOLERANCE = 0.005
+
+
+def compact(df, tolerance=COMPACT_TOLERANCE):
+    """
+    Tabloyu önbellek için küçültür: kullanılmayan sütunlar atılır, float32'ye çevrildiğinde
+    hiçbir değeri tolerance'tan fazla değişmeyen sütunlar float32, -1/0/1 gibi küçük tamsayı
+    sütunları int8 olur. Büyük değerli sütunlar (hacim, çok yüksek fiyatlar) float64 kalır.
+    """
+    if df is None:
+        return df
+    columns = {}
+    changed = False
+    for col in df.columns:
+        if col in DROP_COLUMNS:
+            changed = True
+            continue
+        values = original = df[col].to_numpy()
+        if values.dtype == np.float64:
+            small = values.astype(np.float32)
+            with np.errstate(invalid='ignore', over='ignore'):
+                error = np.abs(small - values)
+            error = error[~np.isnan(error)]
+            if not error.size or error.max() <= tolerance:
+                values = small
+        elif values.dtype == np.int64 and len(values) and -128 <= values.min() and values.max() <= 127:
+            values = values.astype(np.int8)
+        changed |= values is not original
+        columns[col] = values
+    if not changed:
+        return df
+    return pd.DataFrame(columns, index=df.index)
+
+
+def sizeof(value):
+    """Önbellek kaydının yaklaşık bellek boyutu (bayt); tablolar, diziler, grafikler, nesneler ve bunların demetleri."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    if hasattr(value, "to_plotly_json"):
+        return sizeof(value.to_plotly_json())
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + sizeof(vars(value))
+    return sys.getsizeof(value)
+
+
+def cache_key(ticker, df, config=(), asof=None):
+    """
+    (bulunan sembol, son bar zamanı, ayar) anahtarı üretir.
+    config: indikatör adları / periyot gibi sıralanabilir değerler.
+    asof: df haftalık/aylık barlarsa türetildiği günlük son bar zamanı (açık dönemin etiketi
+    yeni günlerle değişmez; anahtar günlük son barla değişmeli).
+    """
+    last_ts = asof if asof is not None else df.index[-1] if df is not None and not df.empty else None
+    if isinstance(config, (set, frozenset)):
+        config = tuple(sorted(config))
+    return (ticker, last_ts, config)
+
+
+class KeyedCache:
+    """
+    Süreç genelinde paylaşılan, katmanlı ve anahtarlı önbellek.
+    Anahtarların ilk elemanı sembol kabul edilir; böylece tek bir sembolün
+    kayıtları diğerlerine dokunmadan temizlenebilir.
+    Kayıtlar kopyalanmadan paylaşılır (çağıranlar değiştirmemeli); her kaydın boyutu
+    ölçülür ve toplam max_bytes'ı aşarsa katmandan bağımsız en eski kullanılan kayıt atılır.
+    """
+    def __init__(self, layers=LAYERS, max_entries=MAX_ENTRIES, max_bytes=MEMORY_BUDGET):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = {layer: OrderedDict() for layer in layers}
+        self._order = OrderedDict()  # (katman, anahtar) -> None, tüm katmanlar için kullanım sırası
+        self._bytes = {layer: 0 for layer in layers}
+        self._stats = {layer: {"hits": 0, "misses": 0, "evictions": 0} for layer in layers}
+        self._lock = threading.Lock()
+
+    def get(self, layer, key, max_age=None):
+        """Kayıt yoksa (veya max_age saniyeden eskiyse) None döner."""
+        with self._lock:
+            entries = self._entries[layer]
+            entry = entries.get(key)
+            if entry is not None and (max_age is None or time.time() - entry[0] <= max_age):
+                entries.move_to_end(key)
+                self._order.move_to_end((layer, key))
+                self._stats[layer]["hits"] += 1
+                return entry[1]
+            self._stats[layer]["misses"] += 1
+            return None
+
+    def peek(self, layer, key):
+        """Sayaçları ve yaşı etkilemeden kaydı döndürür (yeniden doğrulama için)."""
+        with self._lock:
+            entry = self._entries[layer].get(key)
+            return None if entry is None else entry[1]
+
+    def _remove(self, layer, key):
+        entry = self._entries[layer].pop(key)
+        del self._order[(layer, key)]
+        self._bytes[layer] -= entry[2]
+
+    def put(self, layer, key, value):
+        size = sizeof(value)
+        with self._lock:
+            entries = self._entries[layer]
+            if key in entries:
+                self._remove(layer, key)
+            if size > self.max_bytes:
+                # Bütçeden büyük kayıt tutulmaz (diğer her şeyi atmaya değmez)
+                return
+            entries[key] = (time.time(), value, size)
+            self._order[(layer, key)] = None
+            self._bytes[layer] += size
+            while len(entries) > self.max_entries:
+                self._evict(layer, next(iter(entries)))
+            while sum(self._bytes.values()) > self.max_bytes:
+                self._evict(*next(iter(self._order)))
+
+    def _evict(self, layer, key):
+        self._remove(layer, key)
+        self._stats[layer]["evictions"] += 1
+
+    def invalidate(self, ticker, layers=None):
+        """Yalnızca verilen sembole ait kayıtları siler; silinen kayıt sayısını döndürür."""
+        removed = 0
+        with self._lock:
+            for layer in layers or self._entries:
+                for key in [k for k in self._entries[layer] if k[0] == ticker]:
+                    self._remove(layer, key)
+                    removed += 1
+        return removed
+
+    def clear(self):
+        with self._lock:
+            for entries in self._entries.values():
+                entries.clear()
+            self._order.clear()
+            self._bytes = dict.fromkeys(self._bytes, 0)
+
+    def stats(self):
+        """Katman başına isabet / ıskalama / atılma sayıları, kayıt adedi ve bellek (bayt)."""
+        with self._lock:
+            return {layer: dict(self._stats[layer], size=len(self._entries[layer]), bytes=self._bytes[layer])
+                    for layer in self._entries}
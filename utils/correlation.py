@@ -0,0 +1,169 @@
+"""
+Gösterge endeksine (XU100) göre kayan beta, korelasyon ve göreli güç; izleme listesi için
+son pencerenin korelasyon matrisi. Hizalanmış kapanış paneli (scanner.build_panel) üzerinde
+önek toplamlarıyla çalışır: her bar ve sembol için pencere toplamı iki önek farkıdır, yeni barlar
+geldiğinde yalnızca onların önekleri eklenir.
+Sembolün işlem görmediği günler panelde NaN'dır: o günün ve ertesi günün getirisi sayılmaz
+(doldurulmuş fiyatın sahte sıfır getirisi betayı sıfıra çekerdi); istatistikler iki tarafın da
+geçerli getirisi olan günler üzerinden hesaplanır.
+"""
+import numpy as np
+import pandas as pd
+
+# Gösterge endeksi (Yahoo sembolü) ve varsayılan pencere (bar)
+BENCHMARK = "XU100.IS"
+WINDOW = 60
+# Penceredeki geçerli (iki tarafın da işlem gördüğü) getiri oranı bunun altındaysa sonuç NaN
+MIN_COVERAGE = 0.8
+# Önek toplamları tutulan büyüklükler: geçerli getiri sayısı, x, y, x², y², x·y (x: hisse, y: endeks)
+_SUMS = ("count", "x", "y", "xx", "yy", "xy")
+
+
+def returns(close):
+    """(zaman x sembol) kapanışlardan basit getiriler; ilk satır NaN."""
+    out = np.full(close.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[1:] = close[1:] / close[:-1] - 1
+    return out
+
+
+def _min_count(window):
+    return int(np.ceil(window * MIN_COVERAGE))
+
+
+def correlation_matrix(ret):
+    """
+    (pencere x sembol) getirilerin ikili korelasyon matrisi: her çift, ikisinin de geçerli getirisi
+    olan satırlar üzerinden (birkaç matris çarpımıyla) hesaplanır. Ortak satır sayısı
+    MIN_COVERAGE oranının altında kalan çiftler NaN.
+    """
+    valid = np.isfinite(ret)
+    m = valid.astype(float)
+    x = np.where(valid, ret, 0.0)
+    n = m.T @ m                 # ortak satır sayısı
+    sx = x.T @ m                # sx[i, j]: i'nin j ile ortak satırlardaki toplamı
+    sxx = (x * x).T @ m
+    sxy = x.T @ x
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sx.T / n
+        var = sxx - sx * sx / n
+        corr = cov / np.sqrt(var * var.T)
+    corr[n < _min_count(len(ret))] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+class RollingCorrelation:
+    """
+    Kapanış panelinin (ilk sütun gösterge endeksi) kayan istatistikleri.
+    update yeni barlar için önek toplamlarını uzatır; son bar revize edilmişse yalnızca o bardan
+    itibaren yeniden hesaplar. Panelin geçmişi değişmişse (yeni sembol, düzeltme) baştan kurar.
+    """
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self.columns = None
+        self.index = None
+        self.close = None
+        self.filled = None
+        self.ret = None
+        self.prefix = {}
+        self.beta = self.corr = self.rs = None
+        self._snapshot = None
+
+    def update(self, panel):
+        """panel: scanner.build_panel çıktısı (tarih x sembol), ilk sütun gösterge endeksi."""
+        close = panel.to_numpy(dtype=float)
+        n = len(close)
+        m = 0 if self.index is None else len(self.index)
+        if (m == 0 or list(panel.columns) != self.columns or n < m
+                or panel.index[0] != self.index[0] or panel.index[m - 1] != self.index[-1]):
+            start = 0
+        elif n == m and np.array_equal(close[-1], self.close[-1], equal_nan=True):
+            return self
+        else:
+            start = m - 1  # son bar seans içinde değişmiş olabilir
+
+        ret = returns(close[max(0, start - 1):])[1 if start else 0:]
+        self.ret = ret if start == 0 else np.concatenate([self.ret[:start], ret])
+        x, y = ret, ret[:, :1]
+        valid = np.isfinite(x) & np.isfinite(y)
+        x = np.where(valid, x, 0.0)
+        y = np.where(valid, y, 0.0)
+        terms = {"count": valid.astype(float), "x": x, "y": y, "xx": x * x, "yy": y * y, "xy": x * y}
+        for name in _SUMS:
+            base = self.prefix[name][start] if start else np.zeros(close.shape[1])
+            tail = base + np.cumsum(terms[name], axis=0)
+            head = self.prefix[name][:start + 1] if start else base[None, :]
+            self.prefix[name] = np.concatenate([head, tail])
+
+        self.columns = list(panel.columns)
+        self.index = panel.index
+        self.close = close
+        # Göreli güç fiyat düzeyiyle hesaplanır: işlem görülmeyen günde son kapanış geçerlidir
+        self.filled = panel.ffill().to_numpy(dtype=float)
+        # Sonuçlar da yalnızca değişen barlar için hesaplanıp eklenir
+        fresh = self._rows(start)
+        if start:
+            fresh = [np.concatenate([old[:start], new]) for old, new in zip((self.beta, self.corr, self.rs), fresh)]
+        self.beta, self.corr, self.rs = fresh
+        self._snapshot = None
+        return self
+
+    def _rows(self, start):
+        """[start, n) barları için beta, korelasyon ve göreli güç (pencere toplamları önek farklarından)."""
+        w = self.window
+        n, k = self.close.shape
+        rows = np.arange(start, n)
+        ready = rows >= w - 1
+        s = {}
+        for name in _SUMS:
+            p = self.prefix[name]
+            s[name] = np.full((n - start, k), np.nan)
+            s[name][ready] = p[rows[ready] + 1] - p[rows[ready] + 1 - w]
+        c = s["count"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = s["xy"] - s["x"] * s["y"] / c
+            var_x = s["xx"] - s["x"] ** 2 / c
+            var_y = s["yy"] - s["y"] ** 2 / c
+            full = c >= _min_count(w)
+            beta = np.where(full, cov / var_y, np.nan)
+            corr = np.where(full, np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0), np.nan)
+            rs = np.full((n - start, k), np.nan)
+            late = rows >= w
+            growth = self.filled[rows[late]] / self.filled[rows[late] - w]
+            rs[late] = (growth / growth[:, :1] - 1) * 100
+        return beta, corr, rs
+
+    def rolling(self):
+        """
+        Her bar ve sembol için (zaman x sembol) beta ve korelasyon.
+        Penceredeki geçerli getiri çifti MIN_COVERAGE oranının altındaysa NaN; endeks sütununun kendisiyle betası 1'dir.
+        """
+        return self.beta, self.corr
+
+    def relative_strength(self):
+        """
+        Son `window` barda hissenin endekse göre getiri farkı (%): (1+r_hisse)/(1+r_endeks) - 1.
+        İşlem görülmeyen günlerde son kapanış kullanılır.
+        """
+        return self.rs
+
+    def matrix(self):
+        """Son pencerenin (sembol x sembol) korelasyon matrisi."""
+        return correlation_matrix(self.ret[-self.window:])
+
+    def snapshot(self):
+        """
+        Güncel sonuçlar (sonraki update'lerden etkilenmeyen tablolar; yeni bar gelene kadar yeniden hesaplanmaz):
+        beta, corr, rs: (tarih x sembol) DataFrame; matrix: (sembol x sembol) DataFrame.
+        """
+        if self._snapshot is not None:
+            return self._snapshot
+        beta, corr = self.rolling()
+        frame = lambda values: pd.DataFrame(values, index=self.index, columns=self.columns)
+        self._snapshot = {
+            "beta": frame(beta),
+            "corr": frame(corr),
+            "rs": frame(self.relative_strength()),
+            "matrix": pd.DataFrame(self.matrix(), index=self.columns, columns=self.columns),
+        }
+        return self._snapshot
@@ -1,23 +1,84 @@
-import yfinance as yf
+import os
 import pandas as pd
-import pandas_ta as ta
-import numpy as np
-from scipy.signal import argrelextrema
 from datetime import timedelta
-import streamlit as st
-import requests
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from utils.store import OHLCVStore, FundamentalsStore, ResolverCache, YahooSource
+from utils.engine import IndicatorEngine
+from utils import kernel, scanner, screener, perf, downsample, correlation
+from utils.cache import KeyedCache, cache_key, compact
 
-@st.cache_data(ttl=300)  # Cache süresini hata durumunda hızlı düzelmesi için kısalttık
-def fetch_stock_data(symbol, period="max"):
+# Uzak veri kaynağı ve yerel depo (testlerde set_source ile sahte kaynak verilebilir)
+_source = None
+_store = OHLCVStore()
+_fundamentals = FundamentalsStore()
+_fundamentals_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="fundamentals")
+# Girdi -> bulunan sembol eşlemesi ve varyasyonları aynı anda deneyen havuz
+_resolver = ResolverCache()
+_resolve_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="resolve")
+
+# Ham veri, indikatör ve türetilmiş sonuç katmanlı önbellek (tüm oturumlar paylaşır)
+_cache = KeyedCache()
+# Ham veri bu süreden eskiyse depo son bardan itibaren yeniden doğrulanır
+RAW_TTL = 300
+# İzleme listesi tarama sonuçları bu süre önbellekte tutulur
+SCAN_TTL = 300
+# Süreç açılışında arka planda önbelleğe yüklenecek popüler semboller (boşsa kapalı), örn. "THYAO,GARAN"
+PREWARM = os.environ.get("PROTRADE_PREWARM", "").replace(",", " ").upper().split()
+# Seçilebilir zaman dilimleri: ad -> günlük barların birleştirme kuralı (None: günlük)
+TIMEFRAMES = {"Günlük": None, "Haftalık": "W", "Aylık": "M"}
+
+def _stderr(message):
+    print(message, file=sys.stderr)
+
+# Kullanıcıya gösterilecek uyarı/hata mesajları (arayüz set_reporter ile st.warning/st.error verir)
+_warning = _stderr
+_error = _stderr
+
+def set_reporter(warning=None, error=None):
+    """Uyarı ve hata mesajlarının iletileceği fonksiyonları ayarlar (varsayılan: stderr)."""
+    global _warning, _error
+    _warning = warning or _stderr
+    _error = error or _stderr
+
+def set_source(source):
+    """Uzak veri kaynağını değiştirir (örn. testler için store.LocalSource)."""
+    global _source
+    _source = source
+    _cache.clear()
+
+def get_source():
+    global _source
+    if _source is None:
+        # Varsayılan kaynak paylaşılan (bağlantı havuzlu) oturumu kullanır
+        _source = YahooSource()
+    return _source
+
+def set_store(store):
+    global _store
+    _store = store
+    _cache.clear()
+
+def get_store():
+    return _store
+
+def set_resolver(resolver):
+    """Sembol çözümleme önbelleğini değiştirir (örn. testler için geçici dosya)."""
+    global _resolver
+    _resolver = resolver
+
+def resolved_ticker(symbol):
     """
-    Hisse verilerini çeker. Akıllı yeniden deneme (retry) ve User-Agent koruması içerir.
+    Girdinin kalıcı önbellekte kayıtlı karşılığı (bilinmiyorsa ya da bulunamadı kaydıysa None).
+    Fiyat geçmişi çekilmeden önce temel veri işini başlatmak için kullanılır.
     """
-    # Yahoo Finance Bot Korumasını Aşmak İçin Oturum Açıyoruz
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    })
+    known, ticker = _resolver.get(symbol)
+    return ticker if known else None
 
+def symbol_variations(symbol):
+    """Kullanıcı girdisi için denenecek sembol varyasyonları (THYAO -> THYAO, THYAO.IS)."""
     variations = [symbol]
     
     # Alternatif sembol varyasyonları üret
@@ -26,86 +87,300 @@ def fetch_stock_data(symbol, period="max"):
         variations.append(f"{stripped}.IS") 
     else:
         variations.append(stripped)
-        
-    for ticker in variations:
+    return variations
+
+@perf.timed("store_update")
+def _fetch_history(ticker, source, store):
+    """Depoyu günceller; veri yoksa None döner."""
+    df = store.update(ticker, source)
+    if df is None or df.empty:
+        return None
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    return df
+
+@perf.timed("price_history")
+def load_price_history(symbol, period="max"):
+    """
+    Streamlit'e bağlı olmayan fiyat geçmişi yükleyici (tarayıcı ve arka plan işleri için).
+    Girdinin hangi sembole karşılık geldiği kalıcı önbellekte tutulur; bilinmiyorsa
+    varyasyonlar aynı anda denenir (öncelik sırası korunur).
+    Dönüş: (df, bulunan_sembol, hatalar) - hatalar: [(sembol, mesaj), ...]
+    """
+    source = get_source()
+    store = get_store()
+    errors = []
+
+    known, ticker = _resolver.get(symbol)
+    perf.note(cache="hit" if known else "miss")
+    if known and ticker is None:
+        return None, None, [(symbol, "Sembol bulunamadı, bir süre sonra yeniden denenecek.")]
+    df = None
+    if known:
         try:
-            # Session parametresini iletiyoruz
-            stock = yf.Ticker(ticker, session=session)
-            df = stock.history(period=period)
-            
-            if not df.empty:
-                if isinstance(df.columns, pd.MultiIndex):
-                    df.columns = df.columns.get_level_values(0)
-                return df, stock.financials, stock.balance_sheet, stock.info, ticker
+            df = _fetch_history(ticker, source, store)
         except Exception as e:
-            st.warning(f"Deneme başarısız ({ticker}): {str(e)}") # Kullanıcıya hatayı göster
             print(f"Deneme başarısız ({ticker}): {e}")
-            continue
+
+    if df is None:
+        found = None
+        fetch = perf.bind(_fetch_history)
+        futures = [(t, _resolve_executor.submit(fetch, t, source, store)) for t in symbol_variations(symbol)]
+        for t, future in futures:
+            try:
+                df = future.result()
+            except Exception as e:
+                print(f"Deneme başarısız ({t}): {e}")
+                errors.append((t, str(e)))
+                continue
+            if df is not None:
+                found = t
+                break
+        if found is None:
+            if not errors and not known:
+                # Hiçbir varyasyon veri döndürmedi (ağ hatası değil): negatif kayıt. Daha önce
+                # çözümlenmiş sembolün tek seferlik boş yanıtı kalıcı eşlemeyi silmez.
+                _resolver.put(symbol, None)
+            return None, None, errors
+        if found != ticker:
+            _resolver.put(symbol, found)
+        ticker = found
+
+    if period != "max":
+        df = slice_data_by_period(df, period)
+    return df, ticker, errors
+
+def _revised(old, new, count=None):
+    """
+    new, old'un ilk count barını (None ise tümünü) değiştirmiş mi (düzeltme, eksik bar vb.)?
+    Yalnızca yeni bar eklenmişse ya da hiçbir şey değişmemişse False.
+    """
+    n = len(old) if count is None else count
+    if len(new) < n or not old.index[:n].equals(new.index[:n]):
+        return True
+    return not old.iloc[:n].equals(new.iloc[:n])
+
+def _drop_engines(ticker):
+    """Sembolün tüm indikatör motorlarını (W/M zaman dilimleri dahil) atar."""
+    with _engines_lock:
+        for key in [k for k in _engines if k == ticker or (isinstance(k, tuple) and k[0] == ticker)]:
+            del _engines[key]
+
+@perf.timed("fetch_stock_data")
+def fetch_stock_data(symbol, period="max", refresh=False, quiet=False):
+    """
+    Hisse verilerini çeker. Fiyat geçmişi yerel depodan okunur, uzak kaynaktan
+    yalnızca son kayıtlı bardan sonraki barlar istenir.
+    refresh=True yalnızca bu sembolü yeniden doğrular; kayıtlı barlar değişmediyse indikatör ve
+    türetilmiş önbellek kayıtları korunur (eklenen barlar son bar zamanıyla yeni anahtar üretir).
+    quiet=True: hata mesajları kullanıcıya değil stderr'e yazılır (arka plan işleri için).
+    """
+    warning, error = (_stderr, _stderr) if quiet else (_warning, _error)
+    key = (symbol, period)
+    if not refresh:
+        cached = _cache.get("raw", key, max_age=RAW_TTL)
+        if cached is not None:
+            perf.note(cache="hit")
+            return cached
+    perf.note(cache="miss")
+    previous = _cache.peek("raw", key)
+
+    df, ticker, errors = load_price_history(symbol, period)
+    for failed, message in errors:
+        warning(f"Deneme başarısız ({failed}): {message}") # Kullanıcıya hatayı göster
+    if df is not None:
+        # Önbellekte küçük tutulur (float32 fiyatlar, temettü/bölünme sütunları yok)
+        df = compact(df)
+        if previous is None or _revised(previous[0], df):
+            # Kayıtlı bir bar (aynı zamanlı son bar dahil) düzeltilmiş: bu sembolün hesapları geçersiz
+            _cache.invalidate(ticker, ("indicators", "derived"))
+        if previous is not None and _revised(previous[0], df, len(previous[0]) - 1):
+            # Geçmiş yeniden düzeltilmiş (temettü/bölünme): haftalık/aylık barlar ve motorların
+            # özyinelemeli durumu eski
+            _cache.invalidate(ticker, ("bars",))
+            _drop_engines(ticker)
+        _cache.put("raw", key, (df, ticker))
+        return df, ticker
             
     # Hiçbir varyasyon çalışmadıysa
-    st.error("Tüm denemeler başarısız oldu. Lütfen internet bağlantınızı kontrol edin veya daha sonra tekrar deneyin.")
-    return None, None, None, None, None
+    error("Tüm denemeler başarısız oldu. Lütfen internet bağlantınızı kontrol edin veya daha sonra tekrar deneyin.")
+    return None, None
+
+def cache_stats():
+    """Önbellek katmanlarının isabet / ıskalama sayaçları."""
+    return _cache.stats()
+
+def scan_watchlist(symbols):
+    """İzleme listesini tarar (bkz. scanner.scan); sonuç tablosu SCAN_TTL saniye önbellekte tutulur."""
+    key = ("*scan*", None, tuple(symbols))
+    table = _cache.get("derived", key, max_age=SCAN_TTL)
+    if table is None:
+        table = scanner.scan(list(symbols))
+        _cache.put("derived", key, table)
+    return table
+
+def valuation_screen(symbols):
+    """
+    Sembolleri kolon-bazlı temel veri tablosundan değerleme sırasına dizer (bkz. screener.screen).
+    Tabloda olmayan ya da eskimiş semboller arka planda yenilenir; sonuç beklemez.
+    Dönüş: (tablo, yenilenmeyi bekleyen semboller)
+    """
+    stale = screener.stale_symbols(symbols)
+    if stale:
+        screener.refresh_async(stale)
+    return screener.screen(screener.get_table().load(), symbols), stale
+
+@perf.timed("fundamentals")
+def fetch_fundamentals(ticker):
+    """
+    Temel verileri (financials, balance_sheet, info) döndürür.
+    Fiyat verisinden ayrı, uzun ömürlü disk önbelleğinden okunur; süresi dolmuşsa kaynaktan yenilenir.
+    """
+    cached = _fundamentals.load(ticker)
+    if cached is not None:
+        perf.note(cache="hit")
+        return cached
+    perf.note(cache="miss")
+    try:
+        result = get_source().fundamentals(ticker)
+        financials, balance, info = result
+    except Exception as e:
+        print(f"Temel veriler alınamadı ({ticker}): {e}")
+        # Kaynak erişilemezse süresi dolmuş kayıt da iş görür
+        stale = _fundamentals.load(ticker, max_age=-1)
+        return stale if stale is not None else (None, None, {})
+    if info or (balance is not None and not balance.empty):
+        # Boş yanıtlar (kısıtlama vb.) uzun süre önbellekte kalmasın
+        try:
+            _fundamentals.save(ticker, result)
+        except Exception as e:
+            # Önbelleğe yazılamaması yeni çekilen veriyi geçersiz kılmaz
+            print(f"Temel veriler önbelleğe yazılamadı ({ticker}): {e}")
+    return result
+
+def fetch_fundamentals_async(ticker):
+    """Temel verileri arka planda yükler; grafik beklemeden çizilebilsin diye Future döndürür."""
+    return _fundamentals_executor.submit(perf.bind(fetch_fundamentals), ticker)
 
-def process_indicators(df):
+def process_indicators(df, names=None):
     """
     DataFrame'e teknik analiz indikatörlerini ekler.
+    Tüm indikatörler bitişik float64 diziler üzerinde tek bir bloğa yazılır,
+    DataFrame en sonda bir kez oluşturulur.
+    names: yalnızca hesaplanacak indikatörler (kernel.REGISTRY adları, bağımlılıklar otomatik eklenir).
     """
     if df is None or df.empty:
         return df
         
     try:
-        # 1. Hareketli Ortalamalar
-        df['EMA20'] = ta.ema(df['Close'], length=20)
-        df['EMA50'] = ta.ema(df['Close'], length=50)
-        df['EMA200'] = ta.ema(df['Close'], length=200)
-        
-        # 2. Momentum (RSI & Stoch RSI)
-        df['RSI'] = ta.rsi(df['Close'], length=14)
-        stoch = ta.stochrsi(df['Close'], length=14, rsi_length=14, k=3, d=3)
-        if stoch is not None:
-            df = pd.concat([df, stoch], axis=1)
-        
-        # 3. MACD
-        k = df['Close'].ewm(span=12, adjust=False, min_periods=12).mean()
-        d = df['Close'].ewm(span=26, adjust=False, min_periods=26).mean()
-        df['MACD'] = k - d
-        df['MACD_Signal'] = df['MACD'].ewm(span=9, adjust=False, min_periods=9).mean()
-        df['MACD_Hist'] = df['MACD'] - df['MACD_Signal']
-        
-        # 4. Bollinger Bantları
-        bb = ta.bbands(df['Close'], length=20, std=2)
-        if bb is not None:
-            df = pd.concat([df, bb], axis=1)
-            # Sütun isimlerini standartlaştır
-            df.rename(columns=lambda x: x.replace('BBL_20_2.0', 'BB_Lower').replace('BBU_20_2.0', 'BB_Upper').replace('BBM_20_2.0', 'BB_Mid'), inplace=True)
-
-        # 5. ATR ve Trailing Stop
-        df['ATR'] = ta.atr(df['High'], df['Low'], df['Close'], length=14)
-        df['Trailing_Stop'] = df['Close'] - (df['ATR'] * 2)
-        
-        # 6. Parabolic SAR
-        psar = ta.psar(df['High'], df['Low'], df['Close'])
-        if psar is not None:
-             df = pd.concat([df, psar], axis=1)
-
-        # 7. SuperTrend
-        supertrend = ta.supertrend(df['High'], df['Low'], df['Close'], length=7, multiplier=3.0)
-        if supertrend is not None:
-            df = pd.concat([df, supertrend], axis=1)
-            
-        # 8. Hacim EMA
-        df['Vol_EMA'] = ta.ema(df['Volume'], length=20)
-        
-        # 9. Swing Points (Tepe/Dip)
-        n = 8
-        df['min'] = df.iloc[argrelextrema(df.Close.values, np.less_equal, order=n)[0]]['Close']
-        df['max'] = df.iloc[argrelextrema(df.Close.values, np.greater_equal, order=n)[0]]['Close']
-        
-        return df
+        return kernel.indicator_frame(df, names=names)
     except Exception as e:
-        st.error(f"İndikatör hesaplama hatası: {e}")
+        _error(f"İndikatör hesaplama hatası: {e}")
         return df
 
+# Hisse başına süreç genelinde tutulan indikatör motorları (en son kullanılan MAX_ENGINES tanesi)
+_engines = OrderedDict()
+_engines_lock = threading.Lock()
+MAX_ENGINES = 32
+
+@perf.timed("indicators")
+def process_indicators_incremental(key, df, names=None, timeframe=None, asof=None):
+    """
+    process_indicators ile aynı sütunları üretir, ancak aynı hisse için tutulan
+    motor sayesinde yalnızca yeni (veya güncellenen son) barları ve
+    ilk kez istenen indikatörleri hesaplar.
+    timeframe: df haftalık/aylık barlarsa birleştirme kuralı (her zaman dilimi ayrı motor kullanır).
+    asof: o durumda barların türetildiği günlük son bar zamanı (bkz. cache_key).
+    """
+    if df is None or df.empty:
+        return df
+    config = tuple(sorted(names or ()))
+    cache_id = cache_key(key, df, (timeframe,) + config if timeframe else config, asof)
+    engine_key = key if timeframe is None else (key, timeframe)
+    cached = _cache.get("indicators", cache_id)
+    perf.note(cache="hit" if cached is not None else "miss")
+    if cached is not None:
+        return cached
+    with _engines_lock:
+        engine = _engines.get(engine_key)
+        if engine is None:
+            # Çıktılar önbellekte tutulduğu için motor yalnızca durumunu saklar
+            engine = _engines[engine_key] = IndicatorEngine(keep_frame=False)
+        _engines.move_to_end(engine_key)
+        while len(_engines) > MAX_ENGINES:
+            _engines.popitem(last=False)
+    try:
+        with engine.lock:
+            result = engine.update(df, names)
+    except Exception as e:
+        _error(f"İndikatör hesaplama hatası: {e}")
+        with engine.lock:
+            engine.reset()
+        return process_indicators(df, names)
+    result = compact(result)
+    _cache.put("indicators", cache_id, result)
+    return result
+
+def prewarm(symbols, names=None):
+    """
+    Sembollerin fiyat geçmişini, indikatörlerini (names: sayfanın istediği indikatörler, önbellek
+    anahtarı aynı olsun diye) ve temel verilerini sırayla önbelleğe yükler.
+    """
+    for symbol in symbols:
+        with perf.span("prewarm", symbol=symbol):
+            try:
+                df, ticker = fetch_stock_data(process_symbol(symbol), period="max", quiet=True)
+                if df is None:
+                    continue
+                process_indicators_incremental(ticker, df, names)
+                fetch_fundamentals(ticker)
+            except Exception as e:
+                _stderr(f"Ön yükleme başarısız ({symbol}): {e}")
+
+_prewarm_thread = None
+_prewarm_lock = threading.Lock()
+
+def start_prewarm(names=None, symbols=None):
+    """prewarm'ı (varsayılan: PREWARM listesi) süreç başına bir kez arka plan iş parçacığında başlatır."""
+    global _prewarm_thread
+    symbols = PREWARM if symbols is None else symbols
+    with _prewarm_lock:
+        if _prewarm_thread is None and symbols:
+            _prewarm_thread = threading.Thread(target=prewarm, args=(list(symbols), names),
+                                               name="protrade-prewarm", daemon=True)
+            _prewarm_thread.start()
+        return _prewarm_thread
+
+# Sembol listesi ve pencere başına artımlı korelasyon durumu (en son kullanılan MAX_CORRELATIONS tanesi)
+_correlations = OrderedDict()
+_correlations_lock = threading.Lock()
+MAX_CORRELATIONS = 8
+
+def correlation_stats(symbols, window=correlation.WINDOW):
+    """
+    Gösterge endeksi ve symbols için günlük kapanış panelini fetch_stock_data çıktılarından kurar
+    ve kayan beta/korelasyon durumunu (correlation.RollingCorrelation) yalnızca yeni barlarla uzatır.
+    Dönüş: RollingCorrelation.snapshot() sözlüğü (ilk sütun endeks) ya da endeks verisi yoksa None.
+    """
+    wanted = list(dict.fromkeys([correlation.BENCHMARK] + list(symbols)))
+    with perf.span("correlation", symbols=len(wanted)):
+        fetch = perf.bind(fetch_stock_data)
+        with ThreadPoolExecutor(max_workers=scanner.DEFAULT_WORKERS) as pool:
+            results = list(pool.map(lambda s: fetch(s, quiet=True), wanted))
+        frames = {s: df for s, (df, _) in zip(wanted, results) if df is not None}
+        if correlation.BENCHMARK not in frames:
+            return None
+        panel = scanner.build_panel(frames)
+        key = (tuple(frames), window)
+        with _correlations_lock:
+            stats = _correlations.get(key)
+            if stats is None:
+                stats = _correlations[key] = correlation.RollingCorrelation(window)
+            _correlations.move_to_end(key)
+            while len(_correlations) > MAX_CORRELATIONS:
+                _correlations.popitem(last=False)
+            return stats.update(panel).snapshot()
+
 def process_symbol(input_symbol):
     """
     Kullanıcı girdisini temizler. (Artık zorla .IS eklemiyor, bunu fetch_stock_data hallediyor)
@@ -116,12 +391,70 @@ def process_symbol(input_symbol):
 def slice_data_by_period(df, period_str):
     """
     Veriyi seçilen periyoda göre filtreler.
+    Tarih indeksi sıralı olduğundan başlangıç ikili aramayla bulunur; sonuç kopya değil görünümdür.
     """
     days_map = {"3mo": 90, "6mo": 180, "1y": 365, "2y": 730, "5y": 1825}
     if period_str not in days_map: return df
     if df.empty: return df
     start_date = df.index[-1] - timedelta(days=days_map[period_str])
-    return df[df.index >= start_date]
+    return df.iloc[df.index.searchsorted(start_date):]
+
+def timeframe_bars(ticker, df, rule):
+    """
+    Günlük OHLCV tablosundan haftalık/aylık barlar (rule: downsample kuralı, None ise df aynen döner).
+    Her zaman dilimi "bars" katmanında sembol başına bir kez tutulur; yeni günlük barlar geldiğinde
+    (ya da son günlük bar güncellendiğinde) yalnızca son dönemden itibaren yeniden birleştirilir.
+    Son bardan önceki günlük barlar düzeltilirse fetch_stock_data bu kayıtları sildiği için baştan kurulur.
+    """
+    if rule is None or df is None or df.empty:
+        return df
+    key = (ticker, None, ("timeframe", rule))
+    with perf.span("resample", rule=rule) as rec:
+        cached = _cache.get("bars", key)
+        last = df.index[-1]
+        daily = df[kernel.OHLCV]
+        last_row = daily.iloc[-1]
+        if cached is not None and cached[0] == last and cached[1].equals(last_row):
+            rec["cache"] = "hit"
+            return cached[2]
+        rec["cache"] = "miss"
+        bars = None
+        if cached is not None and cached[0] <= last:
+            # Son dönemin ilk günlük barından (etiketinden) itibaren yeniden birleştir, öncesi aynen kalır
+            previous = cached[2]
+            start = df.index.searchsorted(previous.index[-1])
+            tail = downsample.resample_ohlcv(daily.iloc[start:], rule)
+            bars = pd.concat([previous.iloc[:-1], tail])
+        if bars is None:
+            bars = downsample.resample_ohlcv(daily, rule)
+        _cache.put("bars", key, (last, last_row, bars))
+        return bars
+
+def derived(ticker, df, config, compute, stage="derived", asof=None):
+    """
+    Fiyat verisinden türetilen sonuçları (periyot dilimi, grafik vb.) türetilmiş katmanda
+    (sembol, son bar, ayar) anahtarıyla saklar; yoksa compute() ile üretir.
+    stage: ölçümlerde (perf) görünen aşama adı.
+    asof: df haftalık/aylık barlarsa türetildiği günlük son bar zamanı (bkz. cache_key).
+    """
+    with perf.span(stage) as rec:
+        if df is None or df.empty:
+            return compute()
+        key = cache_key(ticker, df, config, asof)
+        value = _cache.get("derived", key)
+        rec["cache"] = "hit" if value is not None else "miss"
+        if value is None:
+            value = compute()
+            if value is not None:
+                _cache.put("derived", key, value)
+        return value
+
+def period_view(ticker, df, period, config=(), timeframe=None, asof=None):
+    """slice_data_by_period sonucunu türetilmiş katmanda (sembol, son bar, periyot+zaman dilimi+ayar) anahtarıyla saklar."""
+    if df is None or df.empty:
+        return df
+    return derived(ticker, df, (period, timeframe, tuple(sorted(config))), lambda: slice_data_by_period(df, period),
+                   "slice", asof)
 
 def get_market_status(current_price, previous_close):
     change = current_price - previous_close
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+# Grafik genişliği (piksel) kadar bar yeterli: fazlası tarayıcıda aynı piksele düşer
+PIXEL_BUDGET = 1000
+# Bu sayıdan fazla nokta içeren seriler WebGL (Scattergl) ile çizilir
+GL_THRESHOLD = 1000
+
+# Birleştirme kuralları: pandas periyot kodu ve ortalama bar sayısı
+RULES = (("W", 5), ("M", 21))
+
+
+def choose_rule(n, budget=PIXEL_BUDGET):
+    """n bar bütçeyi aşıyorsa mumların birleştirileceği periyodu (W/M) döndürür, aşmıyorsa None."""
+    if budget is None or n <= budget:
+        return None
+    for rule, bars in RULES:
+        if n / bars <= budget:
+            return rule
+    return RULES[-1][0]
+
+
+def resample_ohlcv(df, rule):
+    """
+    Günlük barları haftalık/aylık mumlara birleştirir.
+    Open ilk, High en yüksek, Low en düşük, Close son değer, Volume toplam;
+    diğer sütunlar (indikatörler) dönemin son değerini alır. Tarih, dönemin ilk barıdır: açık
+    dönem yeni günlerle uzadıkça etiketi değişmez (artımlı motor son barı revizyon olarak işler).
+    """
+    if df.empty or rule is None:
+        return df
+    index = df.index
+    if getattr(index, "tz", None) is not None:
+        index = index.tz_localize(None)
+    periods = index.to_period(rule).asi8
+    starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+    ends = np.r_[starts[1:], len(df)] - 1
+
+    out = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if col == "Open":
+            out[col] = values[starts]
+        elif col == "High":
+            out[col] = np.fmax.reduceat(values.astype(float), starts)
+        elif col == "Low":
+            out[col] = np.fmin.reduceat(values.astype(float), starts)
+        elif col == "Volume":
+            out[col] = np.add.reduceat(np.nan_to_num(values.astype(float)), starts)
+        else:
+            out[col] = values[ends]
+    return pd.DataFrame(out, index=df.index[starts])
+
+
+def lttb(y, threshold, x=None):
+    """
+    Largest-Triangle-Three-Buckets: seriyi görsel şeklini koruyarak threshold noktaya indirir.
+    Seçilen noktaların konumlarını döndürür (ilk ve son nokta her zaman korunur).
+    """
+    n = len(y)
+    if threshold is None or threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Kova sınırları (tam sayı aritmetiği: son sınır her zaman n-1)
+    bounds = (np.arange(threshold - 1) * (n - 2)) // (threshold - 2) + 1
+    next_ends = np.r_[bounds[2:], n]
+    # Her kovanın bir sonraki kovasının ortalaması tek seferde hesaplanır
+    sizes = next_ends - bounds[1:]
+    avg_x = np.add.reduceat(x, bounds[1:]) / sizes
+    avg_y = np.add.reduceat(y, bounds[1:]) / sizes
+
+    xs, ys = x.tolist(), y.tolist()
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        ax, ay = xs[a], ys[a]
+        bx, by = avg_x[i] - ax, avg_y[i] - ay
+        best, best_area = bounds[i], -1.0
+        for j in range(bounds[i], bounds[i + 1]):
+            area = abs(bx * (ys[j] - ay) - by * (xs[j] - ax))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return np.asarray(selected)
+
+
+def line_points(index, values, budget=PIXEL_BUDGET):
+    """
+    Çizgi katmanı için (x, y) döndürür: NaN'lar atılır, nokta sayısı bütçeyi aşıyorsa LTTB uygulanır.
+    Hesaplama tam çözünürlükte yapılmış seriyi yalnızca gösterim için seyreltir.
+    """
+    values = np.asarray(values, dtype=float)
+    valid = np.flatnonzero(~np.isnan(values))
+    if budget is not None and len(valid) > budget:
+        valid = valid[lttb(values[valid], budget, valid)]
+    return index[valid], values[valid]
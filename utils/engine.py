@@ -0,0 +1,660 @@
+import copy
+import hashlib
+import math
+import threading
+from collections import deque
+import numpy as np
+
+from utils import kernel
+from utils.kernel import NaN, EPS, SWING_ORDER
+
+# Tüm geçmiş bu eşikten uzunsa ilk hesaplama vektörel çekirdekle yapılır
+WARMUP_BATCH = 64
+
+
+def _isnan(x):
+    return x != x
+
+
+class _Ema:
+    """pandas_ta.ema: ilk değer SMA ile başlatılır, sonra ewm(span, adjust=False)."""
+    def __init__(self, length):
+        self.length = length
+        self.alpha = 2.0 / (length + 1)
+        self.count = 0
+        self.total = 0.0
+        self.value = NaN
+
+    def step(self, x):
+        self.count += 1
+        if self.count < self.length:
+            self.total += x
+            return NaN
+        if self.count == self.length:
+            self.value = (self.total + x) / self.length
+        else:
+            self.value = self.alpha * x + (1 - self.alpha) * self.value
+        return self.value
+
+
+class _Ewm:
+    """Series.ewm(span, adjust=False, min_periods=span).mean(); baştaki NaN'lar atlanır."""
+    def __init__(self, span):
+        self.alpha = 2.0 / (span + 1)
+        self.min_periods = span
+        self.count = 0
+        self.value = NaN
+
+    def step(self, x):
+        if self.count == 0:
+            if _isnan(x):
+                return NaN
+            self.value = x
+        else:
+            self.value = (1 - self.alpha) * self.value + self.alpha * x
+        self.count += 1
+        return self.value if self.count >= self.min_periods else NaN
+
+
+class _Wilder:
+    """Wilder (RMA) ortalaması: ewm(alpha=1/length, min_periods=length), adjust=True."""
+    def __init__(self, length):
+        self.length = length
+        self.decay = 1 - 1.0 / length
+        self.count = 0
+        self.num = 0.0
+        self.den = 0.0
+
+    def step(self, x):
+        if self.count == 0 and _isnan(x):
+            return NaN
+        self.num = x + self.decay * self.num
+        self.den = 1 + self.decay * self.den
+        self.count += 1
+        return self.num / self.den if self.count >= self.length else NaN
+
+
+class _Window:
+    """Sabit uzunluklu kayan pencere; pencere dolu değilse veya NaN içeriyorsa NaN döner."""
+    def __init__(self, length):
+        self.length = length
+        self.values = deque(maxlen=length)
+        self.nans = 0
+
+    def push(self, x):
+        if len(self.values) == self.length and _isnan(self.values[0]):
+            self.nans -= 1
+        if _isnan(x):
+            self.nans += 1
+        self.values.append(x)
+
+    def ready(self):
+        return len(self.values) == self.length and self.nans == 0
+
+    def mean(self):
+        return sum(self.values) / self.length if self.ready() else NaN
+
+    def min(self):
+        return min(self.values) if self.ready() else NaN
+
+    def max(self):
+        return max(self.values) if self.ready() else NaN
+
+    def std(self):
+        if not self.ready():
+            return NaN
+        m = sum(self.values) / self.length
+        return math.sqrt(sum((v - m) ** 2 for v in self.values) / self.length)
+
+
+class _Rsi:
+    def __init__(self, length):
+        self.pos = _Wilder(length)
+        self.neg = _Wilder(length)
+        self.prev = NaN
+
+    def step(self, close):
+        diff = close - self.prev
+        self.prev = close
+        if _isnan(diff):
+            return NaN
+        p = self.pos.step(diff if diff > 0 else 0.0)
+        n = self.neg.step(diff if diff < 0 else 0.0)
+        if _isnan(p) or _isnan(n) or p - n == 0:
+            return NaN
+        return 100 * p / (p - n)
+
+    def restore(self, raw):
+        self.pos.__dict__.update(raw['pos'])
+        self.neg.__dict__.update(raw['neg'])
+        self.prev = raw['prev']
+
+
+class _Atr:
+    """pandas_ta 0.3.14b ATR: ilk barın True Range değeri NaN, ardından Wilder ortalaması."""
+    def __init__(self, length):
+        self.avg = _Wilder(length)
+        self.prev_close = NaN
+
+    def step(self, high, low, close):
+        pc = self.prev_close
+        self.prev_close = close
+        if _isnan(pc):
+            return NaN
+        hl = high - low
+        tr = max(abs(hl if hl != 0 else EPS), abs(high - pc), abs(pc - low))
+        return self.avg.step(tr)
+
+    def restore(self, raw):
+        self.avg.__dict__.update(raw['avg'])
+        self.prev_close = raw['prev_close']
+class _Psar:
+    """
+    Parabolic SAR (af0=0.02, max_af=0.2). Durum: yön, SAR, uç nokta (EP) ve hızlanma katsayısı.
+    İkinci barda yalnızca ilk bar referans alınır (pandas_ta'daki iloc[-1] ileriye bakma hatası yok).
+    """
+    def __init__(self, af0=0.02, max_af=0.2):
+        self.af0 = af0
+        self.max_af = max_af
+        self.af = af0
+        self.n = 0
+        self.falling = False
+        self.sar = NaN
+        self.ep = NaN
+        self.highs = deque(maxlen=2)
+        self.lows = deque(maxlen=2)
+        self.first_close = NaN
+
+    def step(self, high, low, close):
+        self.n += 1
+        if self.n == 1:
+            self.highs.append(high)
+            self.lows.append(low)
+            self.first_close = close
+            return NaN, NaN, self.af0, 0
+
+        if self.n == 2:
+            up = high - self.highs[-1]
+            dn = self.lows[-1] - low
+            self.falling = dn > up and dn > 0
+            self.ep = self.lows[-1] if self.falling else self.highs[-1]
+            self.sar = self.first_close
+
+        sar = self.sar + self.af * (self.ep - self.sar)
+        if self.falling:
+            reverse = high > sar
+            if low < self.ep:
+                self.ep = low
+                self.af = min(self.af + self.af0, self.max_af)
+            sar = max(max(self.highs), sar)
+        else:
+            reverse = low < sar
+            if high > self.ep:
+                self.ep = high
+                self.af = min(self.af + self.af0, self.max_af)
+            sar = min(min(self.lows), sar)
+
+        if reverse:
+            sar = self.ep
+            self.af = self.af0
+            self.falling = not self.falling
+            self.ep = low if self.falling else high
+
+        self.sar = sar
+        self.highs.append(high)
+        self.lows.append(low)
+        if self.falling:
+            return NaN, sar, self.af, int(reverse)
+        return sar, NaN, self.af, int(reverse)
+
+    def restore(self, raw):
+        raw = dict(raw)
+        self.highs.extend(raw.pop('highs'))
+        self.lows.extend(raw.pop('lows'))
+        self.__dict__.update(raw)
+
+
+class _SuperTrend:
+    """SuperTrend(length, multiplier): bant taşıma kuralları ve yön durumu."""
+    def __init__(self, length=7, multiplier=3.0):
+        self.atr = _Atr(length)
+        self.multiplier = multiplier
+        self.n = 0
+        self.direction = 1
+        self.upper = NaN
+        self.lower = NaN
+
+    def step(self, high, low, close):
+        self.n += 1
+        atr = self.atr.step(high, low, close)
+        hl2 = (high + low) / 2
+        upper = hl2 + self.multiplier * atr
+        lower = hl2 - self.multiplier * atr
+        if self.n == 1:
+            self.upper, self.lower = upper, lower
+            return 0.0, 1, NaN, NaN
+
+        if close > self.upper:
+            self.direction = 1
+        elif close < self.lower:
+            self.direction = -1
+        else:
+            if self.direction > 0 and lower < self.lower:
+                lower = self.lower
+            if self.direction < 0 and upper > self.upper:
+                upper = self.upper
+        self.upper, self.lower = upper, lower
+
+        if self.direction > 0:
+            return lower, 1, lower, NaN
+        return upper, -1, NaN, upper
+
+    def restore(self, raw):
+        raw = dict(raw)
+        self.atr.restore(raw.pop('atr'))
+        self.__dict__.update(raw)
+
+
+# --- Kayıt defterindeki her indikatör için adım (bar bar ilerleme) karşılıkları ---
+# step(bar, ctx): bar = (o, h, l, c, v); ctx = bu barda daha önce hesaplanan sütun değerleri
+
+class _EmaStep:
+    KEYS = ('ema20', 'ema50', 'ema200')
+
+    def __init__(self):
+        self.items = [_Ema(20), _Ema(50), _Ema(200)]
+
+    def step(self, bar, ctx):
+        return [e.step(bar[3]) for e in self.items]
+
+    def restore(self, raw):
+        for e, key in zip(self.items, self.KEYS):
+            e.__dict__.update(raw[key])
+
+
+class _RsiStep:
+    def __init__(self):
+        self.rsi = _Rsi(14)
+
+    def step(self, bar, ctx):
+        return [self.rsi.step(bar[3])]
+
+    def restore(self, raw):
+        self.rsi.restore(raw['rsi'])
+
+
+class _StochRsiStep:
+    def __init__(self):
+        self.windows = {'rsi_win': _Window(14), 'stoch_k': _Window(3), 'stoch_d': _Window(3)}
+
+    def step(self, bar, ctx):
+        w = self.windows
+        rsi = ctx['RSI']
+        w['rsi_win'].push(rsi)
+        low_rsi, high_rsi = w['rsi_win'].min(), w['rsi_win'].max()
+        rng = high_rsi - low_rsi
+        w['stoch_k'].push(100 * (rsi - low_rsi) / (rng if rng != 0 else EPS))
+        k = w['stoch_k'].mean()
+        w['stoch_d'].push(k)
+        return [k, w['stoch_d'].mean()]
+
+    def restore(self, raw):
+        for key, values in raw['windows'].items():
+            for v in values:
+                self.windows[key].push(float(v))
+
+
+class _MacdStep:
+    KEYS = ('macd_fast', 'macd_slow', 'macd_signal')
+
+    def __init__(self):
+        self.items = [_Ewm(12), _Ewm(26), _Ewm(9)]
+
+    def step(self, bar, ctx):
+        fast, slow, signal = self.items
+        macd = fast.step(bar[3]) - slow.step(bar[3])
+        sig = signal.step(macd)
+        return [macd, sig, macd - sig]
+
+    def restore(self, raw):
+        for e, key in zip(self.items, self.KEYS):
+            e.__dict__.update(raw[key])
+
+
+class _BbandsStep:
+    def __init__(self):
+        self.window = _Window(20)
+
+    def step(self, bar, ctx):
+        c = bar[3]
+        self.window.push(c)
+        mid = self.window.mean()
+        dev = 2 * self.window.std()
+        lower, upper = mid - dev, mid + dev
+        width = upper - lower
+        if width == 0:
+            width = EPS
+        return [lower, mid, upper, 100 * width / mid, (c - lower) / width]
+
+    def restore(self, raw):
+        for v in raw['windows']['bb']:
+            self.window.push(float(v))
+
+
+class _AtrStep:
+    def __init__(self):
+        self.atr = _Atr(14)
+
+    def step(self, bar, ctx):
+        return [self.atr.step(bar[1], bar[2], bar[3])]
+
+    def restore(self, raw):
+        self.atr.restore(raw['atr'])
+
+
+class _TrailingStopStep:
+    def step(self, bar, ctx):
+        return [bar[3] - ctx['ATR'] * 2]
+
+    def restore(self, raw):
+        pass
+
+
+class _PsarStep:
+    def __init__(self):
+        self.psar = _Psar(0.02, 0.2)
+
+    def step(self, bar, ctx):
+        return self.psar.step(bar[1], bar[2], bar[3])
+
+    def restore(self, raw):
+        self.psar.restore(raw['psar'])
+
+
+class _SuperTrendStep:
+    def __init__(self):
+        self.trend = _SuperTrend(7, 3.0)
+
+    def step(self, bar, ctx):
+        return self.trend.step(bar[1], bar[2], bar[3])
+
+    def restore(self, raw):
+        self.trend.restore(raw['supertrend'])
+
+
+class _VolEmaStep:
+    def __init__(self):
+        self.ema = _Ema(20)
+
+    def step(self, bar, ctx):
+        return [self.ema.step(bar[4])]
+
+    def restore(self, raw):
+        self.ema.__dict__.update(raw['vol_ema'])
+
+
+STEPS = {
+    'EMA': _EmaStep, 'RSI': _RsiStep, 'STOCHRSI': _StochRsiStep, 'MACD': _MacdStep,
+    'BBANDS': _BbandsStep, 'ATR': _AtrStep, 'TRAILING_STOP': _TrailingStopStep,
+    'PSAR': _PsarStep, 'SUPERTREND': _SuperTrendStep, 'VOL_EMA': _VolEmaStep,
+}
+SWINGS = 'SWINGS'
+
+
+class _Swings:
+    """
+    Tek geçişli tepe/dip dedektörü (kernel.swing_points ile aynı sonuç).
+    Monoton kuyruklar son 2*order+1 barın en düşük/en yüksek değerini taşır; i. bar eklenince
+    i - order merkezli pencere tamamlanır ve o barın durumu kesinleşir. Daha yeni order bar
+    sağdan kırpılmış pencereyle geçici olarak değerlendirilir (pending).
+    start: ilk eklenecek barın sıra numarası (geçmiş vektörel hesaplandıysa yalnızca kuyruk beslenir).
+    """
+    def __init__(self, order=SWING_ORDER, start=0):
+        self.order = order
+        self.n = start
+        self.window = deque(maxlen=2 * order + 1)  # son barların (low, high) değerleri
+        self.lows = deque()   # (sıra, değer), değerler artan
+        self.highs = deque()  # (sıra, değer), değerler azalan
+        self.nan_low = self.nan_high = -math.inf  # son NaN barın sırası
+
+    def push(self, low, high=None):
+        """Bar ekler; kesinleşen merkez bar için (sıra, dip, tepe) döndürür (o bar nokta değilse dip/tepe NaN)."""
+        high = low if high is None else high
+        i = self.n
+        self.n += 1
+        self.window.append((low, high))
+        if _isnan(low):
+            self.nan_low = i
+        else:
+            while self.lows and self.lows[-1][1] > low:
+                self.lows.pop()
+            self.lows.append((i, low))
+        if _isnan(high):
+            self.nan_high = i
+        else:
+            while self.highs and self.highs[-1][1] < high:
+                self.highs.pop()
+            self.highs.append((i, high))
+
+        center = i - self.order
+        edge = center - self.order
+        while self.lows and self.lows[0][0] < edge:
+            self.lows.popleft()
+        while self.highs and self.highs[0][0] < edge:
+            self.highs.popleft()
+        if center < 0 or len(self.window) <= self.order:
+            return None
+        low_c, high_c = self.window[-self.order - 1]
+        is_min = self.nan_low < edge and low_c <= self.lows[0][1]
+        is_max = self.nan_high < edge and high_c >= self.highs[0][1]
+        return center, low_c if is_min else NaN, high_c if is_max else NaN
+
+    def pending(self):
+        """Henüz kesinleşmemiş son order bar için (sıra, dip, tepe) listesi."""
+        bars = list(self.window)
+        first = self.n - len(bars)
+        out = []
+        for center in range(max(first, self.n - self.order), self.n):
+            lows, highs = zip(*bars[max(0, center - self.order - first):])
+            low_c, high_c = bars[center - first]
+            is_min = not any(map(_isnan, lows)) and low_c <= min(lows)
+            is_max = not any(map(_isnan, highs)) and high_c >= max(highs)
+            out.append((center, low_c if is_min else NaN, high_c if is_max else NaN))
+        return out
+
+
+def _digest(rows):
+    """Bar bloğunun özeti; son bardan önceki geçmişin değişip değişmediğini anlamak için."""
+    return hashlib.blake2b(np.ascontiguousarray(rows).tobytes(), digest_size=16).digest()
+
+
+class IndicatorEngine:
+    """
+    process_indicators ile aynı sütunları üreten durumlu indikatör motoru.
+    Yalnızca istenen indikatörleri (ve bağımlılıklarını) tutar; yeni bir indikatör istendiğinde
+    onu tüm geçmiş için vektörel çekirdekle hesaplayıp durumunu devralır.
+    Sonraki çağrılarda yalnızca yeni barları ilerletir; son bar güncellenmişse
+    (seans içi yarım bar) bir önceki durumdan yeniden hesaplar.
+    keep_frame=False ise son çıktı tablosu motorda tutulmaz (sonuçları zaten önbellekte
+    saklayan çağıranlar için; bellekte aynı tablonun ikinci kopyası olmaz).
+    swing_orders: SWINGS için tepe/dip dereceleri (kısa ve uzun vadeli salınımlar); SWING_ORDER her zaman
+    dahildir ('min'/'max'), diğerleri 'min_<order>'/'max_<order>' sütunlarına yazılır (kernel.swing_columns).
+    swing_high_low=True: tepeler High, dipler Low serisinden bulunur (varsayılan: Close).
+    """
+    def __init__(self, keep_frame=True, swing_orders=(SWING_ORDER,), swing_high_low=False):
+        self.lock = threading.Lock()
+        self.keep_frame = keep_frame
+        self.swing_orders = tuple(dict.fromkeys((SWING_ORDER,) + tuple(swing_orders)))
+        self.swing_high_low = swing_high_low
+        self.reset()
+
+    def reset(self):
+        self.n = 0
+        self.index = None
+        self.last_row = None
+        self.digest = None
+        self.frame = None
+        self.names = []
+        self.groups = {}
+        self.buffers = {}
+        self.capacity = 0
+        self.checkpoint = {}
+
+    def _reserve(self, total):
+        if total <= self.capacity:
+            return
+        capacity = max(total, 2 * self.capacity)
+        for col, buf in self.buffers.items():
+            grown = np.empty(capacity)
+            grown[:self.n] = buf[:self.n]
+            self.buffers[col] = grown
+        self.capacity = capacity
+
+    def _step_rows(self, names, ohlcv, start, end):
+        """names gruplarını [start, end) barları üzerinde ilerletir."""
+        groups = [(name, self.groups[name], kernel.REGISTRY[name].columns) for name in names]
+        deps = {d for name in names for d in kernel.REGISTRY[name].deps if d not in names}
+        other = kernel.columns_for(deps)
+        for i in range(start, end):
+            if i == end - 1:
+                # Son bar değişebilir; ondan önceki durumu sakla
+                for name, group, _ in groups:
+                    self.checkpoint[name] = copy.deepcopy(group)
+            bar = tuple(ohlcv[i])
+            ctx = {c: self.buffers[c][i] for c in other}
+            for name, group, columns in groups:
+                for col, value in zip(columns, group.step(bar, ctx)):
+                    ctx[col] = value
+                    self.buffers[col][i] = value
+
+    def _columns(self, names):
+        """names indikatörlerinin çıktı sütunları (ek tepe/dip dereceleri dahil)."""
+        columns = kernel.columns_for(names)
+        if SWINGS in names:
+            columns += [c for order in self.swing_orders[1:] for c in kernel.swing_columns(order)]
+        return columns
+
+    def _add(self, names, ohlcv):
+        """Yeni indikatörleri mevcut tüm geçmiş için hesaplar ve adım durumlarını hazırlar."""
+        n = len(ohlcv)
+        stepped = [name for name in names if name != SWINGS]
+        for col in self._columns(names):
+            self.buffers[col] = np.empty(self.capacity)
+        for name in stepped:
+            self.groups[name] = STEPS[name]()
+
+        if stepped and n - 1 > WARMUP_BATCH:
+            # Son bar hariç her şeyi vektörel çekirdekle hesapla, durumu devral
+            raw = {}
+            values = {c: self.buffers[c][:n - 1] for c in kernel.columns_for(self.names)}
+            block, columns = kernel.compute(ohlcv[:-1], stepped, state=raw, values=values)
+            for j, col in enumerate(columns):
+                self.buffers[col][:n - 1] = block[:, j]
+            for name in stepped:
+                self.groups[name].restore(raw.get(name, {}))
+            self._step_rows(stepped, ohlcv, n - 1, n)
+        elif stepped:
+            self._step_rows(stepped, ohlcv, 0, n)
+
+        if SWINGS in names:
+            # Geçmiş vektörel hesaplanır; dedektörler yalnızca son barların penceresiyle beslenir
+            levels = kernel.swing_levels(kernel.bars_dict(ohlcv), self.swing_orders, self.swing_high_low)
+            for order, (lows, highs) in levels.items():
+                low_col, high_col = kernel.swing_columns(order)
+                self.buffers[low_col][:n], self.buffers[high_col][:n] = lows, highs
+            self.groups[SWINGS] = {order: _Swings(order, start=max(0, n - 1 - 2 * order))
+                                   for order in self.swing_orders}
+
+        self.names = [name for name in kernel.REGISTRY if name in self.names or name in names]
+
+    def _update_swings(self, ohlcv, old_n):
+        """
+        Yeni barları her derecenin tepe/dip dedektörüne verir; yalnızca durumu değişebilecek
+        son `order` bar (ve yeni barlar) yeniden işaretlenir.
+        """
+        n = len(ohlcv)
+        low, high = (ohlcv[:, 2], ohlcv[:, 1]) if self.swing_high_low else (ohlcv[:, 3], ohlcv[:, 3])
+        saved = {}
+        for order, swings in self.groups[SWINGS].items():
+            first = max(0, old_n - order)
+            low_col, high_col = kernel.swing_columns(order)
+            lows, highs = self.buffers[low_col], self.buffers[high_col]
+            lows[first:n] = NaN
+            highs[first:n] = NaN
+            points = []
+            for i in range(swings.n, n):
+                if i == n - 1:
+                    saved[order] = copy.deepcopy(swings)
+                point = swings.push(low[i], high[i])
+                if point is not None and point[0] >= first:
+                    points.append(point)
+            for i, low_i, high_i in points + swings.pending():
+                lows[i] = low_i
+                highs[i] = high_i
+        if saved:
+            self.checkpoint[SWINGS] = saved
+
+    def update(self, df, names=None, output=True):
+        """
+        OHLCV DataFrame'ini istenen indikatör sütunlarıyla birlikte döndürür.
+        names: kernel.REGISTRY anahtarları (None ise tümü). Daha önce hesaplanmış
+        diğer indikatörlerin sütunları da çıktıda kalır.
+        output=False: yalnızca durum ilerletilir, tablo oluşturulmaz (None döner; değerler tail ile okunur).
+        """
+        if df is None or df.empty:
+            return df
+
+        wanted = kernel.resolve(names)
+        n = len(df)
+        ohlcv = kernel.ohlcv_array(df)
+
+        if self.index is not None and (
+            n < self.n or df.index[0] != self.index[0] or df.index[self.n - 1] != self.index[-1]
+            or _digest(ohlcv[:self.n - 1]) != self.digest
+        ):
+            # Geçmiş değişmiş (yeni sembol, temettü/bölünme düzeltmesi vb.): baştan hesapla
+            self.reset()
+
+        old_n = self.n
+        if self.n and not np.array_equal(ohlcv[self.n - 1], self.last_row, equal_nan=True):
+            # Son bar revize edilmiş: bir önceki bardaki duruma dön
+            self.groups.update(self.checkpoint)
+            self.n -= 1
+            old_n = self.n
+
+        missing = [name for name in wanted if name not in self.names]
+        if self.n == n and not missing and (self.frame is not None or not output):
+            return self.frame if output else None
+
+        self._reserve(n)
+        stepped = [name for name in self.names if name != SWINGS]
+        if self.n < n and stepped:
+            self._step_rows(stepped, ohlcv, self.n, n)
+        if SWINGS in self.names:
+            self._update_swings(ohlcv, old_n)
+        if missing:
+            self._add(missing, ohlcv)
+            if SWINGS in missing:
+                self._update_swings(ohlcv, n)
+        self.n = n
+        self.index = df.index
+        self.last_row = ohlcv[-1].copy()
+        self.digest = _digest(ohlcv[:-1])
+        if not output:
+            self.frame = None  # tutulan tablo artık eski
+            return None
+
+        columns = self._columns(self.names)
+        block = np.column_stack([self.buffers[c][:n] for c in columns])
+        frame = kernel.indicator_frame(df, block, columns)
+        if self.keep_frame:
+            self.frame = frame
+        return frame
+
+    def tail(self, columns, count=2):
+        """Son count barın istenen indikatör sütunları, (count x sütun) dizi olarak (eksik barlar NaN)."""
+        out = np.full((count, len(columns)), NaN)
+        rows = min(count, self.n)
+        for j, col in enumerate(columns):
+            out[count - rows:, j] = self.buffers[col][self.n - rows:self.n]
+        return out
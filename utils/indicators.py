@@ -1,20 +1,129 @@
 import numpy as np
+import pandas as pd
+
+# Fibonacci düzeltme oranları
+FIB_RATIOS = (0.236, 0.382, 0.5, 0.618, 0.786)
+# Kayan regresyon kanalının varsayılan pencere uzunluğu (bar)
+ROLLING_LOOKBACK = 100
+# Pivot seviyeleri (sütun sırası), yöntemleri ve dayanak dönemleri (pandas period kodu)
+PIVOT_LEVELS = ("P", "R1", "S1", "R2", "S2", "R3", "S3")
+PIVOT_METHODS = ("classic", "fibonacci", "camarilla")
+PIVOT_ANCHORS = ("D", "W", "M")
+
+
+def _fib_levels(max_price, min_price):
+    diff = max_price - min_price
+    return {ratio: max_price - diff * ratio for ratio in FIB_RATIOS}
+
+
+class RangeStats:
+    """
+    Tüm geçmiş üzerinde önceden hesaplanmış yapı: Close için y, xy, y² önek toplamları ve
+    High/Low için aralık en büyük/en küçük seyrek tabloları. Herhangi bir [start, end) penceresinin
+    regresyon eğimi, kesişimi, artık standart sapması ve Fibonacci aralığı O(1) ile bulunur.
+    Pencere içinde x = 0..n-1 alınır (calculate_regression_channel ile aynı).
+    """
+    def __init__(self, df):
+        close = df['Close'].to_numpy(dtype=float)
+        self.n = len(close)
+        # Sayısal kararlılık için ortalamadan farklar, uzun geçmişte küçük pencerelerin
+        # farkı kaybolmasın diye genişletilmiş duyarlıkla toplanır (eğim ve artıklar değişmez)
+        self.shift = close.mean() if self.n else 0.0
+        y = (close - self.shift).astype(np.longdouble)
+        i = np.arange(self.n, dtype=np.longdouble)
+        zero = np.zeros(1, dtype=np.longdouble)
+        self.sy = np.concatenate([zero, np.cumsum(y)])
+        self.siy = np.concatenate([zero, np.cumsum(i * y)])
+        self.syy = np.concatenate([zero, np.cumsum(y * y)])
+        self.high = df['High'].to_numpy(dtype=float)
+        self.low = df['Low'].to_numpy(dtype=float)
+        self._tables = None
+
+    def _window(self, start, end):
+        start = 0 if start is None else start
+        end = self.n if end is None else end
+        return start, end
+
+    def regression(self, start=None, end=None):
+        """Penceredeki (eğim, kesişim, artık std) değerleri; kesişim pencerenin ilk barındadır."""
+        start, end = self._window(start, end)
+        n = end - start
+        if n < 2:
+            return 0.0, (self.sy[end] - self.sy[start]) / max(n, 1) + self.shift, 0.0
+        sy = self.sy[end] - self.sy[start]
+        # Pencere içi x = i - start; sum(x*y) = sum(i*y) - start*sum(y)
+        sxy = self.siy[end] - self.siy[start] - start * sy
+        sx = n * (n - 1) / 2
+        var_x = n * (n * n - 1) / 12  # sum((x - ort)²)
+        cov = sxy - sx * sy / n
+        slope = cov / var_x
+        intercept = sy / n - slope * sx / n
+        ssr = (self.syy[end] - self.syy[start]) - sy * sy / n - slope * cov
+        return float(slope), float(intercept) + self.shift, float(np.sqrt(max(ssr, 0.0) / n))
+
+    def channel(self, start=None, end=None, width=2.0):
+        """Penceredeki regresyon hattı ve ±width std kanal dizileri."""
+        start, end = self._window(start, end)
+        slope, intercept, std = self.regression(start, end)
+        line = slope * np.arange(end - start) + intercept
+        return line, line + width * std, line - width * std
+
+    def _build_tables(self):
+        # tables[k][i] = [i, i + 2^k) aralığının en büyük High / en küçük Low değeri
+        highs, lows = [self.high], [self.low]
+        step = 1
+        while 2 * step <= self.n:
+            highs.append(np.fmax(highs[-1][:-step], highs[-1][step:]))
+            lows.append(np.fmin(lows[-1][:-step], lows[-1][step:]))
+            step *= 2
+        self._tables = highs, lows
+
+    def price_range(self, start=None, end=None):
+        """Penceredeki (en yüksek High, en düşük Low); iki örtüşen 2^k aralığın birleşimi."""
+        start, end = self._window(start, end)
+        if self._tables is None:
+            self._build_tables()
+        highs, lows = self._tables
+        k = (end - start).bit_length() - 1
+        last = end - (1 << k)
+        return max(highs[k][start], highs[k][last]), min(lows[k][start], lows[k][last])
+
+    def fibonacci(self, start=None, end=None):
+        """Penceredeki Fibonacci düzeltme seviyeleri (calculate_fibonacci ile aynı)."""
+        if self.n == 0:
+            return {}
+        return _fib_levels(*self.price_range(start, end))
+
+    def rolling_channel(self, lookback=ROLLING_LOOKBACK, width=2.0):
+        """
+        Her barda, o bar dahil son lookback barın regresyon kanalının o bardaki değeri
+        (orta, üst, alt). Önek farklarıyla tüm barlar için tek seferde, O(n).
+        İlk lookback-1 bar NaN.
+        """
+        n = lookback
+        out = np.full((3, self.n), np.nan)
+        if self.n < n or n < 2:
+            return out
+        end = np.arange(n, self.n + 1)
+        start = end - n
+        sy = self.sy[end] - self.sy[start]
+        sxy = self.siy[end] - self.siy[start] - start * sy
+        sx = n * (n - 1) / 2
+        cov = sxy - sx * sy / n
+        slope = cov / (n * (n * n - 1) / 12)
+        intercept = sy / n - slope * sx / n
+        ssr = (self.syy[end] - self.syy[start]) - sy * sy / n - slope * cov
+        std = np.sqrt(np.maximum(ssr, 0.0) / n)
+        mid = (slope * (n - 1) + intercept).astype(float) + self.shift
+        std = std.astype(float)
+        out[:, n - 1:] = mid, mid + width * std, mid - width * std
+        return out
+
 
 def calculate_fibonacci(df):
     """Fibonacci düzeltme seviyelerini hesaplar."""
     if df.empty: return {}
-    max_price = df['High'].max()
-    min_price = df['Low'].min()
-    diff = max_price - min_price
-    
-    levels = {
-        0.236: max_price - diff * 0.236,
-        0.382: max_price - diff * 0.382,
-        0.5: max_price - diff * 0.5,
-        0.618: max_price - diff * 0.618,
-        0.786: max_price - diff * 0.786
-    }
-    return levels
+    return _fib_levels(df['High'].max(), df['Low'].min())
 
 def calculate_regression_channel(df):
     """Doğrusal Regresyon Kanalı (Linear Regression Channel) hesaplar."""
@@ -35,17 +144,66 @@ def calculate_regression_channel(df):
     
     return regression_line, upper_channel, lower_channel
 
+def pivot_levels(high, low, close, method="classic"):
+    """
+    Dönem Yüksek/Düşük/Kapanışından sonraki dönemin pivot seviyeleri {P, R1, S1, ... S3}.
+    Skaler ya da dizi alır (dizilerde her eleman ayrı bir dönemdir).
+    classic: R1=2P-L, S1=2P-H, R2/S2=P±(H-L), R3=H+2(P-L), S3=L-2(H-P)
+    fibonacci: P ± (H-L) x 0.382 / 0.618 / 1.0
+    camarilla: C ± (H-L) x 1.1/12, 1.1/6, 1.1/4 (P klasik pivot)
+    """
+    pivot = (high + low + close) / 3
+    span = high - low
+    if method == "classic":
+        levels = (2 * pivot - low, 2 * pivot - high, pivot + span, pivot - span,
+                  high + 2 * (pivot - low), low - 2 * (high - pivot))
+    elif method == "fibonacci":
+        levels = (pivot + 0.382 * span, pivot - 0.382 * span, pivot + 0.618 * span, pivot - 0.618 * span,
+                  pivot + span, pivot - span)
+    elif method == "camarilla":
+        levels = (close + span * 1.1 / 12, close - span * 1.1 / 12, close + span * 1.1 / 6, close - span * 1.1 / 6,
+                  close + span * 1.1 / 4, close - span * 1.1 / 4)
+    else:
+        raise ValueError(f"Bilinmeyen pivot yöntemi: {method}")
+    return dict(zip(PIVOT_LEVELS, (pivot,) + levels))
+
 def calculate_pivot_points(high, low, close):
     """
     Klasik Pivot Noktaları (P, R1, S1, R2, S2) hesaplar.
     Son günün (veya periyodun) Yüksek, Düşük ve Kapanış değerlerini alır.
     """
-    pivot = (high + low + close) / 3
-    r1 = (2 * pivot) - low
-    s1 = (2 * pivot) - high
-    r2 = pivot + (high - low)
-    s2 = pivot - (high - low)
-    return pivot, r1, s1, r2, s2
+    levels = pivot_levels(high, low, close)
+    return tuple(levels[name] for name in PIVOT_LEVELS[:5])
+
+def pivot_series(df, anchor="D", method="classic"):
+    """
+    Tüm geçmiş için pivot seviyeleri: her bar, içinde bulunduğu dönemden (gün/hafta/ay) bir önceki
+    dönemin seviyelerini taşır; ilk dönem NaN. Dönem Yüksek/Düşük/Kapanışları reduceat ile tek
+    geçişte çıkarılır, seviyeler tüm dönemler için birlikte hesaplanıp barlara yayılır.
+    Dönüş: df ile aynı indeksli, PIVOT_LEVELS sütunlu DataFrame.
+    """
+    if anchor not in PIVOT_ANCHORS:
+        raise ValueError(f"Bilinmeyen pivot dönemi: {anchor}")
+    if df.empty:
+        return pd.DataFrame(columns=list(PIVOT_LEVELS), index=df.index, dtype=float)
+    index = df.index.tz_localize(None) if df.index.tz is not None else df.index
+    keys = index.to_period(anchor).asi8
+    first = np.r_[True, keys[1:] != keys[:-1]]
+    starts = np.flatnonzero(first)
+    ends = np.r_[starts[1:], len(keys)] - 1
+
+    high = np.fmax.reduceat(df['High'].to_numpy(dtype=float), starts)
+    low = np.fmin.reduceat(df['Low'].to_numpy(dtype=float), starts)
+    close = df['Close'].to_numpy(dtype=float)[ends]
+    levels = pivot_levels(high, low, close, method)
+
+    # Dönem i'deki barlar dönem i-1'in seviyelerini alır
+    period = np.cumsum(first) - 1
+    out = np.full((len(keys), len(PIVOT_LEVELS)), np.nan)
+    later = period > 0
+    table = np.column_stack([levels[name] for name in PIVOT_LEVELS])
+    out[later] = table[period[later] - 1]
+    return pd.DataFrame(out, index=df.index, columns=list(PIVOT_LEVELS))
 
 def calculate_fair_value(info):
     """
@@ -65,3 +223,20 @@ def calculate_fair_value(info):
             return None
     except:
         return None
+
+def graham_values(eps, book_value):
+    """
+    calculate_fair_value'nun dizi hali: tüm semboller için Sqrt(22.5 * EPS * BookValue).
+    EPS veya defter değeri pozitif olmayan (ya da eksik) sembollerde NaN.
+    """
+    eps = np.asarray(eps, dtype=float)
+    book_value = np.asarray(book_value, dtype=float)
+    valid = (eps > 0) & (book_value > 0)
+    return np.where(valid, np.sqrt(np.where(valid, 22.5 * eps * book_value, 0.0)), np.nan)
+
+def debt_to_equity(debt, equity):
+    """Borç / Özsermaye oranı (dizi); özsermayesi sıfır veya eksik olanlarda NaN."""
+    debt = np.asarray(debt, dtype=float)
+    equity = np.asarray(equity, dtype=float)
+    valid = np.isfinite(equity) & (equity != 0)
+    return np.where(valid, debt / np.where(valid, equity, 1.0), np.nan)
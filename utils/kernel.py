@@ -0,0 +1,501 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+NaN = float("nan")
+EPS = np.finfo(float).eps
+
+INT_COLUMNS = ['PSARr_0.02_0.2', 'SUPERTd_7_3.0']
+OHLCV = ['Open', 'High', 'Low', 'Close', 'Volume']
+SWING_ORDER = 8
+
+
+def ohlcv_array(df):
+    """OHLCV sütunlarını bitişik float64 dizisine çevirir; eksik barlar bir önceki değerle doldurulur."""
+    # Sütunlar tek tek kopyalanır (df[OHLCV] alt tablosu ve ffill yalnızca eksik bar varsa oluşturulur)
+    out = np.empty((len(df), len(OHLCV)))
+    for j, column in enumerate(OHLCV):
+        out[:, j] = df[column].to_numpy(dtype=np.float64)
+    if np.isnan(out).any():
+        out = np.ascontiguousarray(df[OHLCV].ffill().to_numpy(dtype=np.float64))
+    return out
+
+
+def _columns(x):
+    """1-D seriyi veya 2-D (zaman x sembol) paneli sütun bazlı 2-D görünüme çevirir."""
+    return x.reshape(len(x), -1)
+
+
+def first_valid(x):
+    """Her sütunun ilk NaN olmayan satırı (tamamı NaN ise satır sayısı)."""
+    x2 = _columns(x)
+    valid = ~np.isnan(x2)
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), len(x2))
+
+
+def pack(x):
+    """
+    Paneldeki boşlukları (sembolün işlem görmediği günler, NaN) atlamak için her sütunun geçerli
+    değerlerini sırası korunarak sütunun sonuna toplar; öndeki satırlar NaN olur. Baştaki NaN'ları
+    zaten atlayan özyinelemeler böylece her sembolü yalnızca kendi barlarıyla (tek seri gibi) hesaplar;
+    son satır her sembolün son işlem gördüğü bardır.
+    Dönüş: (paketlenmiş panel, unpack için satır sırası)
+    """
+    x2 = _columns(x)
+    order = np.argsort(~np.isnan(x2), axis=0, kind='stable')
+    return np.take_along_axis(x2, order, axis=0).reshape(x.shape), order
+
+
+def unpack(packed, order):
+    """
+    pack ile paketlenmiş panel üzerinde hesaplanan sonuçları asıl satırlarına döndürür. Atlanan satırlara
+    öndeki (girdisi NaN olduğundan sonucu da NaN olan) satırlar düşer.
+    """
+    out = np.full(order.shape, NaN)
+    np.put_along_axis(out, order, _columns(packed), axis=0)
+    return out.reshape(packed.shape)
+
+
+def lfilter(b, a, x, axis=-1):
+    """scipy.signal.lfilter; scipy.signal yüklenmesi ~1 sn sürdüğü için ilk kullanımda içe aktarılır."""
+    from scipy.signal import lfilter
+    return lfilter(b, a, x, axis=axis)
+
+
+def _recursive(u, alpha):
+    """Sütun bazında y_t = alpha * u_t + (1 - alpha) * y_{t-1} özyinelemesi (y_{-1} = 0), C hızında."""
+    return lfilter([alpha], [1.0, alpha - 1.0], u, axis=0)
+
+
+# Özyinelemeli ortalamalar 1-D seri veya 2-D (zaman x sembol) panel kabul eder.
+# Panelde her sembol kendi ilk geçerli barından başlar (baştaki NaN'lar = henüz işlem görmüyor).
+
+def ema(x, length, state=None):
+    """pandas_ta.ema: ilk değer ilk `length` değerin ortalaması, sonrası ewm(span, adjust=False)."""
+    x2 = _columns(x)
+    n = len(x2)
+    alpha = 2.0 / (length + 1)
+    seed = first_valid(x2) + length - 1
+    rows = np.arange(n)[:, None]
+    # Başlangıç değeri, sıfır girdili özyinelemeye seed satırında tek bir dürtü olarak verilir
+    u = np.where(rows > seed, x2, 0.0)
+    for j in np.flatnonzero(seed < n):
+        u[seed[j], j] = x2[seed[j] - length + 1:seed[j] + 1, j].sum() / length / alpha
+    out = np.where(rows >= seed, _recursive(u, alpha), NaN).reshape(x.shape)
+    if state is not None:
+        state.update(count=n, total=x[:min(n, length - 1)].sum(), value=out[-1] if n else NaN)
+    return out
+
+
+def ewm(x, span, state=None):
+    """Series.ewm(span, adjust=False, min_periods=span).mean(); baştaki NaN'lar atlanır."""
+    x2 = _columns(x)
+    n = len(x2)
+    alpha = 2.0 / (span + 1)
+    first = first_valid(x2)
+    rows = np.arange(n)[:, None]
+    u = np.where(rows > first, x2, 0.0)
+    cols = np.flatnonzero(first < n)
+    u[first[cols], cols] = x2[first[cols], cols] / alpha
+    raw = _recursive(u, alpha)
+    out = np.where(rows >= first + span - 1, raw, NaN).reshape(x.shape)
+    if state is not None:
+        valid = first[0] < n
+        state.update(count=n - first[0] if valid else 0, value=raw[-1, 0] if valid else NaN)
+    return out
+
+
+def wilder(x, length, state=None):
+    """Wilder (RMA) ortalaması: ewm(alpha=1/length, min_periods=length), adjust=True."""
+    x2 = _columns(x)
+    n = len(x2)
+    decay = 1.0 - 1.0 / length
+    first = first_valid(x2)
+    started = np.arange(n)[:, None] >= first
+    nums = lfilter([1.0], [1.0, -decay], np.where(started, x2, 0.0), axis=0)
+    dens = lfilter([1.0], [1.0, -decay], started.astype(float), axis=0)
+    with np.errstate(invalid='ignore'):
+        vals = nums / dens
+    out = np.where(np.arange(n)[:, None] >= first + length - 1, vals, NaN).reshape(x.shape)
+    if state is not None:
+        valid = first[0] < n
+        state.update(count=n - first[0] if valid else 0,
+                     num=nums[-1, 0] if valid else 0.0, den=dens[-1, 0] if valid else 0.0)
+    return out
+
+
+def _rolling(x, length, func):
+    """Zaman ekseni (0) boyunca kayan pencere; 2-D panelde her sütun ayrı."""
+    out = np.full(x.shape, NaN)
+    if len(x) >= length:
+        out[length - 1:] = func(sliding_window_view(x, length, axis=0), axis=-1)
+    return out
+
+
+def rolling_mean(x, length):
+    return _rolling(x, length, np.mean)
+
+
+def rolling_std(x, length):
+    """ddof=0 kayan standart sapma."""
+    return _rolling(x, length, np.std)
+
+
+def rolling_min(x, length):
+    return _rolling(x, length, np.min)
+
+
+def rolling_max(x, length):
+    return _rolling(x, length, np.max)
+
+
+def rsi(close, length=14, state=None):
+    diff = np.empty(close.shape)
+    diff[0] = NaN
+    diff[1:] = close[1:] - close[:-1]
+    pos_state, neg_state = ({}, {}) if state is not None else (None, None)
+    with np.errstate(invalid='ignore'):
+        pos = wilder(np.where(diff > 0, diff, np.where(np.isnan(diff), NaN, 0.0)), length, pos_state)
+        neg = wilder(np.where(diff < 0, diff, np.where(np.isnan(diff), NaN, 0.0)), length, neg_state)
+        total = pos - neg
+        out = np.where(total == 0, NaN, 100 * pos / total)
+    if state is not None:
+        state.update(pos=pos_state, neg=neg_state, prev=close[-1])
+    return out
+
+
+def true_range(high, low, close):
+    tr = np.empty(len(close))
+    tr[0] = NaN
+    hl = high - low
+    hl[hl == 0] = EPS
+    pc = close[:-1]
+    tr[1:] = np.maximum(np.abs(hl[1:]), np.maximum(np.abs(high[1:] - pc), np.abs(pc - low[1:])))
+    return tr
+
+
+def atr(high, low, close, length=14, state=None):
+    avg_state = {} if state is not None else None
+    out = wilder(true_range(high, low, close), length, avg_state)
+    if state is not None:
+        state.update(avg=avg_state, prev_close=close[-1])
+    return out
+
+
+def psar(high, low, close, af0=0.02, max_af=0.2, state=None):
+    """
+    Parabolic SAR. Özyinelemeli olduğu için tek geçişlik döngü ile hesaplanır.
+    İkinci barda yalnızca ilk bar referans alınır (ileriye bakma yok).
+    Dönüş: long, short, af, reversal dizileri.
+    """
+    n = len(high)
+    long = [NaN] * n
+    short = [NaN] * n
+    afs = [af0] * n
+    rev = [0.0] * n
+    af = af0
+    falling, sar, ep = False, NaN, NaN
+    if n > 1:
+        h, l = high.tolist(), low.tolist()
+        falling = (l[0] - l[1]) > (h[1] - h[0]) and (l[0] - l[1]) > 0
+        ep = l[0] if falling else h[0]
+        sar = float(close[0])
+        for i in range(1, n):
+            hi, lo = h[i], l[i]
+            nxt = sar + af * (ep - sar)
+            if falling:
+                reverse = hi > nxt
+                if lo < ep:
+                    ep = lo
+                    af = min(af + af0, max_af)
+                ref = h[i - 1] if i == 1 or h[i - 1] > h[i - 2] else h[i - 2]
+                if ref > nxt:
+                    nxt = ref
+            else:
+                reverse = lo < nxt
+                if hi > ep:
+                    ep = hi
+                    af = min(af + af0, max_af)
+                ref = l[i - 1] if i == 1 or l[i - 1] < l[i - 2] else l[i - 2]
+                if ref < nxt:
+                    nxt = ref
+            if reverse:
+                nxt = ep
+                af = af0
+                falling = not falling
+                ep = lo if falling else hi
+                rev[i] = 1.0
+            sar = nxt
+            if falling:
+                short[i] = sar
+            else:
+                long[i] = sar
+            afs[i] = af
+    if state is not None:
+        state.update(n=n, falling=falling, sar=sar, ep=ep, af=af,
+                     highs=high[-2:].tolist(), lows=low[-2:].tolist(), first_close=close[0])
+    return np.array(long), np.array(short), np.array(afs), np.array(rev)
+
+
+def supertrend(high, low, close, length=7, multiplier=3.0, state=None):
+    """SuperTrend: bant taşıma kuralları sıralı olduğu için tek geçişlik döngü. Dönüş: trend, yön, long, short."""
+    n = len(close)
+    atr_state = {} if state is not None else None
+    matr = multiplier * atr(high, low, close, length, atr_state)
+    hl2 = (high + low) / 2
+    upper = (hl2 + matr).tolist()
+    lower = (hl2 - matr).tolist()
+    c = close.tolist()
+    trend = [NaN] * n
+    direction = [1.0] * n
+    long = [NaN] * n
+    short = [NaN] * n
+    trend[0] = 0.0
+    d = 1
+    for i in range(1, n):
+        if c[i] > upper[i - 1]:
+            d = 1
+        elif c[i] < lower[i - 1]:
+            d = -1
+        else:
+            if d > 0 and lower[i] < lower[i - 1]:
+                lower[i] = lower[i - 1]
+            if d < 0 and upper[i] > upper[i - 1]:
+                upper[i] = upper[i - 1]
+        if d > 0:
+            trend[i] = long[i] = lower[i]
+        else:
+            direction[i] = -1.0
+            trend[i] = short[i] = upper[i]
+    if state is not None:
+        state.update(atr=atr_state, n=n, direction=d, upper=upper[-1], lower=lower[-1])
+    return np.array(trend), np.array(direction), np.array(long), np.array(short)
+
+
+def centered_extreme(x, order, func):
+    """
+    Her barın ±order komşuluğundaki en küçük (func=np.minimum) veya en büyük (np.maximum) değer;
+    pencere dizi kenarlarında kırpılır, içinde NaN varsa sonuç NaN olur.
+    van Herk/Gil-Werman: 2*order+1 uzunluğundaki bloklarda önek ve sonek birikimli ekstremum,
+    her pencere bir sonek ile bir önekin birleşimidir. Süre order'dan bağımsız, O(n).
+    """
+    n = len(x)
+    w = 2 * order + 1
+    pad = np.inf if func is np.minimum else -np.inf
+    blocks = -(-(n + 2 * order) // w)
+    y = np.full(blocks * w, pad)
+    y[order:order + n] = x
+    y = y.reshape(blocks, w)
+    prefix = func.accumulate(y, axis=1).ravel()
+    suffix = func.accumulate(y[:, ::-1], axis=1)[:, ::-1].ravel()
+    return func(suffix[:n], prefix[w - 1:w - 1 + n])
+
+
+def swing_points(close, order=SWING_ORDER, high=None, low=None):
+    """
+    Tepe/dip noktaları: komşu ±order bar içinde en düşük (dip) / en yüksek (tepe) olan barlar,
+    eşitlik dahil; nokta olmayan yerler NaN. argrelextrema(mode='clip') ile aynı sonuç.
+    high/low verilirse tepeler High, dipler Low serisinden bulunur.
+    Son order barın durumu yeni barlarla değişebilir (artımlı motor yalnızca onları yeniler).
+    """
+    low = close if low is None else low
+    high = close if high is None else high
+    with np.errstate(invalid='ignore'):
+        swing_min = np.where(low <= centered_extreme(low, order, np.minimum), low, NaN)
+        swing_max = np.where(high >= centered_extreme(high, order, np.maximum), high, NaN)
+    return swing_min, swing_max
+
+
+def swing_columns(order):
+    """Derecenin (dip, tepe) sütunları: SWING_ORDER için 'min'/'max', diğerleri 'min_<order>'/'max_<order>'."""
+    return ('min', 'max') if order == SWING_ORDER else (f'min_{order}', f'max_{order}')
+
+
+def swing_levels(bars, orders=(SWING_ORDER,), high_low=False):
+    """
+    Birden çok derece için tepe/dip noktaları (kısa ve uzun vadeli salınımlar): {order: (dip, tepe)}.
+    high_low=True: tepeler High, dipler Low serisinden bulunur.
+    """
+    extra = {'high': bars['high'], 'low': bars['low']} if high_low else {}
+    return {order: swing_points(bars['close'], order, **extra) for order in orders}
+
+
+class Indicator:
+    """Kayıt defterindeki bir indikatör: ürettiği sütunlar, bağımlılıkları ve toplu hesap fonksiyonu."""
+    def __init__(self, name, columns, deps, func):
+        self.name = name
+        self.columns = columns
+        self.deps = deps
+        self.func = func
+
+
+# İndikatör kayıt defteri (ad -> Indicator), tanım sırası = hesaplama sırası
+REGISTRY = {}
+
+
+def indicator(name, columns, deps=()):
+    """
+    Toplu hesap fonksiyonunu kayıt defterine ekler.
+    Fonksiyon imzası: func(bars, values, state) -> sütun dizileri listesi
+    (values: bağımlılıkların sütun dizileri, state: artımlı motor için doldurulacak sözlük veya None).
+    """
+    def wrap(func):
+        REGISTRY[name] = Indicator(name, columns, tuple(deps), func)
+        return func
+    return wrap
+
+
+def _sub(state, *keys):
+    if state is None:
+        return [None] * len(keys)
+    return [state.setdefault(k, {}) for k in keys]
+
+
+@indicator('EMA', ['EMA20', 'EMA50', 'EMA200'])
+def _ema_set(bars, values, state):
+    s20, s50, s200 = _sub(state, 'ema20', 'ema50', 'ema200')
+    close = bars['close']
+    return [ema(close, 20, s20), ema(close, 50, s50), ema(close, 200, s200)]
+
+
+@indicator('RSI', ['RSI'])
+def _rsi(bars, values, state):
+    (s,) = _sub(state, 'rsi')
+    return [rsi(bars['close'], 14, s)]
+
+
+@indicator('STOCHRSI', ['STOCHRSIk_14_14_3_3', 'STOCHRSId_14_14_3_3'], deps=['RSI'])
+def _stochrsi(bars, values, state):
+    r = values['RSI']
+    lo, hi = rolling_min(r, 14), rolling_max(r, 14)
+    rng = hi - lo
+    rng[rng == 0] = EPS
+    stoch = 100 * (r - lo) / rng
+    k = rolling_mean(stoch, 3)
+    if state is not None:
+        state['windows'] = {'rsi_win': r[-14:], 'stoch_k': stoch[-3:], 'stoch_d': k[-3:]}
+    return [k, rolling_mean(k, 3)]
+
+
+@indicator('MACD', ['MACD', 'MACD_Signal', 'MACD_Hist'])
+def _macd(bars, values, state):
+    s_fast, s_slow, s_signal = _sub(state, 'macd_fast', 'macd_slow', 'macd_signal')
+    close = bars['close']
+    macd = ewm(close, 12, s_fast) - ewm(close, 26, s_slow)
+    signal = ewm(macd, 9, s_signal)
+    return [macd, signal, macd - signal]
+
+
+@indicator('BBANDS', ['BB_Lower', 'BB_Mid', 'BB_Upper', 'BBB_20_2.0', 'BBP_20_2.0'])
+def _bbands(bars, values, state):
+    close = bars['close']
+    mid = rolling_mean(close, 20)
+    dev = 2 * rolling_std(close, 20)
+    lower, upper = mid - dev, mid + dev
+    width = upper - lower
+    width[width == 0] = EPS
+    if state is not None:
+        state['windows'] = {'bb': close[-20:]}
+    return [lower, mid, upper, 100 * width / mid, (close - lower) / width]
+
+
+@indicator('ATR', ['ATR'])
+def _atr(bars, values, state):
+    (s,) = _sub(state, 'atr')
+    return [atr(bars['high'], bars['low'], bars['close'], 14, s)]
+
+
+@indicator('TRAILING_STOP', ['Trailing_Stop'], deps=['ATR'])
+def _trailing_stop(bars, values, state):
+    return [bars['close'] - values['ATR'] * 2]
+
+
+@indicator('PSAR', ['PSARl_0.02_0.2', 'PSARs_0.02_0.2', 'PSARaf_0.02_0.2', 'PSARr_0.02_0.2'])
+def _psar(bars, values, state):
+    (s,) = _sub(state, 'psar')
+    return list(psar(bars['high'], bars['low'], bars['close'], 0.02, 0.2, s))
+
+
+@indicator('SUPERTREND', ['SUPERT_7_3.0', 'SUPERTd_7_3.0', 'SUPERTl_7_3.0', 'SUPERTs_7_3.0'])
+def _supertrend(bars, values, state):
+    (s,) = _sub(state, 'supertrend')
+    return list(supertrend(bars['high'], bars['low'], bars['close'], 7, 3.0, s))
+
+
+@indicator('VOL_EMA', ['Vol_EMA'])
+def _vol_ema(bars, values, state):
+    (s,) = _sub(state, 'vol_ema')
+    return [ema(bars['volume'], 20, s)]
+
+
+@indicator('SWINGS', ['min', 'max'])
+def _swings(bars, values, state):
+    return list(swing_points(bars['close']))
+
+
+def resolve(names=None):
+    """
+    İstenen indikatörleri bağımlılıklarıyla birlikte, hesaplama sırasına dizilmiş olarak döndürür.
+    names None ise tüm kayıt defteri.
+    """
+    if names is None:
+        return list(REGISTRY)
+    needed = set()
+    stack = list(names)
+    while stack:
+        name = stack.pop()
+        if name not in REGISTRY:
+            raise KeyError(f"Bilinmeyen indikatör: {name}")
+        if name not in needed:
+            needed.add(name)
+            stack.extend(REGISTRY[name].deps)
+    return [name for name in REGISTRY if name in needed]
+
+
+def columns_for(names):
+    return [c for name in names for c in REGISTRY[name].columns]
+
+
+def bars_dict(ohlcv):
+    return {'open': ohlcv[:, 0], 'high': ohlcv[:, 1], 'low': ohlcv[:, 2],
+            'close': ohlcv[:, 3], 'volume': ohlcv[:, 4]}
+
+
+def compute(ohlcv, names=None, state=None, values=None):
+    """
+    İstenen indikatörleri (ve bağımlılıklarını) tek bir önceden ayrılmış (n x sütun) float64 bloğuna yazar.
+    values: önceden hesaplanmış sütunlar (bağımlılık olarak kullanılır, yeniden hesaplanmaz).
+    state sözlüğü verilirse artımlı motorun devam edebilmesi için indikatör başına son durumlar doldurulur.
+    Dönüş: (blok, sütun listesi)
+    """
+    values = dict(values or {})
+    todo = [name for name in resolve(names)
+            if not all(c in values for c in REGISTRY[name].columns)]
+    columns = columns_for(todo)
+    out = np.empty((len(ohlcv), len(columns)))
+    bars = bars_dict(ohlcv)
+    i = 0
+    for name in todo:
+        ind = REGISTRY[name]
+        sub = state.setdefault(name, {}) if state is not None else None
+        for col, arr in zip(ind.columns, ind.func(bars, values, sub)):
+            out[:, i] = arr
+            values[col] = out[:, i]
+            i += 1
+    return out, columns
+
+
+def indicator_frame(df, block=None, columns=None, names=None):
+    """Girdi DataFrame'i ile indikatör bloğunu tek seferde birleştirir."""
+    if block is None:
+        block, columns = compute(ohlcv_array(df), names)
+    ind = pd.DataFrame(block, index=df.index, columns=columns)
+    ints = [c for c in INT_COLUMNS if c in ind.columns]
+    if ints:
+        ind[ints] = ind[ints].astype('int64')
+    base = df.drop(columns=[c for c in df.columns if c in ind.columns])
+    return pd.concat([base, ind], axis=1)
+
+
+# process_indicators çıktı sütunları (pandas_ta isimlendirmesiyle aynı sırada)
+COLUMNS = columns_for(REGISTRY)
@@ -0,0 +1,197 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+
+import numpy as np
+
+# Ölçümler bu dosyalara yazılır (boşsa kapalı): her aşama bir JSONL satırı, Prometheus metin dosyası
+METRICS_JSONL = os.environ.get("PROTRADE_METRICS_JSONL", "")
+METRICS_PROM = os.environ.get("PROTRADE_METRICS_PROM", "")
+# Yüzdelikler aşama başına son bu kadar ölçümden hesaplanır
+WINDOW = 1000
+
+_local = threading.local()
+_lock = threading.Lock()
+_durations = defaultdict(lambda: deque(maxlen=WINDOW))
+_totals = defaultdict(lambda: [0, 0.0])  # aşama -> [adet, toplam saniye]
+_cache_counts = defaultdict(int)  # (aşama, hit/miss) -> adet
+
+
+class Trace:
+    """Bir sayfa çalıştırmasında (script rerun) ölçülen aşamalar."""
+    def __init__(self, name):
+        self.name = name
+        self.id = uuid.uuid4().hex[:12]
+        self.spans = []
+        self.start = time.perf_counter()
+        self.total_ms = None
+
+
+def start_trace(name="page"):
+    """Çağıran iş parçacığı için yeni bir ölçüm başlatır (Streamlit'te her oturum kendi iş parçacığında çalışır)."""
+    trace = Trace(name)
+    _local.trace = trace
+    _local.stack = []
+    return trace
+
+
+def current_trace():
+    return getattr(_local, "trace", None)
+
+
+def finish_trace():
+    """Etkin ölçümü kapatır, toplam süreyi kaydeder ve Prometheus dosyasını günceller."""
+    trace = current_trace()
+    if trace is None:
+        return None
+    trace.total_ms = (time.perf_counter() - trace.start) * 1000
+    _local.trace = None
+    _record({"stage": trace.name, "ms": trace.total_ms, "depth": 0}, trace)
+    if METRICS_PROM:
+        write_prometheus(METRICS_PROM)
+    return trace
+
+
+@contextmanager
+def span(stage, **attrs):
+    """
+    Bir aşamanın süresini ölçer. Dönen sözlüğe ek bilgi yazılabilir, örn. rec["cache"] = "hit".
+    Etkin bir ölçüm varsa aşama ona eklenir; her durumda süreç geneli istatistiklere girer.
+    """
+    trace = current_trace()
+    stack = _stack()
+    rec = {"stage": stage, **attrs, "depth": len(stack)}
+    stack.append(rec)
+    start = time.perf_counter()
+    if trace is not None:
+        rec["at_ms"] = (start - trace.start) * 1000
+    try:
+        yield rec
+    finally:
+        rec["ms"] = (time.perf_counter() - start) * 1000
+        stack.pop()
+        _record(rec, trace)
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def note(**attrs):
+    """İçinde bulunulan aşamaya bilgi ekler (örn. note(cache="hit")); aşama yoksa bir şey yapmaz."""
+    stack = _stack()
+    if stack:
+        stack[-1].update(attrs)
+
+
+def timed(stage):
+    """Fonksiyonu span(stage) içinde çalıştıran dekoratör."""
+    def wrap(func):
+        @wraps(func)
+        def inner(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return inner
+    return wrap
+
+
+def bind(func):
+    """
+    Fonksiyonu çağıranın ölçümüne bağlar: başka bir iş parçacığında (havuzda) çalışsa da
+    aşamaları aynı sayfa ölçümüne yazılır.
+    """
+    trace = current_trace()
+    depth = len(_stack())
+
+    @wraps(func)
+    def inner(*args, **kwargs):
+        previous = current_trace(), getattr(_local, "stack", None)
+        _local.trace = trace
+        _local.stack = [{}] * depth  # iç içe görünüm için çağıranın derinliği
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.trace, _local.stack = previous
+    return inner
+
+
+def _record(rec, trace):
+    with _lock:
+        _durations[rec["stage"]].append(rec["ms"] / 1000)
+        totals = _totals[rec["stage"]]
+        totals[0] += 1
+        totals[1] += rec["ms"] / 1000
+        if "cache" in rec:
+            _cache_counts[(rec["stage"], rec["cache"])] += 1
+    if trace is not None and rec["stage"] != trace.name:
+        trace.spans.append(rec)
+    if METRICS_JSONL:
+        line = dict(rec, ts=time.time(), trace=trace.id if trace is not None else None)
+        with _lock, open(METRICS_JSONL, "a", encoding="utf-8") as f:
+            f.write(json.dumps(line, default=str) + "\n")
+
+
+def summary():
+    """Aşama başına adet, p50/p95 (ms) ve önbellek isabet/ıskalama sayıları."""
+    with _lock:
+        stages = {stage: np.array(values) * 1000 for stage, values in _durations.items()}
+        counts = {stage: totals[0] for stage, totals in _totals.items()}
+        cache = dict(_cache_counts)
+    rows = {}
+    for stage, values in stages.items():
+        rows[stage] = {
+            "count": counts[stage],
+            "p50_ms": float(np.percentile(values, 50)),
+            "p95_ms": float(np.percentile(values, 95)),
+            "hit": cache.get((stage, "hit"), 0),
+            "miss": cache.get((stage, "miss"), 0),
+        }
+    return rows
+
+
+def prometheus_text():
+    """Süreç geneli istatistikler Prometheus metin biçiminde (summary + counter)."""
+    with _lock:
+        stages = {stage: list(values) for stage, values in _durations.items()}
+        totals = {stage: list(t) for stage, t in _totals.items()}
+        cache = dict(_cache_counts)
+    lines = [
+        "# HELP protrade_stage_duration_seconds Sayfa hattı aşama süreleri",
+        "# TYPE protrade_stage_duration_seconds summary",
+    ]
+    for stage in sorted(stages):
+        values = np.array(stages[stage])
+        for q in (0.5, 0.95):
+            lines.append(f'protrade_stage_duration_seconds{{stage="{stage}",quantile="{q}"}} {np.quantile(values, q):.6f}')
+        count, total = totals[stage]
+        lines.append(f'protrade_stage_duration_seconds_sum{{stage="{stage}"}} {total:.6f}')
+        lines.append(f'protrade_stage_duration_seconds_count{{stage="{stage}"}} {count}')
+    lines += [
+        "# HELP protrade_stage_cache_total Aşama başına önbellek isabet/ıskalama sayısı",
+        "# TYPE protrade_stage_cache_total counter",
+    ]
+    for (stage, result), count in sorted(cache.items()):
+        lines.append(f'protrade_stage_cache_total{{stage="{stage}",result="{result}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    """node_exporter textfile toplayıcısı için metinleri atomik olarak yazar."""
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+
+def reset():
+    with _lock:
+        _durations.clear()
+        _totals.clear()
+        _cache_counts.clear()
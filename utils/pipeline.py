@@ -0,0 +1,65 @@
+import math
+from utils import data, indicators, signals
+
+# Toplu raporun sütunları (CSV başlığı ve JSON alan sırası)
+FIELDS = [
+    "symbol", "ticker", "date", "close", "change_pct", "rsi", "ema200", "macd", "macd_signal",
+    "pivot", "r1", "s1", "r2", "s2", "fair_value", "upside_pct", "signals", "error",
+]
+
+
+def _number(value):
+    """NaN/inf değerleri None'a, numpy sayılarını Python float'a çevirir (JSON için)."""
+    if value is None:
+        return None
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def analyze(symbol, period="max", with_fundamentals=True):
+    """
+    Tek hisse için arayüzdeki analiz hattını (veri, indikatörler, pivotlar, Graham değeri,
+    teknik sinyaller) Streamlit olmadan çalıştırır. Dönüş: FIELDS anahtarlı sözlük.
+    """
+    row = dict.fromkeys(FIELDS)
+    row["symbol"] = symbol
+    try:
+        df, ticker, errors = data.load_price_history(data.process_symbol(symbol), period="max")
+        if df is None or len(df) < 2:
+            row["error"] = "; ".join(f"{t}: {m}" for t, m in errors) or "Veri bulunamadı"
+            return row
+        row["ticker"] = ticker
+
+        df = data.process_indicators(df, signals.INDICATORS)
+        view = data.slice_data_by_period(df, period)
+        last = view.iloc[-1]
+        _, pct_change = data.get_market_status(last["Close"], view["Close"].iloc[-2])
+        pivots = indicators.calculate_pivot_points(last["High"], last["Low"], last["Close"])
+
+        fair_value = None
+        if with_fundamentals:
+            _, _, info = data.fetch_fundamentals(ticker)
+            fair_value = indicators.calculate_fair_value(info)
+
+        row.update({
+            "date": view.index[-1].isoformat(),
+            "close": last["Close"],
+            "change_pct": pct_change,
+            "rsi": last["RSI"],
+            "ema200": last["EMA200"],
+            "macd": last["MACD"],
+            "macd_signal": last["MACD_Signal"],
+            "fair_value": fair_value,
+            "upside_pct": (fair_value - last["Close"]) / last["Close"] * 100 if fair_value else None,
+        })
+        row.update(zip(["pivot", "r1", "s1", "r2", "s2"], pivots))
+        row["signals"] = signals.technical_signals(
+            last["Close"], last["RSI"], last["EMA200"], last["MACD"], last["MACD_Signal"], fair_value
+        )
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+
+    for key in FIELDS:
+        if key not in ("symbol", "ticker", "date", "signals", "error"):
+            row[key] = _number(row[key])
+    return row
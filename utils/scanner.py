@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from utils import kernel, signals
+from utils.indicators import calculate_fair_value
+
+# Aynı anda en fazla bu kadar sembol çekilir (Yahoo kısıtlamasına takılmamak için)
+DEFAULT_WORKERS = 8
+
+# Örnek izleme listesi: BIST 30 bileşenleri
+BIST30 = [
+    "AKBNK", "ALARK", "ASELS", "ASTOR", "BIMAS", "BRSAN", "EKGYO", "ENKAI", "EREGL", "FROTO",
+    "GARAN", "GUBRF", "HEKTS", "ISCTR", "KCHOL", "KONTR", "KOZAL", "KRDMD", "OYAKC", "PETKM",
+    "PGSUS", "SAHOL", "SASA", "SISE", "TCELL", "THYAO", "TOASO", "TTKOM", "TUPRS", "YKBNK",
+]
+
+
+def _load(symbol, with_fundamentals):
+    """Tek sembol için fiyat geçmişi ve (istenirse) info sözlüğü."""
+    from utils import data  # data modülü de bu modülü içe aktarıyor
+    df, ticker, _ = data.load_price_history(symbol)
+    info = None
+    if df is not None and with_fundamentals:
+        _, _, info = data.fetch_fundamentals(ticker)
+    return df, ticker, info
+
+
+def fetch_all(symbols, with_fundamentals=True, max_workers=DEFAULT_WORKERS):
+    """Sembolleri sınırlı paralellikle çeker; sonuçlar giriş sırasıyla döner."""
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda s: _load(s, with_fundamentals), symbols))
+
+
+def build_panel(frames, column='Close'):
+    """
+    {sembol: DataFrame} sözlüğünden tarihleri hizalanmış (zaman x sembol) panel oluşturur.
+    Farklı saat dilimleri gün bazında eşlenir. Sembolün işlem görmediği günler (askı, tatil farkı,
+    henüz halka arz edilmemiş) NaN kalır: doldurulursa sahte sıfır getirili barlar indikatörleri ve
+    korelasyonu tek hisse sayfasından farklılaştırır.
+    """
+    series = {}
+    for ticker, df in frames.items():
+        index = df.index
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        s = pd.Series(df[column].to_numpy(dtype=float), index=index.normalize())
+        series[ticker] = s[~s.index.duplicated(keep='last')]
+    return pd.DataFrame(series).sort_index()
+
+
+def _indicators(close):
+    macd = kernel.ewm(close, 12) - kernel.ewm(close, 26)
+    return {
+        'RSI': kernel.rsi(close, 14),
+        'EMA200': kernel.ema(close, 200),
+        'MACD': macd,
+        'MACD_Signal': kernel.ewm(macd, 9),
+    }
+
+
+def panel_indicators(close):
+    """
+    Sinyal panelinin kullandığı indikatörleri tüm semboller için tek seferde (sütun bazında) hesaplar.
+    NaN satırlar (sembolün işlem görmediği günler) atlanır: her sembol yalnızca kendi barlarıyla
+    hesaplanır; sonuç panelle aynı hizadadır, atlanan satırlar NaN.
+    """
+    packed, order = kernel.pack(close)
+    return {name: kernel.unpack(values, order) for name, values in _indicators(packed).items()}
+
+
+def scan(symbols, with_fundamentals=True, max_workers=DEFAULT_WORKERS):
+    """
+    İzleme listesindeki tüm sembolleri tarar ve sinyal tablosu döndürür.
+    Veriler paralel çekilir, indikatörler (zaman x sembol) panel üzerinde toplu hesaplanır.
+    """
+    results = fetch_all(symbols, with_fundamentals, max_workers)
+    loaded = [(ticker, df, info) for df, ticker, info in results if df is not None]
+    if not loaded:
+        return pd.DataFrame()
+
+    tickers = [ticker for ticker, _, _ in loaded]
+    panel = build_panel({ticker: df for ticker, df, _ in loaded})
+    # Her sembolün son iki işlem günü ve indikatörlerin o günkü değeri (bkz. panel_indicators)
+    close, _ = kernel.pack(panel[tickers].to_numpy())
+    ind = {name: values[-1] for name, values in _indicators(close).items()}
+    last, prev = close[-1], close[-2] if len(close) > 1 else close[-1]
+
+    fair = None
+    if with_fundamentals:
+        fair = np.array([calculate_fair_value(info) or np.nan for _, _, info in loaded], dtype=float)
+    flags = signals.signal_flags(last, ind['RSI'], ind['EMA200'], ind['MACD'], ind['MACD_Signal'], fair)
+
+    table = pd.DataFrame({
+        'Fiyat': last,
+        'Değişim %': (last - prev) / prev * 100,
+        'RSI': ind['RSI'],
+        'RSI Durumu': np.select([flags['rsi_signal'] < 0, flags['rsi_signal'] > 0],
+                                ['Aşırı Satım', 'Aşırı Alım'], 'Nötr'),
+        'EMA200': ind['EMA200'],
+        'Trend': np.where(flags['above_ema200'], 'Yükseliş', 'Düşüş'),
+        'MACD': ind['MACD'],
+        'MACD Durumu': np.where(flags['macd_positive'], 'Pozitif', 'Negatif'),
+    }, index=pd.Index(tickers, name='Sembol'))
+    if fair is not None:
+        table['Adil Değer'] = fair
+        table['Potansiyel %'] = flags['upside']
+    return table
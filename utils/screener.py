@@ -0,0 +1,143 @@
+"""
+Evren genelinde değerleme taraması: temel veriler (EPS, defter değeri, özsermaye, borç, fiyat)
+arka plan işiyle tek kolon-bazlı tabloya (store.FundamentalsTable) yazılır; sıralama sorguları
+sembol başına info çekmeden, tüm tablo üzerinde vektörel hesaplanır.
+"""
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils import indicators
+from utils.scanner import DEFAULT_WORKERS
+from utils.store import FundamentalsTable, FUNDAMENTALS_TTL
+
+# Tablo sütunları (sembol indeksli)
+COLUMNS = ["ticker", "eps", "book_value", "equity", "total_debt", "price", "updated"]
+
+_table = FundamentalsTable()
+_job = None
+_job_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screener")
+
+
+def set_table(table):
+    """Temel veri tablosunu değiştirir (örn. testler için geçici dosya)."""
+    global _table
+    _table = table
+
+
+def get_table():
+    return _table
+
+
+def _number(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return np.nan
+    return value if math.isfinite(value) else np.nan
+
+
+def balance_item(balance, name, default=None):
+    """Bilançodaki kalemin en güncel (ilk dolu) değeri; kalem yoksa default."""
+    if balance is None or balance.empty or name not in balance.index:
+        return default
+    row = balance.loc[name]
+    if isinstance(row, pd.DataFrame):
+        row = row.iloc[0]
+    row = row.dropna()
+    return row.iloc[0] if len(row) else default
+
+
+def fundamental_row(ticker, balance, info, price=None):
+    """Tek sembolün temel verilerinden tablo satırı (COLUMNS)."""
+    info = info or {}
+    if price is None:
+        price = info.get('currentPrice') or info.get('regularMarketPrice')
+    return {
+        "ticker": ticker,
+        "eps": _number(info.get('trailingEps')),
+        "book_value": _number(info.get('bookValue')),
+        "equity": _number(balance_item(balance, 'Stockholders Equity')),
+        "total_debt": _number(balance_item(balance, 'Total Debt', info.get('totalDebt'))),
+        "price": _number(price),
+        "updated": time.time(),
+    }
+
+
+def _load(symbol):
+    """Sembolün fiyat geçmişinden son kapanışı ve temel verilerini tablo satırı olarak okur."""
+    from utils import data  # data modülü de bu modülü içe aktarıyor
+    df, ticker, _ = data.load_price_history(symbol)
+    if df is None:
+        return None
+    _, balance, info = data.fetch_fundamentals(ticker)
+    return fundamental_row(ticker, balance, info, price=float(df['Close'].iloc[-1]))
+
+
+def refresh(symbols, max_workers=DEFAULT_WORKERS):
+    """Sembollerin satırlarını kaynaktan yeniler ve tabloya yazar; güncellenen satır sayısını döndürür."""
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        rows = dict(zip(symbols, pool.map(_load, symbols)))
+    rows = {symbol: row for symbol, row in rows.items() if row is not None}
+    if rows:
+        _table.upsert(pd.DataFrame.from_dict(rows, orient="index", columns=COLUMNS))
+    return len(rows)
+
+
+def refresh_async(symbols):
+    """
+    Yenilemeyi arka planda başlatır; çalışan bir iş varsa yenisi açılmaz.
+    Dönüş: çalışan işin Future nesnesi.
+    """
+    global _job
+    with _job_lock:
+        if _job is None or _job.done():
+            _job = _executor.submit(refresh, list(symbols))
+        return _job
+
+
+def refreshing():
+    with _job_lock:
+        return _job is not None and not _job.done()
+
+
+def stale_symbols(symbols, max_age=FUNDAMENTALS_TTL):
+    """Tabloda olmayan ya da max_age saniyeden eski satırı olan semboller."""
+    table = _table.load()
+    if table.empty:
+        return list(symbols)
+    updated = table["updated"].reindex(list(symbols)).to_numpy(dtype=float)
+    old = ~(time.time() - updated <= max_age)  # NaN (eksik) de eski sayılır
+    return [symbol for symbol, is_old in zip(symbols, old) if is_old]
+
+
+def screen(table, symbols=None):
+    """
+    Tüm semboller için Graham değeri, potansiyel ve Borç/Özsermaye oranını tek seferde hesaplar.
+    Sonuç potansiyele göre azalan, eşitlikte borç oranına göre artan sırada döner.
+    """
+    if table is None or table.empty:
+        return pd.DataFrame()
+    if symbols is not None:
+        table = table[table.index.isin(symbols)]
+    price = table["price"].to_numpy(dtype=float)
+    eps = table["eps"].to_numpy(dtype=float)
+    book_value = table["book_value"].to_numpy(dtype=float)
+    fair = indicators.graham_values(eps, book_value)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        upside = (fair - price) / price * 100
+    result = pd.DataFrame({
+        'Fiyat': price,
+        'EPS': eps,
+        'Defter Değeri': book_value,
+        'Adil Değer': fair,
+        'Potansiyel %': upside,
+        'Borç / Özsermaye': indicators.debt_to_equity(table["total_debt"].to_numpy(dtype=float),
+                                                      table["equity"].to_numpy(dtype=float)),
+    }, index=pd.Index(table.index, name='Sembol'))
+    return result.sort_values(['Potansiyel %', 'Borç / Özsermaye'], ascending=[False, True], na_position="last")
@@ -0,0 +1,49 @@
+import numpy as np
+
+# Sinyal eşikleri (tek hisse paneli ve tarayıcı aynı kuralları kullanır)
+RSI_OVERSOLD = 30
+RSI_OVERBOUGHT = 70
+
+# Metrikler ve "Teknik Sinyaller" panelinin her zaman ihtiyaç duyduğu indikatörler (kernel.REGISTRY adları)
+INDICATORS = {'RSI', 'EMA', 'MACD'}
+
+
+def technical_signals(last_close, last_rsi, ema200, macd, macd_signal, fair_value=None):
+    """
+    "Teknik Sinyaller" panelindeki metin listesini üretir.
+    Son bar değerlerini alır, okunabilir sinyal cümleleri döndürür.
+    """
+    signals = []
+    if last_rsi < RSI_OVERSOLD: signals.append("🟢 RSI: Aşırı satım bölgesinde (Tepki Gelebilir)")
+    elif last_rsi > RSI_OVERBOUGHT: signals.append("🔴 RSI: Aşırı alım bölgesinde (Düzeltme Riski)")
+    
+    if last_close > ema200: signals.append("🟢 Trend: Uzun vadeli ortalamanın üzerinde (Pozitif)")
+    else: signals.append("🔴 Trend: Uzun vadeli ortalamanın altında (Negatif)")
+    
+    if macd > macd_signal: signals.append("🟢 MACD: Alıcılı seyir (Pozitif Kesişim)")
+    else: signals.append("🔴 MACD: Satıcılı seyir (Negatif Kesişim)")
+    
+    if fair_value and last_close < fair_value:
+        upside = ((fair_value - last_close) / last_close) * 100
+        signals.append(f"💎 Değerleme: Hisse adil değerinin altında (%{upside:.1f} potansiyel)")
+    return signals
+
+
+def signal_flags(close, rsi, ema200, macd, macd_signal, fair_value=None):
+    """
+    technical_signals ile aynı kuralların vektörel hali (sembol başına bir değer içeren diziler).
+    Dönüş: sütun adı -> dizi sözlüğü. RSI sinyali: -1 aşırı satım, 1 aşırı alım, 0 nötr.
+    """
+    close = np.asarray(close, dtype=float)
+    rsi = np.asarray(rsi, dtype=float)
+    flags = {
+        'rsi_signal': np.where(rsi < RSI_OVERSOLD, -1, np.where(rsi > RSI_OVERBOUGHT, 1, 0)),
+        'above_ema200': close > np.asarray(ema200, dtype=float),
+        'macd_positive': np.asarray(macd, dtype=float) > np.asarray(macd_signal, dtype=float),
+    }
+    if fair_value is not None:
+        fair_value = np.asarray(fair_value, dtype=float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            flags['upside'] = (fair_value - close) / close * 100
+        flags['below_fair_value'] = close < fair_value
+    return flags
@@ -0,0 +1,355 @@
+import os
+import json
+import pickle
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+# Varsayılan depo klasörü (proje kökünde .store/ohlcv). Ortam değişkeni ile değiştirilebilir.
+STORE_DIR = os.environ.get(
+    "PROTRADE_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".store", "ohlcv")
+)
+
+FUNDAMENTALS_DIR = os.environ.get(
+    "PROTRADE_FUNDAMENTALS_DIR", os.path.join(os.path.dirname(STORE_DIR), "fundamentals")
+)
+# Bilanço verileri çeyreklik değişir: varsayılan 24 saat
+FUNDAMENTALS_TTL = int(os.environ.get("PROTRADE_FUNDAMENTALS_TTL", 24 * 3600))
+# Tüm sembollerin temel verileri tek kolon-bazlı tabloda (değerleme taraması için)
+FUNDAMENTALS_TABLE = os.environ.get(
+    "PROTRADE_FUNDAMENTALS_TABLE", os.path.join(os.path.dirname(STORE_DIR), "fundamentals.parquet")
+)
+
+RESOLVER_PATH = os.environ.get(
+    "PROTRADE_RESOLVER_PATH", os.path.join(os.path.dirname(STORE_DIR), "resolver.json")
+)
+# Çözümlenen sembol kalıcıdır; bulunamayan sembol kısa süre sonra yeniden denenir
+RESOLVER_TTL = int(os.environ.get("PROTRADE_RESOLVER_TTL", 30 * 24 * 3600))
+RESOLVER_NEGATIVE_TTL = int(os.environ.get("PROTRADE_RESOLVER_NEGATIVE_TTL", 3600))
+
+# Bağlantı havuzu ve yeniden deneme ayarları
+POOL_SIZE = 16
+RETRIES = 3
+BACKOFF = 0.5
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def shared_session():
+    """
+    Süreç genelinde tek HTTP oturumu: bağlantılar (keep-alive) yeniden kullanılır,
+    geçici hatalar (429/5xx) artan beklemeyle sınırlı sayıda tekrar denenir.
+    """
+    global _session
+    # requests/urllib3 yalnızca uzak kaynağa ilk erişimde yüklenir
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            # Yahoo Finance Bot Korumasını Aşmak İçin Oturum Açıyoruz
+            session.headers.update({'User-Agent': USER_AGENT})
+            # Bağlantı kurulamıyorsa (DNS/ağ yok) tek tekrar yeterli; beklemeler yalnızca 429/5xx ve okuma hatalarında
+            retry = Retry(total=RETRIES, connect=1, backoff_factor=BACKOFF,
+                          status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET", "HEAD"))
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+class YahooSource:
+    """
+    yfinance tabanlı uzak veri kaynağı.
+    Aynı arayüzü (history / fundamentals) sağlayan her nesne kaynak olarak kullanılabilir.
+    """
+    def __init__(self, session=None):
+        self.session = session if session is not None else shared_session()
+
+    def history(self, ticker, start=None):
+        """start verilirse yalnızca o tarihten (dahil) sonraki barları döndürür."""
+        import yfinance as yf  # ilk uzak istekte yüklenir (açılışı yavaşlatmasın)
+        stock = yf.Ticker(ticker, session=self.session)
+        if start is None:
+            df = stock.history(period="max")
+        else:
+            df = stock.history(start=start.strftime("%Y-%m-%d"))
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.get_level_values(0)
+        return df
+
+    def fundamentals(self, ticker):
+        import yfinance as yf
+        stock = yf.Ticker(ticker, session=self.session)
+        return stock.financials, stock.balance_sheet, stock.info
+
+
+class LocalSource:
+    """
+    Ağ kullanmayan sahte kaynak (testler ve çevrimdışı çalışma için).
+    frames: {ticker: DataFrame}, fundamentals: {ticker: (financials, balance, info)}
+    """
+    def __init__(self, frames, fundamentals=None):
+        self.frames = frames
+        self._fundamentals = fundamentals or {}
+        self.calls = []
+
+    def history(self, ticker, start=None):
+        self.calls.append((ticker, start))
+        df = self.frames.get(ticker)
+        if df is None:
+            return pd.DataFrame()
+        if start is not None:
+            df = df[df.index >= start]
+        return df.copy()
+
+    def fundamentals(self, ticker):
+        return self._fundamentals.get(ticker, (None, None, {}))
+
+
+def _atomic_write(path, write):
+    """
+    write(tmp) ile geçici dosyaya yazar ve hedefin yerine atomik koyar (yarım yazılmış dosya okunmaz).
+    Geçici ad süreç ve iş parçacığına özgüdür: aynı dosyayı aynı anda yazanlar (tarayıcı havuzu,
+    ön ısıtma, toplu analiz süreçleri) birbirinin yarım dosyasını taşımaz. Hata olursa geçici dosya silinir.
+    """
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class OHLCVStore:
+    """
+    Hisse başına bir Parquet dosyası tutan yerel kolon-bazlı depo.
+    Dosyalar memory-map ile açılır, güncellemede yalnızca eksik barlar çekilip eklenir.
+    """
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+
+    def path(self, ticker):
+        safe = ticker.replace("/", "_").replace("^", "_")
+        return os.path.join(self.root, f"{safe}.parquet")
+
+    def load(self, ticker):
+        path = self.path(ticker)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_parquet(path, memory_map=True)
+        except Exception as e:
+            # Bozuk dosya: yok sayıp baştan indirilsin
+            print(f"Depo dosyası okunamadı ({ticker}): {e}")
+            return None
+
+    def save(self, ticker, df):
+        os.makedirs(self.root, exist_ok=True)
+        path = self.path(ticker)
+        _atomic_write(path, df.to_parquet)
+
+    @staticmethod
+    def _unchanged(stored, delta):
+        """delta'nın depodaki barlarla çakışan satırları depodakilerle aynı mı?"""
+        overlap = delta[delta.index.isin(stored.index)]
+        if len(overlap) != len(delta) or not overlap.columns.isin(stored.columns).all():
+            return False
+        old = stored.loc[overlap.index, overlap.columns]
+        return np.array_equal(old.to_numpy(dtype=float), overlap.to_numpy(dtype=float), equal_nan=True)
+
+    def update(self, ticker, source):
+        """
+        Depodaki veriyi kaynaktaki yeni barlarla günceller ve tam geçmişi döndürür.
+        Kaynak hata verirse (örn. Yahoo kısıtlaması) depodaki son veri kullanılır.
+        """
+        stored = self.load(ticker)
+        if stored is None or stored.empty:
+            df = source.history(ticker)
+            if df is None or df.empty:
+                return None
+            self.save(ticker, df)
+            return df
+
+        last = stored.index[-1]
+        try:
+            # Son bar da yeniden istenir: seans içinde kaydedilmiş yarım bar güncellenir
+            delta = source.history(ticker, start=last)
+        except Exception as e:
+            print(f"Güncelleme başarısız, depodaki veri kullanılıyor ({ticker}): {e}")
+            return stored
+
+        if delta is None or delta.empty:
+            return stored
+
+        # Yeni temettü/bölünme geldiyse geçmiş fiyatlar yeniden düzeltilmiştir, tamamını çek
+        corporate = [c for c in ("Dividends", "Stock Splits") if c in delta.columns]
+        new_bars = delta[delta.index > last]
+        if corporate and (new_bars[corporate] != 0).any().any():
+            df = source.history(ticker)
+            if df is None or df.empty:
+                return stored
+            self.save(ticker, df)
+            return df
+
+        if new_bars.empty and self._unchanged(stored, delta):
+            # Yeni bar yok, son bar da aynı: dosya yeniden yazılmaz
+            return stored
+
+        df = pd.concat([stored[stored.index < delta.index[0]], delta])
+        df = df[~df.index.duplicated(keep="last")]
+        self.save(ticker, df)
+        return df
+
+
+class FundamentalsStore:
+    """
+    Temel verileri (financials, balance_sheet, info) hisse başına diskte ve bellekte
+    uzun süreli (TTL) saklar. Fiyat geçmişinden bağımsızdır.
+    """
+    def __init__(self, root=FUNDAMENTALS_DIR, ttl=FUNDAMENTALS_TTL):
+        self.root = root
+        self.ttl = ttl
+        self._memory = {}
+        self._lock = threading.Lock()
+
+    def path(self, ticker):
+        safe = ticker.replace("/", "_").replace("^", "_")
+        return os.path.join(self.root, f"{safe}.pkl")
+
+    def load(self, ticker, max_age=None):
+        """Kayıt max_age (varsayılan ttl) saniyeden eskiyse None döner; max_age=-1 yaşa bakmaz."""
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            entry = self._memory.get(ticker)
+        if entry is None:
+            path = self.path(ticker)
+            if not os.path.exists(path):
+                return None
+            try:
+                with open(path, "rb") as f:
+                    entry = pickle.load(f)
+            except Exception as e:
+                print(f"Temel veri dosyası okunamadı ({ticker}): {e}")
+                return None
+            with self._lock:
+                self._memory[ticker] = entry
+        saved_at, data = entry
+        if max_age >= 0 and time.time() - saved_at > max_age:
+            return None
+        return data
+
+    def save(self, ticker, data):
+        """Kaydı belleğe, sonra diske yazar; disk hatası yükseltilir ama bellekteki kayıt geçerli kalır."""
+        entry = (time.time(), data)
+        with self._lock:
+            self._memory[ticker] = entry
+        os.makedirs(self.root, exist_ok=True)
+        path = self.path(ticker)
+        def write(tmp):
+            with open(tmp, "wb") as f:
+                pickle.dump(entry, f)
+        _atomic_write(path, write)
+
+
+class FundamentalsTable:
+    """
+    Sembol başına bir satır tutan tek Parquet tablosu (EPS, defter değeri, özsermaye, borç, fiyat...).
+    Arka plan işi satırları günceller; sorgular tüm evreni bellekte tek tablo olarak okur.
+    Dosya başka bir süreçte (örn. cron ile toplu analiz) değişirse bir sonraki okumada yeniden yüklenir.
+    """
+    def __init__(self, path=FUNDAMENTALS_TABLE):
+        self.path = path
+        self._frame = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Tüm tablo (dosya yoksa boş DataFrame)."""
+        mtime = os.path.getmtime(self.path) if os.path.exists(self.path) else None
+        with self._lock:
+            if self._frame is None or mtime != self._mtime:
+                frame = pd.DataFrame()
+                if mtime is not None:
+                    try:
+                        frame = pd.read_parquet(self.path)
+                    except Exception as e:
+                        print(f"Temel veri tablosu okunamadı: {e}")
+                self._frame, self._mtime = frame, mtime
+            return self._frame
+
+    def upsert(self, rows):
+        """rows (sembol indeksli DataFrame) satırlarını ekler ya da günceller."""
+        if rows is None or rows.empty:
+            return
+        with self._lock:
+            frame = pd.read_parquet(self.path) if os.path.exists(self.path) else pd.DataFrame()
+            frame = pd.concat([frame[~frame.index.isin(rows.index)], rows]) if not frame.empty else rows
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            _atomic_write(self.path, frame.sort_index().to_parquet)
+            self._frame, self._mtime = None, None
+
+
+class ResolverCache:
+    """
+    Kullanıcı girdisinden (örn. THYAO) bulunan sembole (THYAO.IS) kalıcı eşleme.
+    Bulunamayan semboller de (None) kaydedilir, ancak daha kısa süre (negative_ttl) geçerlidir.
+    """
+    def __init__(self, path=RESOLVER_PATH, ttl=RESOLVER_TTL, negative_ttl=RESOLVER_NEGATIVE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, encoding="utf-8") as f:
+                        self._entries = json.load(f)
+                except Exception as e:
+                    print(f"Sembol önbelleği okunamadı: {e}")
+        return self._entries
+
+    def get(self, symbol):
+        """(bulundu_mu, sembol) döndürür; kayıtlı bulunamayan sembol için (True, None)."""
+        with self._lock:
+            entry = self._load().get(symbol)
+        if entry is None:
+            return False, None
+        ticker, saved_at = entry
+        ttl = self.ttl if ticker is not None else self.negative_ttl
+        if time.time() - saved_at > ttl:
+            return False, None
+        return True, ticker
+
+    def put(self, symbol, ticker):
+        entry = [ticker, time.time()]
+        with self._lock:
+            entries = self._load()
+            entries[symbol] = entry
+            # Aynı dosyayı yazan başka süreçlerin (örn. toplu analiz) kayıtları kaybolmasın
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, encoding="utf-8") as f:
+                        entries.update({k: v for k, v in json.load(f).items() if k not in entries})
+                except Exception:
+                    pass
+            snapshot = dict(entries)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        def write(tmp):
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+        _atomic_write(self.path, write)
@@ -0,0 +1,298 @@
+"""
+Seans içi canlı akış: değiştirilebilir tik kaynağından (yerel websocket veya dosya) gelen
+işlemleri 1m/5m barlara toplar, indikatörleri yalnızca son bar için artımlı günceller.
+Her sembolün sürüm numarası ve değişen ilk barı tutulur; arayüz grafiğin yalnızca
+o bardan sonraki kuyruğunu yeniler.
+
+Tik biçimi (JSON satırı / websocket mesajı):
+    {"symbol": "THYAO", "time": 1718010000.5, "price": 291.25, "volume": 1200}
+"""
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from utils import perf
+from utils.engine import IndicatorEngine
+from utils.kernel import OHLCV, SWING_ORDER
+
+INTERVALS = {"1m": 60, "5m": 300}
+TIMEZONE = "Europe/Istanbul"
+# Varsayılan kaynak: "ws://host:port" veya "file:yol/tikler.jsonl"
+DEFAULT_FEED = os.environ.get("PROTRADE_LIVE_FEED", "ws://localhost:8765")
+# Akış döngüsü bu aralıkla yeni tikleri toplar (saniye)
+POLL = 0.1
+# Sembol başına saklanan sürüm geçmişi (daha eski sürümü gören arayüz tüm grafiği yeniler)
+HISTORY = 256
+
+
+def parse_tick(message):
+    """JSON metnini veya sözlüğü (sembol, zaman, fiyat, hacim) demetine çevirir; hatalıysa None."""
+    try:
+        tick = json.loads(message) if isinstance(message, (str, bytes)) else message
+        return (str(tick["symbol"]).upper(), float(tick["time"]), float(tick["price"]),
+                float(tick.get("volume", 0.0)))
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class FileFeed:
+    """
+    JSON satırlarından oluşan tik dosyasını sondan izler (tail -f). Testler ve kayıtlı
+    seansların yeniden oynatılması için websocket yerine kullanılabilir.
+    """
+    def __init__(self, path, from_start=True):
+        self.path = path
+        self.offset = 0 if from_start else (os.path.getsize(path) if os.path.exists(path) else 0)
+        self.partial = ""
+
+    def read(self, timeout=POLL):
+        """Son okumadan bu yana eklenen tikler; yoksa timeout kadar bekleyip boş liste döner."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == self.offset:
+            time.sleep(timeout)
+            return []
+        with open(self.path, encoding="utf-8") as f:
+            f.seek(self.offset)
+            text = self.partial + f.read()
+            self.offset = f.tell()
+        lines = text.split("\n")
+        self.partial = lines.pop()  # yarım yazılmış son satır bir sonraki okumaya kalır
+        return [t for t in map(parse_tick, lines) if t is not None]
+
+    def close(self):
+        pass
+
+
+class WebSocketFeed:
+    """
+    Yerel websocket yayınından JSON tikler (websockets paketi gerekir).
+    Mesajlar ayrı bir iş parçacığında okunup kuyruğa alınır; bağlantı koparsa yeniden bağlanılır.
+    """
+    def __init__(self, url, reconnect=1.0):
+        from websockets.sync.client import connect
+        self.url = url
+        self.connect = connect
+        self.reconnect = reconnect
+        self.queue = queue.Queue()
+        self.closed = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="protrade-ws", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while not self.closed.is_set():
+            try:
+                with self.connect(self.url) as ws:
+                    for message in ws:
+                        tick = parse_tick(message)
+                        if tick is not None:
+                            self.queue.put(tick)
+                        if self.closed.is_set():
+                            return
+            except Exception:
+                self.closed.wait(self.reconnect)
+
+    def read(self, timeout=POLL):
+        ticks = []
+        try:
+            ticks.append(self.queue.get(timeout=timeout))
+            while True:
+                ticks.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        return ticks
+
+    def close(self):
+        self.closed.set()
+
+
+def open_feed(spec):
+    """"file:yol" veya "ws://..." tanımından tik kaynağı oluşturur."""
+    if spec.startswith("file:"):
+        return FileFeed(spec[len("file:"):])
+    if spec.startswith(("ws://", "wss://")):
+        return WebSocketFeed(spec)
+    raise ValueError(f"Bilinmeyen akış kaynağı: {spec}")
+
+
+class BarAggregator:
+    """
+    Tikleri sabit aralıklı OHLCV barlarına toplar. Barlar önceden ayrılmış dizilerde büyür;
+    işlem olmayan aralıklar için bar üretilmez (borsa verisiyle aynı). Son bardan eski tikler
+    (geç gelen) yok sayılır.
+    """
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.n = 0
+        self.times = np.empty(0, dtype=np.int64)
+        self.ohlcv = np.empty((0, len(OHLCV)))
+        self.late = 0
+
+    def _reserve(self, total):
+        if total <= len(self.times):
+            return
+        capacity = max(total, 2 * len(self.times), 64)
+        times = np.empty(capacity, dtype=np.int64)
+        ohlcv = np.empty((capacity, len(OHLCV)))
+        times[:self.n] = self.times[:self.n]
+        ohlcv[:self.n] = self.ohlcv[:self.n]
+        self.times, self.ohlcv = times, ohlcv
+
+    def add(self, ts, price, volume):
+        """Tiki işler; değişen barın sırasını (geç tikte None) döndürür."""
+        bucket = int(ts // self.seconds) * self.seconds
+        last = self.n - 1
+        if self.n and bucket < self.times[last]:
+            self.late += 1
+            return None
+        if not self.n or bucket > self.times[last]:
+            self._reserve(self.n + 1)
+            self.times[self.n] = bucket
+            self.ohlcv[self.n] = (price, price, price, price, volume)
+            self.n += 1
+            return self.n - 1
+        bar = self.ohlcv[last]
+        bar[1] = max(bar[1], price)
+        bar[2] = min(bar[2], price)
+        bar[3] = price
+        bar[4] += volume
+        return last
+
+    def frame(self):
+        """Barlar, yerel saatle (saat dilimsiz) tarih indeksli OHLCV DataFrame olarak."""
+        index = pd.to_datetime(self.times[:self.n], unit="s", utc=True).tz_convert(TIMEZONE).tz_localize(None)
+        return pd.DataFrame(self.ohlcv[:self.n].copy(), index=index, columns=OHLCV)
+
+
+class LiveSeries:
+    """Tek sembolün canlı barları, indikatör motoru ve sürüm geçmişi."""
+    def __init__(self, symbol, seconds, names):
+        self.symbol = symbol
+        self.names = names
+        self.bars = BarAggregator(seconds)
+        self.engine = IndicatorEngine()
+        self.frame = None
+        self.version = 0
+        self.changes = deque(maxlen=HISTORY)  # (sürüm, değişen ilk bar)
+        self.dirty = None
+        self.updated = None  # son tikin geldiği an (perf_counter)
+
+    def add(self, ts, price, volume):
+        changed = self.bars.add(ts, price, volume)
+        if changed is not None:
+            self.dirty = changed if self.dirty is None else min(self.dirty, changed)
+            self.updated = time.perf_counter()
+
+    def refresh(self):
+        """Biriken değişiklikler için indikatörleri günceller; yeni sürümü kaydeder."""
+        if self.dirty is None:
+            return False
+        self.frame = self.engine.update(self.bars.frame(), self.names)
+        start = self.dirty
+        if 'SWINGS' in self.engine.names:
+            # Tepe/dip işaretleri son SWING_ORDER bar geriye kadar değişebilir
+            start = max(0, start - SWING_ORDER)
+        self.version += 1
+        self.changes.append((self.version, start))
+        self.dirty = None
+        return True
+
+    def changed_since(self, version):
+        """version sürümünden bu yana değişen ilk bar (değişiklik yoksa None, geçmiş yetmiyorsa 0)."""
+        if version >= self.version:
+            return None
+        if not self.changes or self.changes[0][0] > version + 1:
+            return 0
+        return min(start for v, start in self.changes if v > version)
+
+
+class LiveHub:
+    """
+    Tik kaynağını arka plan iş parçacığında okur: her turda biriken tüm tikler barlara işlenir,
+    değişen her sembolün indikatörleri bir kez güncellenir (onlarca sembol için tur başına tek hesap).
+    """
+    def __init__(self, feed, interval="1m", names=None, poll=POLL):
+        self.feed = feed
+        self.seconds = INTERVALS[interval]
+        self.names = names
+        self.poll = poll
+        self.series = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.latency = deque(maxlen=HISTORY)  # tikten indikatörlerin hazır olmasına kadar geçen süre (sn)
+        self.error = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="protrade-live", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        self.feed.close()
+
+    def _run(self):
+        while not self.stopped.is_set():
+            try:
+                ticks = self.feed.read(self.poll)
+                if ticks:
+                    self.process(ticks)
+            except Exception as e:
+                self.error = f"{type(e).__name__}: {e}"
+                self.stopped.wait(self.poll)
+
+    def process(self, ticks):
+        """Tikleri barlara işler ve değişen sembollerin indikatörlerini günceller."""
+        with perf.span("stream_cycle", ticks=len(ticks)) as rec:
+            dirty = {}
+            for symbol, ts, price, volume in ticks:
+                series = self.series.get(symbol)
+                if series is None:
+                    series = self.series[symbol] = LiveSeries(symbol, self.seconds, self.names)
+                series.add(ts, price, volume)
+                dirty[symbol] = series
+            rec["symbols"] = len(dirty)
+            for series in dirty.values():
+                with self.lock:
+                    changed = series.refresh()
+                if changed:
+                    self.latency.append(time.perf_counter() - series.updated)
+
+    def symbols(self):
+        return sorted(self.series)
+
+    def snapshot(self, symbol, version=0):
+        """(sürüm, indikatörlü bar tablosu, version'dan bu yana değişen ilk bar) — sembol yoksa None."""
+        with self.lock:
+            series = self.series.get(symbol)
+            if series is None or series.frame is None:
+                return None
+            return series.version, series.frame, series.changed_since(version)
+
+    def latency_ms(self):
+        """Son güncellemelerin tik→indikatör gecikmesi (p50, p95) milisaniye."""
+        if not self.latency:
+            return None
+        values = np.array(self.latency) * 1000
+        return float(np.percentile(values, 50)), float(np.percentile(values, 95))
+
+
+# Süreç genelinde kaynak/aralık başına tek akış (Streamlit her yeniden çalıştırmada yenisini açmasın)
+_hubs = {}
+_hubs_lock = threading.Lock()
+
+
+def get_hub(spec, interval="1m", names=None):
+    """spec kaynağı için çalışan akışı döndürür, yoksa başlatır."""
+    key = (spec, interval, tuple(sorted(names)) if names else None)
+    with _hubs_lock:
+        hub = _hubs.get(key)
+        if hub is None or hub.stopped.is_set():
+            hub = _hubs[key] = LiveHub(open_feed(spec), interval, names).start()
+        return hub
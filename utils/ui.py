@@ -1,7 +1,38 @@
 import streamlit as st
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from utils.indicators import calculate_regression_channel, calculate_fibonacci
+import numpy as np
+from utils.indicators import calculate_regression_channel, calculate_fibonacci, RangeStats, ROLLING_LOOKBACK, PIVOT_LEVELS
+from utils.scanner import BIST30
+from utils import downsample
+from utils.backtest import FEE
+from utils.stream import DEFAULT_FEED, INTERVALS
+from utils.correlation import BENCHMARK, WINDOW as CORRELATION_WINDOW
+
+# Katman seçeneklerinin varsayılanları (grafikte aç/kapat modunda başlangıç görünürlüğü)
+DEFAULT_OVERLAYS = {
+    "show_linreg": True,
+    "show_rolling_reg": False,
+    "show_fib": True,
+    "show_bb": True,
+    "show_ema": True,
+    "show_swings": True,
+    "show_atr": False,
+    "show_pivots": False,
+    "pro_indicator": "Yok",
+}
+
+# Pivot seçenekleri: arayüz adı -> indicators.pivot_series yöntemi / dayanak dönemi
+PIVOT_METHODS = {"Klasik": "classic", "Fibonacci": "fibonacci", "Camarilla": "camarilla"}
+PIVOT_ANCHORS = {"Günlük": "D", "Haftalık": "W", "Aylık": "M"}
+# Grafikte çizilen pivot seviyelerinin renkleri (pivot kutularıyla aynı: destek kırmızı, direnç yeşil)
+PIVOT_COLORS = {"P": "#e5e7eb", "R1": "#4ade80", "R2": "#22c55e", "R3": "#15803d",
+                "S1": "#f87171", "S2": "#ef4444", "S3": "#b91c1c"}
+
+# Korelasyon panelinde hisseyle karşılaştırılan varsayılan liste
+CORRELATION_PEERS = ["GARAN", "AKBNK", "ASELS", "KCHOL", "SISE", "TUPRS"]
+
+# Canlı grafikte tutulan son bar sayısı (1m barlarla yaklaşık bir seans) ve yenileme aralığı (sn)
+LIVE_WINDOW = 390
+LIVE_REFRESH = 1.0
 
 def load_custom_css():
     """Özel CSS stillerini yükler."""
@@ -81,21 +112,265 @@ def load_custom_css():
 def render_sidebar():
     """Yan paneli oluşturur ve kullanıcı seçeneklerini döndürür."""
     st.sidebar.title("🛠️ Kontrol Paneli")
+    mode = st.sidebar.radio("Mod:", ["Tek Hisse", "Tarayıcı", "Canlı"], horizontal=True)
     
     st.sidebar.subheader("Görünüm Ayarları")
+    client_toggle = st.sidebar.checkbox(
+        "Katmanları Grafikte Aç/Kapat", value=False,
+        help="Tüm katmanlar bir kez çizilir; grafik açıklamasına tıklayarak sayfa yenilenmeden gizlenip gösterilir."
+    )
+    if client_toggle:
+        overlays = dict(DEFAULT_OVERLAYS)
+    else:
+        overlays = {
+            "show_linreg": st.sidebar.checkbox("Regresyon Kanalı", value=True),
+            "show_rolling_reg": st.sidebar.checkbox("Kayan Regresyon Kanalı", value=False, help=f"Her barda son {ROLLING_LOOKBACK} barın regresyon kanalı."),
+            "show_fib": st.sidebar.checkbox("Fibonacci Seviyeleri", value=True),
+            "show_bb": st.sidebar.checkbox("Bollinger Bantları", value=True),
+            "show_ema": st.sidebar.checkbox("EMA (Hareketli Ort.)", value=True),
+            "show_swings": st.sidebar.checkbox("Tepe/Dip Noktaları", value=True),
+            "show_atr": st.sidebar.checkbox("ATR Stop", value=False),
+            "show_pivots": st.sidebar.checkbox("Pivot Seviyeleri", value=False, help="Her barda bir önceki günün/haftanın/ayın pivot seviyeleri (basamak çizgisi)."),
+            "pro_indicator": st.sidebar.selectbox("Trend Göstergesi:", ["Yok", "Parabolic SAR", "SuperTrend"]),
+        }
     options = {
-        "show_linreg": st.sidebar.checkbox("Regresyon Kanalı", value=True),
-        "show_fib": st.sidebar.checkbox("Fibonacci Seviyeleri", value=True),
-        "show_bb": st.sidebar.checkbox("Bollinger Bantları", value=True),
-        "show_ema": st.sidebar.checkbox("EMA (Hareketli Ort.)", value=True),
-        "show_swings": st.sidebar.checkbox("Tepe/Dip Noktaları", value=True),
-        "show_atr": st.sidebar.checkbox("ATR Stop", value=False),
-        "pro_indicator": st.sidebar.selectbox("Trend Göstergesi:", ["Yok", "Parabolic SAR", "SuperTrend"]),
-        "oscillator_mode": st.sidebar.selectbox("Momentum:", ["RSI (Klasik)", "Stoch RSI (Hassas)"])
+        "mode": mode,
+        "client_toggle": client_toggle,
+        **overlays,
+        "pivot_method": st.sidebar.selectbox("Pivot Yöntemi:", list(PIVOT_METHODS)),
+        "pivot_anchor": st.sidebar.selectbox("Pivot Dönemi:", list(PIVOT_ANCHORS)),
+        "adaptive": st.sidebar.checkbox("Hızlı Çizim (Uzun Periyot)", value=True, help="Uzun periyotlarda mumları haftalık/aylık birleştirir ve çizgileri seyreltir."),
+        "oscillator_mode": st.sidebar.selectbox("Momentum:", ["RSI (Klasik)", "Stoch RSI (Hassas)"]),
+        "show_correlation": st.sidebar.checkbox("🔗 Korelasyon Paneli", value=False, help=f"{BENCHMARK} endeksine göre beta, korelasyon, göreli güç ve liste korelasyon matrisi."),
+        "debug_perf": st.sidebar.checkbox("⏱️ Performans Paneli", value=False, help="Sayfa yüklemesinin aşama sürelerini gösterir."),
     }
     
     return options
 
+def chart_config(options):
+    """
+    Grafiği etkileyen seçenekler (grafik önbelleği anahtarı için).
+    Katmanlar grafikte açılıp kapanıyorsa görünürlükleri anahtara girmez.
+    """
+    skip = {"mode", "debug_perf", "show_correlation"} | (set(DEFAULT_OVERLAYS) if options["client_toggle"] else set())
+    return tuple(sorted((k, v) for k, v in options.items() if k not in skip))
+
+def render_cache_stats(stats):
+    """Önbellek katmanlarının isabet/ıskalama sayaçlarını yan panelde gösterir."""
+    with st.sidebar.expander("🗄️ Önbellek", expanded=False):
+        for layer, counts in stats.items():
+            total = counts["hits"] + counts["misses"]
+            ratio = counts["hits"] / total * 100 if total else 0
+            st.caption(f"**{layer}**: {counts['hits']} isabet / {counts['misses']} ıskalama "
+                       f"(%{ratio:.0f}), {counts['size']} kayıt, {counts['bytes'] / 2**20:.1f} MB")
+
+def render_perf_panel(trace, summary):
+    """Son sayfa çalıştırmasının aşama sürelerini ve süreç geneli p50/p95 değerlerini yan panelde gösterir."""
+    with st.sidebar.expander("⏱️ Performans", expanded=True):
+        st.caption(f"Toplam: **{trace.total_ms:.0f} ms**")
+        lines = []
+        for rec in sorted(trace.spans, key=lambda r: r.get("at_ms", 0)):
+            cache = f" ({rec['cache']})" if "cache" in rec else ""
+            lines.append(f"{'  ' * rec['depth']}{rec['stage']}: {rec['ms']:.1f} ms{cache}")
+        st.code("\n".join(lines) or "-", language=None)
+        st.caption("Tüm oturumlar (son ölçümler):")
+        st.code("\n".join(
+            f"{stage}: p50 {row['p50_ms']:.1f} / p95 {row['p95_ms']:.1f} ms, {row['count']} kez"
+            + (f", {row['hit']} isabet / {row['miss']} ıskalama" if row['hit'] or row['miss'] else "")
+            for stage, row in sorted(summary.items())
+        ), language=None)
+
+def required_indicators(options):
+    """Grafiğin seçili seçeneklerle ihtiyaç duyduğu indikatörleri (kernel.REGISTRY adları) döndürür."""
+    names = {'VOL_EMA', 'MACD'}
+    names.add('RSI' if options["oscillator_mode"] == "RSI (Klasik)" else 'STOCHRSI')
+    if options["client_toggle"]:
+        # Tüm katmanlar bir kez çizilir, görünürlük tarayıcıda değişir
+        return names | {'BBANDS', 'EMA', 'SWINGS', 'TRAILING_STOP', 'PSAR', 'SUPERTREND'}
+    if options["show_bb"]: names.add('BBANDS')
+    if options["show_ema"]: names.add('EMA')
+    if options["show_swings"]: names.add('SWINGS')
+    if options["show_atr"]: names.add('TRAILING_STOP')
+    if options["pro_indicator"] == "Parabolic SAR": names.add('PSAR')
+    elif options["pro_indicator"] == "SuperTrend": names.add('SUPERTREND')
+    return names
+
+def render_scanner_input():
+    """İzleme listesi girişini gösterir; (sembol listesi, Tara butonuna basıldı mı) döndürür."""
+    st.subheader("🔎 İzleme Listesi Tarayıcı")
+    text = st.text_area("Semboller (virgül veya satır ile ayırın)", ", ".join(BIST30), height=100)
+    scan = st.button("Tara", type="primary")
+    symbols = [s.strip().upper() for s in text.replace("\n", ",").split(",")]
+    return list(dict.fromkeys(s for s in symbols if s)), scan
+
+def render_scanner_table(table):
+    """Tarama sonuçlarını sıralanabilir tablo olarak gösterir."""
+    if table is None or table.empty:
+        st.warning("Listedeki hisseler için veri alınamadı.")
+        return
+    st.caption(f"{len(table)} hisse tarandı. Sütun başlığına tıklayarak sıralayabilirsiniz.")
+    st.dataframe(
+        table.style.format({c: "{:.2f}" for c in table.select_dtypes("number").columns}, na_rep="-"),
+        use_container_width=True,
+        height=min(35 * (len(table) + 1) + 3, 800),
+    )
+
+def render_valuation_table(table, pending, refreshing):
+    """Graham potansiyeli ve Borç/Özsermaye sıralamasını (screener.screen) gösterir."""
+    if pending:
+        state = "arka planda güncelleniyor" if refreshing else "güncellenecek"
+        st.caption(f"{len(pending)} hissenin temel verisi eksik veya eski, {state}.")
+    if table is None or table.empty:
+        st.info("Temel veri tablosu henüz boş; güncelleme bitince sayfayı yenileyin.")
+        return
+    st.caption(f"{len(table)} hisse potansiyele göre sıralandı (eşitlikte düşük borç önde).")
+    st.dataframe(
+        table.style.format({c: "{:.2f}" for c in table.select_dtypes("number").columns}, na_rep="-"),
+        use_container_width=True,
+        height=min(35 * (len(table) + 1) + 3, 800),
+    )
+
+def render_backtest(results):
+    """Sinyal kurallarının geçmiş performans tablosunu (backtest.evaluate_signals) gösterir."""
+    with st.expander("📜 Kuralların Geçmiş Performansı", expanded=False):
+        table = results[['total_return', 'cagr', 'max_drawdown', 'hit_rate', 'trades', 'exposure']].rename(columns={
+            'total_return': "Toplam Getiri", 'cagr': "Yıllık Getiri", 'max_drawdown': "Maks. Düşüş",
+            'hit_rate': "Başarı Oranı", 'trades': "İşlem", 'exposure': "Piyasada Kalma",
+        })
+        pct = ["Toplam Getiri", "Yıllık Getiri", "Maks. Düşüş", "Başarı Oranı", "Piyasada Kalma"]
+        st.dataframe(table.style.format({c: "{:.1%}" for c in pct} | {"İşlem": "{:.0f}"}, na_rep="-"),
+                     use_container_width=True)
+        st.caption(f"Al-tut getirisi: %{results['buy_hold'].iloc[0] * 100:.1f} — sinyal bar kapanışında, "
+                   f"işlem ertesi bardan itibaren; işlem başına %{FEE * 100:.1f} maliyet varsayılmıştır.")
+
+def render_pivot_respect(table, method, anchor):
+    """Pivot seviyelerine saygı oranlarını (backtest.pivot_respect) gösterir."""
+    with st.expander(f"🗝️ Pivot Seviyelerine Saygı ({method}, {anchor})", expanded=False):
+        shown = table.rename(columns={'touches': "Temas", 'held': "Tuttu", 'rate': "Oran"})
+        st.dataframe(shown.style.format({"Temas": "{:.0f}", "Tuttu": "{:.0f}", "Oran": "{:.1%}"}, na_rep="-"),
+                     use_container_width=True)
+        st.caption("Destek: gün içi dip seviyeye değip kapanış üzerinde kaldıysa tuttu sayılır; direnç: tepe değip kapanış altında kaldıysa.")
+
+def render_live_input():
+    """Canlı akış kaynağı, bar aralığı ve sembol girişleri."""
+    st.subheader("📡 Canlı Akış")
+    col1, col2, col3 = st.columns([2, 1, 1])
+    spec = col1.text_input("Akış Kaynağı", DEFAULT_FEED, help="ws://sunucu:port veya file:tikler.jsonl")
+    interval = col2.selectbox("Bar Aralığı", list(INTERVALS))
+    symbol = col3.text_input("Hisse Sembolü", "THYAO").strip().upper()
+    return spec, interval, symbol
+
+def _live_column(df, column):
+    if column == "Hacim Rengi":
+        return np.where(df['Open'].to_numpy() < df['Close'].to_numpy(), '#00e676', '#ff1744')
+    return df[column].to_numpy()
+
+def build_live_chart(df, options):
+    """
+    Canlı grafik: son LIVE_WINDOW bar (mum, seçili EMA/Bollinger/SuperTrend, hacim, momentum).
+    Her iz, güncellenecek özelliklerini hangi sütundan aldığını meta alanında taşır (patch_live_chart için).
+    """
+    # plotly yalnızca grafik çizilirken yüklenir (açılışta yan panel ve başlık beklemesin)
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    window = df.iloc[-LIVE_WINDOW:]
+    fig = make_subplots(rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.03, row_heights=[0.6, 0.15, 0.25])
+
+    def add(trace, columns, row):
+        trace.x = window.index.to_numpy()
+        trace.meta = columns
+        for key, column in columns.items():
+            trace[key] = _live_column(window, column)
+        fig.add_trace(trace, row=row, col=1)
+
+    add(go.Candlestick(name="Fiyat"), {"open": "Open", "high": "High", "low": "Low", "close": "Close"}, 1)
+    if options["show_bb"] and 'BB_Upper' in df.columns:
+        add(go.Scatter(line=dict(width=0), hoverinfo='skip', name="BB Üst"), {"y": "BB_Upper"}, 1)
+        add(go.Scatter(fill='tonexty', fillcolor='rgba(0,255,100,0.05)', line=dict(width=0), hoverinfo='skip', name="Bollinger"), {"y": "BB_Lower"}, 1)
+    if options["show_ema"] and 'EMA20' in df.columns:
+        add(go.Scatter(line=dict(color='#fbbf24', width=1), name="EMA 20"), {"y": "EMA20"}, 1)
+        add(go.Scatter(line=dict(color='#22d3ee', width=1), name="EMA 50"), {"y": "EMA50"}, 1)
+    if options["pro_indicator"] == "SuperTrend" and 'SUPERT_7_3.0' in df.columns:
+        add(go.Scatter(line=dict(color='white', width=2), name="SuperTrend"), {"y": "SUPERT_7_3.0"}, 1)
+    add(go.Bar(name="Hacim"), {"y": "Volume", "marker.color": "Hacim Rengi"}, 2)
+    if options["oscillator_mode"] == "RSI (Klasik)":
+        add(go.Scatter(line=dict(color='#a855f7', width=2), name="RSI"), {"y": "RSI"}, 3)
+        levels = (30, 70)
+    else:
+        add(go.Scatter(line=dict(color='#22d3ee', width=1.5), name="Stoch K"), {"y": "STOCHRSIk_14_14_3_3"}, 3)
+        add(go.Scatter(line=dict(color='#fbbf24', width=1.5), name="Stoch D"), {"y": "STOCHRSId_14_14_3_3"}, 3)
+        levels = (20, 80)
+    fig.add_hline(y=levels[0], line_dash="dot", line_color="#22c55e", row=3, col=1)
+    fig.add_hline(y=levels[1], line_dash="dot", line_color="#ef4444", row=3, col=1)
+
+    fig.update_layout(
+        height=800,
+        template="plotly_dark",
+        xaxis_rangeslider_visible=False,
+        margin=dict(l=10, r=10, t=30, b=10),
+        hovermode="x unified",
+        showlegend=False,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        uirevision="live",  # yenilemelerde yakınlaştırma korunur
+        meta={"first": len(df) - len(window)},
+    )
+    return fig
+
+def patch_live_chart(fig, df, start):
+    """
+    Canlı grafiğin izlerinde yalnızca start barından sonraki kuyruğu yeniler, pencere kayarsa
+    baştaki barları atar. Grafik bu tablo için kullanılamıyorsa (geçmiş kısalmış) False döner.
+    """
+    if start is None:
+        return True
+    old = fig.layout.meta["first"]
+    first = max(0, len(df) - LIVE_WINDOW)
+    drop, keep = first - old, start - old
+    if drop < 0 or keep < 0:
+        return False
+    tail = df.iloc[max(start, first):]
+    x = tail.index.to_numpy()
+    with fig.batch_update():
+        for trace in fig.data:
+            trace.x = np.concatenate([trace.x[drop:keep], x])
+            for key, column in trace.meta.items():
+                trace[key] = np.concatenate([np.asarray(trace[key])[drop:keep], _live_column(tail, column)])
+        fig.layout.meta = {"first": first}
+    return True
+
+@st.fragment(run_every=LIVE_REFRESH)
+def render_live(hub, symbol, options):
+    """
+    Canlı paneli her LIVE_REFRESH saniyede yalnızca kendisi yeniden çalışır (sayfanın geri kalanı değil).
+    Grafik oturumda saklanır; yeni sürümde yalnızca değişen kuyruk güncellenir.
+    """
+    if hub.error:
+        st.warning(f"Akış hatası: {hub.error}")
+    key = (id(hub), symbol, chart_config(options))
+    state = st.session_state.get("live")
+    seen = state["version"] if state is not None and state["key"] == key else 0
+    snapshot = hub.snapshot(symbol, seen)
+    if snapshot is None:
+        st.info(f"{symbol} için henüz işlem gelmedi. Akıştaki semboller: {', '.join(hub.symbols()) or '-'}")
+        return
+    version, df, start = snapshot
+    if seen and patch_live_chart(state["fig"], df, start):
+        fig = state["fig"]
+    else:
+        fig = build_live_chart(df, options)
+    st.session_state["live"] = {"key": key, "version": version, "fig": fig}
+
+    last = df.iloc[-1]
+    session_open = df['Open'][df.index.normalize() == df.index[-1].normalize()].iloc[0]
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Son Fiyat", f"{last['Close']:.2f}", f"{(last['Close'] / session_open - 1) * 100:.2f}%")
+    m2.metric("RSI (14)", f"{last['RSI']:.2f}" if 'RSI' in df.columns else "-")
+    latency = hub.latency_ms()
+    m3.metric("Gecikme (p50 / p95)", f"{latency[0]:.0f} / {latency[1]:.0f} ms" if latency else "-")
+    st.plotly_chart(fig, use_container_width=True, key="live_chart")
+    st.caption(f"{len(df)} bar • {df.index[-1]:%H:%M} • akışta {len(hub.symbols())} sembol")
+
 def render_pivot_points(pivot, r1, s1, r2, s2):
     """Pivot noktalarını görsel olarak şık bir şekilde gösterir."""
     st.markdown("##### 🗝️ Pivot Seviyeleri (Destek / Direnç)")
@@ -127,13 +402,40 @@ def render_pivot_points(pivot, r1, s1, r2, s2):
     """
     st.markdown(html, unsafe_allow_html=True)
 
-def render_chart(df, options):
-    """Ana analiz grafiğini çizer."""
-    if df is None or df.empty:
-        st.warning("Grafik çizilemiyor, veri yok.")
-        return
+def _steps(index, values):
+    """Basamak serisinin yalnızca değiştiği noktaları (son bar dahil); line_shape='hv' ile çizilir."""
+    values = np.asarray(values, dtype=float)
+    keep = np.r_[True, (values[1:] != values[:-1]) & ~(np.isnan(values[1:]) & np.isnan(values[:-1]))]
+    keep[-1] = True
+    return index[keep], values[keep]
 
+def build_chart(df, options, stats=None, pivots=None):
+    """
+    Ana analiz grafiğini (plotly Figure) oluşturur.
+    Hızlı çizim modunda uzun periyotlarda mumlar haftalık/aylık birleştirilir, çizgiler seyreltilir
+    ve yoğun seriler WebGL ile çizilir; indikatörler yine tam çözünürlükte hesaplanmış veriden gelir.
+    stats: tüm geçmiş için RangeStats (df onun son len(df) barıdır); verilirse regresyon kanalı ve
+    Fibonacci aralığı yeniden taranmadan önek toplamlarından okunur.
+    pivots: df ile aynı indeksli pivot seviyeleri (indicators.pivot_series); verilirse basamak çizgisi olarak çizilir.
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
     oscillator_mode = options["oscillator_mode"]
+    budget = downsample.PIXEL_BUDGET if options["adaptive"] else None
+    bars = downsample.resample_ohlcv(df, downsample.choose_rule(len(df), budget))
+    Scatter = go.Scattergl if budget is not None and len(df) > downsample.GL_THRESHOLD else go.Scatter
+
+    def line(values, **kwargs):
+        x, y = downsample.line_points(df.index, values, budget)
+        return Scatter(x=x, y=y, **kwargs)
+
+    # Grafikte aç/kapat modunda tüm katmanlar çizilir, kapalı olanlar yalnızca açıklamada durur
+    client = options["client_toggle"]
+    def overlay(group, enabled):
+        """Katman çizilecekse trace'e eklenecek parametreleri, çizilmeyecekse None döndürür."""
+        if not client:
+            return {} if enabled else None
+        return dict(legendgroup=group, visible=True if enabled else 'legendonly')
     
     # Alt grafik düzeni
     rows = [0.55, 0.15, 0.15, 0.15]
@@ -147,84 +449,119 @@ def render_chart(df, options):
     
     # --- 1. PANEL: Fiyat ---
     fig.add_trace(go.Candlestick(
-        x=df.index, open=df['Open'], high=df['High'], low=df['Low'], close=df['Close'], 
+        x=bars.index, open=bars['Open'], high=bars['High'], low=bars['Low'], close=bars['Close'], 
         name="Fiyat"
     ), row=1, col=1)
     
     # Bollinger
-    if options["show_bb"]:
-        fig.add_trace(go.Scatter(x=df.index, y=df['BB_Upper'], line=dict(width=0), showlegend=False, hoverinfo='skip'), row=1, col=1)
-        fig.add_trace(go.Scatter(x=df.index, y=df['BB_Lower'], fill='tonexty', fillcolor='rgba(0,255,100,0.05)', line=dict(width=0), name="Bollinger", hoverinfo='skip'), row=1, col=1)
+    bb = overlay("Bollinger", options["show_bb"])
+    if bb is not None:
+        fig.add_trace(line(df['BB_Upper'], line=dict(width=0), showlegend=False, hoverinfo='skip', **bb), row=1, col=1)
+        fig.add_trace(line(df['BB_Lower'], fill='tonexty', fillcolor='rgba(0,255,100,0.05)', line=dict(width=0), name="Bollinger", hoverinfo='skip', **bb), row=1, col=1)
     
     # EMA
-    if options["show_ema"]:
-        fig.add_trace(go.Scatter(x=df.index, y=df['EMA20'], line=dict(color='#fbbf24', width=1), name="EMA 20"), row=1, col=1)
-        fig.add_trace(go.Scatter(x=df.index, y=df['EMA50'], line=dict(color='#22d3ee', width=1), name="EMA 50"), row=1, col=1)
-        fig.add_trace(go.Scatter(x=df.index, y=df['EMA200'], line=dict(color='#a855f7', width=1.5, dash='dot'), name="EMA 200"), row=1, col=1)
+    ema = overlay("EMA", options["show_ema"])
+    if ema is not None:
+        fig.add_trace(line(df['EMA20'], line=dict(color='#fbbf24', width=1), name="EMA 20", **ema), row=1, col=1)
+        fig.add_trace(line(df['EMA50'], line=dict(color='#22d3ee', width=1), name="EMA 50", **ema), row=1, col=1)
+        fig.add_trace(line(df['EMA200'], line=dict(color='#a855f7', width=1.5, dash='dot'), name="EMA 200", **ema), row=1, col=1)
     
     # Regresyon Kanalı
-    if options["show_linreg"]:
-        reg_line, upper_ch, lower_ch = calculate_regression_channel(df)
+    linreg = overlay("Regresyon Kanalı", options["show_linreg"])
+    if linreg is not None:
+        if stats is not None:
+            reg_line, upper_ch, lower_ch = stats.channel(stats.n - len(df), stats.n)
+        else:
+            reg_line, upper_ch, lower_ch = calculate_regression_channel(df)
         if reg_line is not None:
-            fig.add_trace(go.Scatter(x=df.index, y=upper_ch, line=dict(color='yellow', width=0), showlegend=False, hoverinfo='skip'), row=1, col=1)
-            fig.add_trace(go.Scatter(x=df.index, y=lower_ch, fill='tonexty', fillcolor='rgba(255, 255, 0, 0.08)', line=dict(color='yellow', width=0), name="Regresyon Kanalı", hoverinfo='skip'), row=1, col=1)
-            fig.add_trace(go.Scatter(x=df.index, y=reg_line, line=dict(color='yellow', width=1, dash='dash'), name="Regresyon Hattı"), row=1, col=1)
+            fig.add_trace(line(upper_ch, line=dict(color='yellow', width=0), showlegend=False, hoverinfo='skip', **linreg), row=1, col=1)
+            fig.add_trace(line(lower_ch, fill='tonexty', fillcolor='rgba(255, 255, 0, 0.08)', line=dict(color='yellow', width=0), name="Regresyon Kanalı", hoverinfo='skip', **linreg), row=1, col=1)
+            fig.add_trace(line(reg_line, line=dict(color='yellow', width=1, dash='dash'), name="Regresyon Hattı", **linreg), row=1, col=1)
+
+    # Kayan Regresyon Kanalı (her barda son ROLLING_LOOKBACK barın kanalı; pencere görünümden önceki barları da kapsar)
+    rolling = overlay("Kayan Regresyon", options["show_rolling_reg"])
+    if rolling is not None:
+        mid, upper, lower = (stats if stats is not None else RangeStats(df)).rolling_channel()[:, -len(df):]
+        fig.add_trace(line(upper, line=dict(color='#f472b6', width=1, dash='dot'), showlegend=False, hoverinfo='skip', **rolling), row=1, col=1)
+        fig.add_trace(line(lower, line=dict(color='#f472b6', width=1, dash='dot'), name="Kayan Regresyon", hoverinfo='skip', **rolling), row=1, col=1)
+        fig.add_trace(line(mid, line=dict(color='#f472b6', width=1), showlegend=False, **rolling), row=1, col=1)
 
     # Fibonacci
-    if options["show_fib"]:
-        fib_levels = calculate_fibonacci(df)
+    fib = overlay("Fibonacci", options["show_fib"])
+    if fib is not None:
+        fib_levels = stats.fibonacci(stats.n - len(df), stats.n) if stats is not None else calculate_fibonacci(df)
         colors = {0.236: 'gray', 0.382: 'gray', 0.5: 'orange', 0.618: '#00e676', 0.786: 'red'} 
         for level, price in fib_levels.items():
             color = colors.get(level, 'white')
-            fig.add_hline(y=price, line_dash="dot", annotation_text=f"Fib {level}", annotation_position="top right", line_color=color, line_width=1, row=1, col=1)
+            if client:
+                # Yatay çizgiler (shape) açıklamadan gizlenemez, bu modda iki noktalı çizgi olarak çizilir
+                fig.add_trace(go.Scatter(x=[df.index[0], df.index[-1]], y=[price, price], mode='lines+text', text=["", f"Fib {level}"],
+                                         textposition="top left", line=dict(color=color, width=1, dash='dot'), name=f"Fib {level}", **fib), row=1, col=1)
+            else:
+                fig.add_hline(y=price, line_dash="dot", annotation_text=f"Fib {level}", annotation_position="top right", line_color=color, line_width=1, row=1, col=1)
             
-    # Swings (Tepe/Dip)
-    if options["show_swings"]:
+    # Pivot seviyeleri (dönem boyunca sabit: yalnızca değişim noktaları çizilir; günlük pivot uzun
+    # periyotta bütçeyi aşarsa diğer çizgiler gibi seyreltilir)
+    pivot = overlay("Pivot", options["show_pivots"])
+    if pivot is not None and pivots is not None and len(pivots):
+        for name in PIVOT_LEVELS:
+            x, y = _steps(pivots.index, pivots[name])
+            if budget is not None and len(x) > budget:
+                x, y = downsample.line_points(pivots.index, pivots[name], budget)
+            fig.add_trace(Scatter(x=x, y=y, mode='lines', line_shape='hv', line=dict(color=PIVOT_COLORS[name], width=1, dash='dash' if name == "P" else 'dot'),
+                                     name=f"Pivot {name}", **pivot), row=1, col=1)
+
+    # Swings (Tepe/Dip) - seyrek noktalar, seyreltilmez
+    swings = overlay("Tepe/Dip", options["show_swings"])
+    if swings is not None:
         dipler = df[df['min'].notnull()]
         tepeler = df[df['max'].notnull()]
-        fig.add_trace(go.Scatter(x=dipler.index, y=dipler['min']*0.99, mode='markers', marker=dict(symbol='triangle-up', color='#00e676', size=8), name="Dip"), row=1, col=1)
-        fig.add_trace(go.Scatter(x=tepeler.index, y=tepeler['max']*1.01, mode='markers', marker=dict(symbol='triangle-down', color='#ff1744', size=8), name="Tepe"), row=1, col=1)
+        fig.add_trace(go.Scatter(x=dipler.index, y=dipler['min']*0.99, mode='markers', marker=dict(symbol='triangle-up', color='#00e676', size=8), name="Dip", **swings), row=1, col=1)
+        fig.add_trace(go.Scatter(x=tepeler.index, y=tepeler['max']*1.01, mode='markers', marker=dict(symbol='triangle-down', color='#ff1744', size=8), name="Tepe", **swings), row=1, col=1)
 
-    # ATR Stop
-    if options["show_atr"]:
-        fig.add_trace(go.Scatter(x=df.index, y=df['Trailing_Stop'], mode='markers', marker=dict(color='red', size=4), name="ATR Stop"), row=1, col=1)
+    # ATR Stop (birleştirilmiş mumlarla aynı noktalarda)
+    atr = overlay("ATR Stop", options["show_atr"])
+    if atr is not None:
+        fig.add_trace(Scatter(x=bars.index, y=bars['Trailing_Stop'], mode='markers', marker=dict(color='red', size=4), name="ATR Stop", **atr), row=1, col=1)
 
     # SuperTrend / PSAR
-    if options["pro_indicator"] == "Parabolic SAR":
-        psar_cols = [c for c in df.columns if c.startswith('PSAR')]
+    psar = overlay("Parabolic SAR", options["pro_indicator"] == "Parabolic SAR")
+    if psar is not None:
+        psar_cols = [c for c in bars.columns if c.startswith('PSAR')]
         for c in psar_cols:
-            valid_psar = df[c].dropna()
+            valid_psar = bars[c].dropna()
             if not valid_psar.empty:
-                fig.add_trace(go.Scatter(x=valid_psar.index, y=valid_psar, mode='markers', marker=dict(color='#2962FF', size=4), name="Parabolic SAR"), row=1, col=1)
-    elif options["pro_indicator"] == "SuperTrend":
+                fig.add_trace(Scatter(x=valid_psar.index, y=valid_psar, mode='markers', marker=dict(color='#2962FF', size=4), name="Parabolic SAR", **psar), row=1, col=1)
+    supertrend = overlay("SuperTrend", options["pro_indicator"] == "SuperTrend")
+    if supertrend is not None:
         st_cols = [c for c in df.columns if c.startswith('SUPERT')]
         if st_cols:
-            fig.add_trace(go.Scatter(x=df.index, y=df[st_cols[0]], line=dict(color='white', width=2), name="SuperTrend"), row=1, col=1)
+            fig.add_trace(line(df[st_cols[0]], line=dict(color='white', width=2), name="SuperTrend", **supertrend), row=1, col=1)
 
     # --- 2. PANEL: Hacim ---
-    colors = ['#00e676' if o-c < 0 else '#ff1744' for o, c in zip(df['Open'], df['Close'])]
-    fig.add_trace(go.Bar(x=df.index, y=df['Volume'], marker_color=colors, name="Hacim"), row=2, col=1)
+    colors = np.where(bars['Open'].to_numpy() < bars['Close'].to_numpy(), '#00e676', '#ff1744')
+    fig.add_trace(go.Bar(x=bars.index, y=bars['Volume'], marker_color=colors, name="Hacim"), row=2, col=1)
     if 'Vol_EMA' in df.columns:
-        fig.add_trace(go.Scatter(x=df.index, y=df['Vol_EMA'], line=dict(color='white', width=1), name="Hacim Ort."), row=2, col=1)
+        fig.add_trace(line(df['Vol_EMA'], line=dict(color='white', width=1), name="Hacim Ort."), row=2, col=1)
 
     # --- 3. PANEL: Momentum ---
     if oscillator_mode == "RSI (Klasik)":
-        fig.add_trace(go.Scatter(x=df.index, y=df['RSI'], line=dict(color='#a855f7', width=2), name="RSI"), row=3, col=1)
+        fig.add_trace(line(df['RSI'], line=dict(color='#a855f7', width=2), name="RSI"), row=3, col=1)
         fig.add_hline(y=70, line_dash="dot", line_color="#ef4444", row=3, col=1)
         fig.add_hline(y=30, line_dash="dot", line_color="#22c55e", row=3, col=1)
     else: # Stoch RSI
         k_col = next((c for c in df.columns if c.startswith('STOCHRSIk')), None)
         d_col = next((c for c in df.columns if c.startswith('STOCHRSId')), None)
         if k_col and d_col:
-            fig.add_trace(go.Scatter(x=df.index, y=df[k_col], line=dict(color='#22d3ee', width=1.5), name="Stoch K"), row=3, col=1)
-            fig.add_trace(go.Scatter(x=df.index, y=df[d_col], line=dict(color='#fbbf24', width=1.5), name="Stoch D"), row=3, col=1)
+            fig.add_trace(line(df[k_col], line=dict(color='#22d3ee', width=1.5), name="Stoch K"), row=3, col=1)
+            fig.add_trace(line(df[d_col], line=dict(color='#fbbf24', width=1.5), name="Stoch D"), row=3, col=1)
             fig.add_hline(y=80, line_dash="dot", line_color="#ef4444", row=3, col=1)
             fig.add_hline(y=20, line_dash="dot", line_color="#22c55e", row=3, col=1)
 
     # --- 4. PANEL: MACD ---
-    fig.add_trace(go.Bar(x=df.index, y=df['MACD_Hist'], marker_color='gray', name="Hist"), row=4, col=1)
-    fig.add_trace(go.Scatter(x=df.index, y=df['MACD'], line=dict(color='#3b82f6', width=1.5), name="MACD"), row=4, col=1)
-    fig.add_trace(go.Scatter(x=df.index, y=df['MACD_Signal'], line=dict(color='#f97316', width=1.5), name="Signal"), row=4, col=1)
+    fig.add_trace(go.Bar(x=bars.index, y=bars['MACD_Hist'], marker_color='gray', name="Hist"), row=4, col=1)
+    fig.add_trace(line(df['MACD'], line=dict(color='#3b82f6', width=1.5), name="MACD"), row=4, col=1)
+    fig.add_trace(line(df['MACD_Signal'], line=dict(color='#f97316', width=1.5), name="Signal"), row=4, col=1)
 
     # Layout Ayarları
     fig.update_layout(
@@ -237,8 +574,65 @@ def render_chart(df, options):
         paper_bgcolor='rgba(0,0,0,0)', # Transparan arka plan
         plot_bgcolor='rgba(0,0,0,0)'
     )
+    if client:
+        # Açıklamada katman grubu başına tek giriş: tıklamak grubun tamamını gizler/gösterir
+        seen = set()
+        for trace in fig.data:
+            group = trace.legendgroup
+            trace.showlegend = bool(group) and group not in seen
+            if trace.showlegend:
+                trace.name = group
+                seen.add(group)
+        fig.update_layout(showlegend=True, legend=dict(orientation="h", y=1.02, x=0, groupclick="togglegroup"))
+    return fig
+
+def render_chart(df, options, fig=None):
+    """Ana analiz grafiğini çizer. fig verilirse (örn. önbellekten) yeniden oluşturulmaz."""
+    if df is None or df.empty:
+        st.warning("Grafik çizilemiyor, veri yok.")
+        return
     
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig if fig is not None else build_chart(df, options), use_container_width=True)
+
+def render_correlation_input(symbol):
+    """Korelasyon panelinin karşılaştırma listesi; ilk eleman incelenen hisse."""
+    text = st.text_input("Karşılaştırılacak hisseler", ", ".join(CORRELATION_PEERS))
+    peers = [s.strip().upper() for s in text.split(",")]
+    return list(dict.fromkeys([symbol] + [s for s in peers if s]))
+
+def build_correlation_heatmap(matrix):
+    """Korelasyon matrisi ısı haritası (-1 kırmızı, +1 mavi)."""
+    import plotly.graph_objects as go
+    labels = [c.replace(".IS", "") for c in matrix.columns]
+    fig = go.Figure(go.Heatmap(
+        z=matrix.to_numpy(), x=labels, y=labels, zmin=-1, zmax=1, colorscale="RdBu",
+        text=matrix.round(2).to_numpy(), texttemplate="%{text}", showscale=False,
+        hovertemplate="%{y} / %{x}: %{z:.2f}<extra></extra>",
+    ))
+    fig.update_layout(
+        height=max(300, 32 * len(labels) + 60),
+        template="plotly_dark",
+        margin=dict(l=10, r=10, t=10, b=10),
+        yaxis_autorange="reversed",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+def render_correlation_panel(stats, symbol):
+    """Hissenin endekse göre beta/korelasyon/göreli gücü ve listenin korelasyon matrisi (data.correlation_stats)."""
+    st.markdown("#### 🔗 Endeks ve Korelasyon")
+    if stats is None:
+        st.warning(f"Gösterge endeksi ({BENCHMARK}) verisi alınamadı.")
+        return
+    if symbol in stats["beta"].columns:
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Beta", f"{stats['beta'][symbol].iloc[-1]:.2f}")
+        c2.metric("Korelasyon", f"{stats['corr'][symbol].iloc[-1]:.2f}")
+        c3.metric("Göreli Güç", f"%{stats['rs'][symbol].iloc[-1]:.1f}")
+    st.caption(f"Son {CORRELATION_WINDOW} günlük getiriler, {BENCHMARK} endeksine göre. "
+               "Yüksek korelasyonlu hisseler birlikte hareket eder; aynı anda taşımak riski yoğunlaştırır.")
+    st.plotly_chart(build_correlation_heatmap(stats["matrix"]), use_container_width=True)
 
 def render_guide():
     """Grafik okuma rehberini gösterir."""